@@ -0,0 +1,96 @@
+""" mdklibs.file 書き込みベンチマーク
+ 
+* 小さなファイルを大量に保存した場合の書き込み速度を比較
+    * save_json (atomic=False) : 直接上書き
+    * save_json (atomic=True) : 一時ファイル + リネーム
+    * save_json (atomic=True, fsync=True)
+    * BatchWriter : 同じファイルへの複数回の書き込みをまとめて保存
+
+Info:
+    * Created : v0.0.1 2026-10-19 Tatsuya YAMAGISHI
+    * Coding : Python 3.12.4 & PySide6
+    * Author : MedakaVFX <medaka.vfx@gmail.com>
+ 
+Release Note:
+    * v0.0.1 2026-10-19 Tatsuya Yamagishi
+        * New
+"""
+global logger
+
+VERSION = 'v0.0.1'
+NAME = 'mdklibs_file_write_bench'
+
+import os
+import sys
+import tempfile
+import time
+
+
+sys.path.append(os.path.dirname(__file__)+'/../..')
+import mdk_libs as mdk
+
+
+#=======================================#
+# Settings
+#=======================================#
+FILE_NUM = 2000
+FSYNC_FILE_NUM = 200
+REWRITE_NUM = 5
+DICT_DATA = {
+    'shot': 'sh010',
+    'frame_in': 1001,
+    'frame_out': 1100,
+    'status': 'ip',
+}
+
+
+#=======================================#
+# Functions
+#=======================================#
+def bench(label: str, func, root: str, num: int, rewrite: int = 1):
+    _start = time.perf_counter()
+    func(root, num, rewrite)
+    _elapsed = time.perf_counter() - _start
+
+    _writes = num * rewrite
+    print(f'MDK | {label:<28} {_writes:>6} writes {_elapsed:8.3f} sec {_writes / _elapsed:10.0f} writes/sec')
+
+
+def write_plain(root, num, rewrite):
+    for _i in range(num):
+        for _j in range(rewrite):
+            mdk.file.save_json(f'{root}/{_i}.json', DICT_DATA, atomic=False)
+
+
+def write_atomic(root, num, rewrite):
+    for _i in range(num):
+        for _j in range(rewrite):
+            mdk.file.save_json(f'{root}/{_i}.json', DICT_DATA)
+
+
+def write_atomic_fsync(root, num, rewrite):
+    for _i in range(num):
+        for _j in range(rewrite):
+            mdk.file.save_json(f'{root}/{_i}.json', DICT_DATA, fsync=True)
+
+
+def write_batch(root, num, rewrite):
+    with mdk.file.BatchWriter(window=0.1) as _writer:
+        for _i in range(num):
+            for _j in range(rewrite):
+                _writer.write_json(f'{root}/{_i}.json', DICT_DATA)
+
+
+#=======================================#
+# Main
+#=======================================#
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as _root:
+        bench('save_json (atomic=False)', write_plain, _root, FILE_NUM)
+        bench('save_json (atomic=True)', write_atomic, _root, FILE_NUM)
+        bench('save_json (fsync=True)', write_atomic_fsync, _root, FSYNC_FILE_NUM)
+
+        print('MDK | ---------------------------')
+        bench('save_json (atomic=False)', write_plain, _root, FILE_NUM, REWRITE_NUM)
+        bench('save_json (atomic=True)', write_atomic, _root, FILE_NUM, REWRITE_NUM)
+        bench('BatchWriter', write_batch, _root, FILE_NUM, REWRITE_NUM)
@@ -0,0 +1,119 @@
+""" mdklibs.fpt セッション再利用ベンチマーク
+
+* ローカルの疑似 ShotGrid サーバー (/api3/json) に対して1回あたりの呼び出し時間を比較
+    * 毎回 shotgun_api3.Shotgun を作成 : 以前の login() と同じ（接続 + info() + find）
+    * Session : スレッドごとのクライアントを再利用（find のみ）
+* 疑似サーバーは LATENCY 秒の遅延を入れて応答
+* shotgun_api3 が必要
+
+Info:
+    * Created : v0.0.1 2026-10-19 Tatsuya YAMAGISHI
+    * Coding : Python 3.12.4 & PySide6
+    * Author : MedakaVFX <medaka.vfx@gmail.com>
+
+Release Note:
+    * v0.0.1 2026-10-19 Tatsuya Yamagishi
+        * New
+"""
+global logger
+
+VERSION = 'v0.0.1'
+NAME = 'mdklibs_fpt_session_bench'
+
+import http.server
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+
+sys.path.append(os.path.dirname(__file__)+'/../..')
+import mdk_libs as mdk
+
+import shotgun_api3
+
+
+#=======================================#
+# Settings
+#=======================================#
+CALL_NUM = 200
+LATENCY = 0.002
+SHOTS = [{'type': 'Shot', 'id': _i, 'code': f'sh{_i:03d}0'} for _i in range(1, 51)]
+
+
+#=======================================#
+# Class
+#=======================================#
+class FakeShotgunHandler(http.server.BaseHTTPRequestHandler):
+    """ info / read だけに応答する疑似 ShotGrid サーバー """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_POST(self):
+        _payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(LATENCY)
+
+        if _payload['method_name'] == 'info':
+            _body = {'version': [8, 50, 0], 'full_version': [8, 50, 0, 0]}
+        else:
+            _body = {'results': {'entities': SHOTS, 'paging_info': {'has_next_page': False, 'entity_count': len(SHOTS)}}}
+
+        _data = json.dumps(_body).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(_data)))
+        self.end_headers()
+        self.wfile.write(_data)
+
+    def log_message(self, *args):
+        pass
+
+
+#=======================================#
+# Functions
+#=======================================#
+def bench(label: str, func, num: int):
+    _times = []
+
+    for _i in range(num):
+        _start = time.perf_counter()
+        func()
+        _times.append(time.perf_counter() - _start)
+
+    print(
+        f'MDK | {label:<24} {num:>5} calls '
+        f'mean {statistics.mean(_times) * 1000:7.2f} ms '
+        f'median {statistics.median(_times) * 1000:7.2f} ms')
+
+
+#=======================================#
+# Main
+#=======================================#
+if __name__ == '__main__':
+    _server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FakeShotgunHandler)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+
+    _url = f'http://127.0.0.1:{_server.server_address[1]}'
+
+    def find_reconnect():
+        _client = shotgun_api3.Shotgun(_url, 'bench', 'key')
+        _client.find('Shot', [], ['code'])
+        _client.close()
+
+    _fpt = mdk.fpt.Fpt(logging.getLogger(NAME))
+    _fpt.login(_url, 'bench', 'key')
+
+    def find_session():
+        _fpt.login(_url, 'bench', 'key')
+        _fpt.get_all_shots(fields=['code'])
+
+    bench('Shotgun per call', find_reconnect, CALL_NUM)
+    bench('Fpt Session', find_session, CALL_NUM)
+    print(f'MDK | {_fpt.exists().get_stats()}')
+
+    _server.shutdown()
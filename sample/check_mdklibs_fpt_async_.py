@@ -0,0 +1,196 @@
+""" mdklibs.fpt.AsyncFpt テスト
+
+* プロセス内の疑似 Shotgun クライアント (FakeShotgun) で AsyncFpt の動作を確認
+    * async の getter / creator
+    * iter_find (ページ単位の async for)
+    * gather のタイムアウトと fail_fast
+    * 同時実行数の上限
+* shotgun_api3 は不要
+
+Info:
+    * Created : v0.0.1 2026-10-19 Tatsuya YAMAGISHI
+    * Coding : Python 3.12.4 & PySide6
+    * Author : MedakaVFX <medaka.vfx@gmail.com>
+
+Release Note:
+    * v0.0.1 2026-10-19 Tatsuya Yamagishi
+        * New
+"""
+global logger
+
+VERSION = 'v0.0.1'
+NAME = 'mdklibs_fpt_async_test'
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+
+sys.path.append(os.path.dirname(__file__)+'/../..')
+import mdk_libs as mdk
+
+
+#=======================================#
+# Settings
+#=======================================#
+LATENCY = 0.05
+PROJECT = {'type': 'Project', 'id': 1, 'name': 'demo'}
+
+
+#=======================================#
+# Class
+#=======================================#
+class FakeShotgun:
+    """ shotgun_api3.Shotgun の代わりに使うプロセス内の疑似クライアント
+
+    * find / find_one / create / update / batch / info / close のみ
+    * フィルターは [field, 'is' | 'in' | 'greater_than', value] のみ対応（iter_find の id でのページング用）
+    """
+    _lock = threading.Lock()
+    _entities = {}
+    _running = 0
+    max_running = 0
+
+    def __init__(self, url, script_name=None, api_key=None, **kwargs):
+        pass
+
+    @classmethod
+    def add(cls, entity_type: str, data: dict) -> dict:
+        with cls._lock:
+            _entities = cls._entities.setdefault(entity_type, [])
+            _entity = dict(data, type=entity_type, id=len(_entities) + 1)
+            _entities.append(_entity)
+
+        return dict(_entity)
+
+    def _wait(self):
+        with self._lock:
+            FakeShotgun._running += 1
+            FakeShotgun.max_running = max(FakeShotgun.max_running, FakeShotgun._running)
+
+        time.sleep(LATENCY)
+
+        with self._lock:
+            FakeShotgun._running -= 1
+
+    def _match(self, entity: dict, filters: list) -> bool:
+        for _field, _operator, _value in filters:
+            _data = entity.get(_field)
+
+            if isinstance(_data, dict):
+                _data = (_data['type'], _data['id'])
+                _value = [(_item['type'], _item['id']) for _item in _value] if _operator == 'in' else (_value['type'], _value['id'])
+
+            if _operator == 'is' and _data != _value:
+                return False
+
+            if _operator == 'in' and _data not in _value:
+                return False
+
+            if _operator == 'greater_than' and (_data is None or _data <= _value):
+                return False
+
+        return True
+
+    def find(self, entity_type, filters, fields=None, order=None, limit=0, page=0, **kwargs):
+        self._wait()
+
+        _entities = [_entity for _entity in self._entities.get(entity_type, []) if self._match(_entity, filters)]
+
+        if page:
+            _entities = _entities[(page - 1) * limit:page * limit]
+        elif limit:
+            _entities = _entities[:limit]
+
+        return [
+            {'type': _entity['type'], 'id': _entity['id'], **{_field: _entity.get(_field) for _field in fields or ()}}
+            for _entity in _entities
+        ]
+
+    def find_one(self, entity_type, filters, fields=None, **kwargs):
+        _entities = self.find(entity_type, filters, fields, limit=1)
+
+        return _entities[0] if _entities else None
+
+    def create(self, entity_type, data):
+        self._wait()
+
+        return self.add(entity_type, data)
+
+    def update(self, entity_type, entity_id, data):
+        self._wait()
+        self._entities[entity_type][entity_id - 1].update(data)
+
+        return dict(data, type=entity_type, id=entity_id)
+
+    def batch(self, requests):
+        self._wait()
+
+        return [
+            self.add(_request['entity_type'], _request['data']) if _request['request_type'] == 'create'
+            else dict(_request['data'], type=_request['entity_type'], id=_request['entity_id'])
+            for _request in requests
+        ]
+
+    def info(self):
+        return {'version': [8, 50, 0]}
+
+    def close(self):
+        pass
+
+
+#=======================================#
+# Functions
+#=======================================#
+async def main():
+    for _i in range(1, 1201):
+        FakeShotgun.add('Version', {'code': f'v{_i:04d}', 'project': PROJECT})
+
+    for _i in range(1, 11):
+        FakeShotgun.add('Shot', {'code': f'sh{_i:03d}0', 'project': PROJECT})
+
+    async with mdk.fpt.AsyncFpt(logger=logger, max_concurrency=4) as _fpt:
+        _fpt.login('http://fake', 'test', 'key', factory=FakeShotgun)
+        _fpt.set_project(PROJECT)
+
+        # getter / creator
+        _shots = await _fpt.get_all_shots(fields=['code'])
+        logger.info(f'MDK | get_all_shots: {len(_shots)}')
+
+        _shot = await _fpt.create_entity('Shot', {'code': 'sh9990'})
+        logger.info(f'MDK | create_entity: {_shot}')
+
+        # async for でページ単位に取得
+        _start = time.perf_counter()
+        _count = 0
+
+        async for _version in _fpt.iter_find('Version', [['project', 'is', PROJECT]], ['code'], page_size=200):
+            _count += 1
+            await asyncio.sleep(0.0001)
+
+        logger.info(f'MDK | iter_find: {_count} versions {time.perf_counter() - _start:.3f} sec')
+
+        # 同時実行数の上限
+        FakeShotgun.max_running = 0
+        await asyncio.gather(*[_fpt.get_all_shots(fields=['code'], cache=False) for _i in range(16)])
+        logger.info(f'MDK | max concurrency: {FakeShotgun.max_running}')
+
+        # gather のタイムアウト
+        _results = await _fpt.gather([('get_all_shots', (), {'cache': False})] * 12, timeout=LATENCY * 2.5)
+        logger.info(f'MDK | gather timeout: cancelled={sum(_result["cancelled"] for _result in _results)}')
+
+        # fail_fast
+        _results = await _fpt.gather([('get_entity_by_id', ('Shot', None)), ('update', ('Unknown', 1, {}))], fail_fast=True)
+        logger.info(f'MDK | gather fail_fast: {[_result["error"] for _result in _results]}')
+
+
+#=======================================#
+# Main
+#=======================================#
+if __name__ == '__main__':
+    # Init Logger
+    logger = mdk.get_logger()
+
+    asyncio.run(main())
@@ -11,6 +11,9 @@ Release Note:
     * v0.0.1 2024-12-19 Tatsuya Yamagishi
         * added: fpt
         * added: path
+    * 2026-10-19 Tatsuya Yamagishi
+        * added: scene
+        * added: sequence
 """
 VERSION = 'v0.0.1'
 NAME = 'mdklibs'
@@ -39,6 +42,8 @@ from . import file
 from . import fpt
 from . import path
 from . import qt
+from . import scene
+from . import sequence
 from . import time
 
 
@@ -9,7 +9,8 @@ Info:
 
 
 Release Note:
-    * LastUpdated : 2024-11-10 Tatsuya Yamagishi
+    * LastUpdated : 2026-10-19 Tatsuya Yamagishi
+        * changed : Data.load (cached オプション)
 """
 
 import dataclasses
@@ -108,8 +109,17 @@ class Data:
             raise e
 
         
-    def load(self, json_filepath) -> dict:
-        _value = mdk.file.load_json(json_filepath)
+    def load(self, json_filepath, cached: bool = False) -> dict:
+        """
+        Args:
+            json_filepath (str): Jsonファイルパス
+            cached (bool): mdk.file.load_json_cached（変更確認付きキャッシュ）を使用
+        """
+        if cached:
+            _value = mdk.file.load_json_cached(json_filepath, copy=True)
+        else:
+            _value = mdk.file.load_json(json_filepath)
+
         self.set_dict(_value)
 
         return _value
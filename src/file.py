@@ -10,21 +10,102 @@ Info:
 
 
 Release Note:
-    * LastUpdated : 2024-11-08 Tatsuya Yamagishi
+    * LastUpdated : 2026-10-19 Tatsuya Yamagishi
+        * added : iter_csv
+        * changed : save_csv (イテレータ、dict行、gzip圧縮に対応)
+        * changed : load_csv (iter_csvのラッパー、カラム指定、列モード)
+        * added : decode_text, dump_json
+        * changed : load_json (1回の読み込みで文字コード判定、orjson対応)
+        * added : JsonCache, load_json_cached
+        * added : atomic_open, BatchWriter
+        * changed : save_json, save_lines, save_text (atomic / fsync オプション)
+        * changed : replace_text (1回の走査でストリーム置き換え、結果を dict で返す)
+        * added : iter_files, is_binary, repath
+        * added : search
+        * added : LineIndex
+        * added : Downloader, download_url
+        * changed : download_url_imagefile, save_image_from_url (Downloader でストリーム保存)
+        * added : soft_delete, get_trash_dir, Purger
+        * changed : delete (soft オプション、ファイルは os.unlink)
+        * added : move_many, get_checksum
+        * added : package
 """
+import array
+import codecs
+import concurrent.futures
+import collections
+import contextlib
 import csv
+import datetime
+import errno
+import gzip
+import hashlib
+import http.client
+import io
+import itertools
+import mmap
+import operator
+import urllib.error
+import urllib.parse
 import urllib.request
 import json
 import os
 import pathlib
 import platform
+import queue
+import re
 import subprocess
 import shutil
+import stat
+import struct
+import sys
+import tarfile
+import threading
+import time
+import types
+import uuid
+import zipfile
+import zlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+import mdk_libs as mdk
 
 
 #=======================================#
 # Settings
 #=======================================#
+TRASH_DIRNAME = '.mdk_trash'
+
+# BatchWriter の保存に失敗した場合の再保存の回数、間隔の上限 (秒)
+BATCH_WRITER_MAX_RETRIES = 5
+BATCH_WRITER_MAX_BACKOFF = 30.0
+
+_ARCHIVE_EXTS = {
+    'tar': '.tar',
+    'tar.gz': '.tar.gz',
+    'zip': '.zip',
+}
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# JsonCache 用。キャッシュが無いことを表す（Json の null と区別）
+_MISSING = object()
 
 
 #=======================================#
@@ -80,28 +161,166 @@ def copy(src_filepath, dst_filepath, exists=False):
 
 
 
-def delete(filepath):
-    """ ファイルを削除 """
-    if os.path.exists(filepath):
+def delete(filepath, soft: bool = False):
+    """ ファイルを削除
+
+    * soft=True の場合は soft_delete（ゴミ箱に移動してバックグラウンドで削除）
+
+    Args:
+        filepath (str): ファイル、ディレクトリパス
+        soft (bool): ゴミ箱に移動してすぐに戻る
+
+    Returns:
+        str: soft=True の場合はゴミ箱内のパス
+    """
+    if os.path.lexists(filepath):
+        if soft:
+            return soft_delete(filepath)
+
         # os.chmod(filepath, 0755)
-        shutil.rmtree(filepath)
+        if os.path.isdir(filepath) and not os.path.islink(filepath):
+            shutil.rmtree(filepath)
+        else:
+            os.unlink(filepath)
 
     else:
         raise FileNotFoundError(f'File is not found.\nfilepath={filepath}')
     
 
 
+def download_url(url: str, dst_path: str, progress=None, headers: dict = None) -> dict:
+    """ URL のファイルをダウンロード (Downloader.download)
+
+    * chunk ずつ <dst_path>.part に書き込み、完了後にリネーム
+    * <dst_path>.part が残っていれば Range リクエストで続きからダウンロード
+
+    Args:
+        url (str): URL
+        dst_path (str): 保存先
+        progress (callable, optional): progress(url, ダウンロード済みbyte, 全体byte or None)
+        headers (dict, optional): リクエストヘッダー
+
+    Returns:
+        dict: Downloader.download の結果
+    """
+    with Downloader(headers=headers) as _downloader:
+        return _downloader.download(url, dst_path, progress=progress)
+
+
 def download_url_imagefile(url, dst_path):
     try:
-        with urllib.request.urlopen(url) as web_file:
-            data = web_file.read()
-            with open(dst_path, mode='wb') as local_file:
-                local_file.write(data)
+        download_url(url, dst_path)
                 
     except urllib.error.URLError as ex:
         raise urllib.error.URLError(ex)
     
     
+def is_binary(filepath, size: int = 8192) -> bool:
+    """ 先頭 <size> byte に NUL を含むファイルをバイナリと判定 """
+    with open(filepath, 'rb') as _f:
+        return b'\0' in _f.read(size)
+
+
+def iter_files(root, file_filter=None, recursive: bool = True, errors: list = None):
+    """ os.scandir で <root> 以下のファイルパスを返すジェネレータ
+
+    * '.' から始まるファイル、フォルダは除外
+    * 権限が無いフォルダはスキップ（errors を指定した場合は追加）
+
+    Args:
+        root (str): ルートディレクトリ
+        file_filter (re.Pattern or tuple[re.Pattern], optional): ファイル名フィルタ
+            (mdk.path.FILE_FILTER_TEXT など。ファイル名全体にマッチしたものを返す)
+        recursive (bool): サブディレクトリも探索
+        errors (list, optional): 読み込めなかったフォルダの (パス, エラー) を追加するリスト
+
+    Yields:
+        str: ファイルパス (posix)
+
+    Examples:
+        >>> for _filepath in mdk.file.iter_files(ROOT, mdk.path.FILE_FILTER_MAYA):
+        >>>     print(_filepath)
+    """
+    if file_filter is not None and not isinstance(file_filter, (list, tuple)):
+        file_filter = (file_filter,)
+
+    _dirs = [pathlib.Path(root).as_posix()]
+
+    while _dirs:
+        _dir = _dirs.pop()
+
+        try:
+            _entries = os.scandir(_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except PermissionError as ex:
+            if errors is not None:
+                errors.append((_dir, f'{type(ex).__name__}: {ex}'))
+
+            continue
+
+        with _entries:
+            for _entry in _entries:
+                if _entry.name.startswith('.'):
+                    continue
+
+                if _entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        _dirs.append(f'{_dir}/{_entry.name}')
+
+                elif file_filter is None or any(_filter.fullmatch(_entry.name) for _filter in file_filter):
+                    yield f'{_dir}/{_entry.name}'
+
+
+def soft_delete(filepath) -> str:
+    """ <filepath> をゴミ箱に移動し、バックグラウンドで削除
+
+    * 同じボリュームのゴミ箱 (get_trash_dir) へのリネームのため、巨大なディレクトリでもすぐに戻る
+    * 実際の削除は Purger のスレッドで行う (get_purger().get_status() で確認)
+
+    Args:
+        filepath (str): ファイル、ディレクトリパス
+
+    Returns:
+        str: ゴミ箱内のパス
+
+    Examples:
+        >>> mdk.file.delete('/mnt/show/sh010/render/v001', soft=True)
+        '/mnt/show/.mdk_trash/20261019_120000_1a2b3c4d_v001'
+    """
+    _trash_dir = get_trash_dir(filepath)
+    _name = os.path.basename(os.path.normpath(filepath))
+    _timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    _trash_path = os.path.join(_trash_dir, f'{_timestamp}_{uuid.uuid4().hex[:8]}_{_name}')
+
+    os.rename(filepath, _trash_path)
+    _PURGER.purge(_trash_path)
+
+    return pathlib.Path(_trash_path).as_posix()
+
+
+def _retry_permission(func, filepath: str):
+    """ 読み込み専用で削除出来ない場合は書き込み権限を付けて再実行
+
+    * 削除には親ディレクトリの書き込み権限が必要なため、親ディレクトリにも書き込み権限を付ける
+    * シンボリックリンクはリンク先の権限を変更しない
+    """
+    try:
+        func(filepath)
+
+    except PermissionError:
+        _parent = os.path.dirname(os.path.abspath(filepath))
+        _mode = os.stat(_parent).st_mode
+
+        if (_mode & (stat.S_IWUSR | stat.S_IXUSR)) != (stat.S_IWUSR | stat.S_IXUSR):
+            os.chmod(_parent, stat.S_IMODE(_mode) | stat.S_IWUSR | stat.S_IXUSR | stat.S_IRUSR)
+
+        if not os.path.islink(filepath):
+            os.chmod(filepath, stat.S_IWRITE | stat.S_IREAD | (stat.S_IEXEC if os.path.isdir(filepath) else 0))
+
+        func(filepath)
+
+
 def move(src, dst):
     """ ファイル移動 """
     if os.path.isfile(src):
@@ -114,186 +333,2937 @@ def move(src, dst):
 
 
 
-def replace_text(filepath: str, replace_list: list[str]):
-    """ 
-    
+def move_many(
+            pairs: list[tuple],
+            max_workers: int = 4,
+            verify: str = 'size',
+            chunk_size: int = 8 * 1024 * 1024) -> dict:
+    """ 複数のファイル、ディレクトリをまとめて移動
+
+    * 同じボリューム内の移動は os.rename ですぐに移動
+    * 別のボリュームへの移動はファイル単位で max_workers 並列にコピー
+      (一時ファイルにコピー -> 検証 -> リネーム -> 元ファイルを削除)
+    * dst が既存のディレクトリの場合は shutil.move と同じくディレクトリ内に移動
+
     Args:
-        replcae_list(list): 置き換える文字リスト（['test', 'hoge'], ['moji', 'string']）
+        pairs (list[tuple]): [(src, dst), ...]
+        max_workers (int): コピーの並列数
+        verify (str): コピーの検証方法 'size' (ファイルサイズ) | 'checksum' (blake2b) | None
+        chunk_size (int): checksum 計算時の読み込みサイズ (byte)
+
+    Returns:
+        dict: 結果
+            * results (list[dict]): pairs と同じ順番の結果
+                {'src', 'dst', 'method': 'rename' | 'copy', 'files', 'bytes', 'error'}
+            * renamed (int): リネームで移動した数
+            * copied (int): コピーで移動した数
+            * errors (int): エラー数
+            * bytes (int): コピーしたサイズの合計
+            * elapsed (float): 処理時間 (秒)
+            * throughput (float): コピーの速度 (byte/秒)
+
+    Examples:
+        >>> _result = mdk.file.move_many([(_src, _dst) for _src, _dst in ...])
+        >>> print(_result['errors'], _result['throughput'] / 1024 ** 2, 'MB/s')
+    """
+    _start = time.perf_counter()
+    _results = []
+    _copies = []
+
+    for _src, _dst in pairs:
+        _src = os.path.abspath(_src)
+        _dst = os.path.abspath(_dst)
+
+        if os.path.isdir(_dst):
+            _dst = os.path.join(_dst, os.path.basename(os.path.normpath(_src)))
+
+        _result = {
+            'src': pathlib.Path(_src).as_posix(),
+            'dst': pathlib.Path(_dst).as_posix(),
+            'method': 'rename',
+            'files': 0,
+            'bytes': 0,
+            'error': None,
+        }
+        _results.append(_result)
+
+        try:
+            os.makedirs(os.path.dirname(_dst), exist_ok=True)
+
+            if os.stat(_src).st_dev == os.stat(os.path.dirname(_dst)).st_dev:
+                try:
+                    os.rename(_src, _dst)
+                    continue
+
+                except OSError as ex:
+                    # bind mount など st_dev が同じでもリネーム出来ない場合はコピー
+                    if ex.errno != errno.EXDEV:
+                        raise
+
+            _result['method'] = 'copy'
+            _copies.append((_result, _src, _dst))
+
+        except OSError as ex:
+            _result['error'] = f'{type(ex).__name__}: {ex}'
+
+    # 別ボリュームはファイル単位で並列コピー
+    _copy_start = time.perf_counter()
+    _bytes = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as _executor:
+        _futures = []
+
+        for _result, _src, _dst in _copies:
+            try:
+                for _src_file, _dst_file in _iter_move_files(_src, _dst):
+                    _futures.append((_result, _executor.submit(
+                            _move_file, _src_file, _dst_file, verify, chunk_size)))
+
+            except OSError as ex:
+                _result['error'] = f'{type(ex).__name__}: {ex}'
+
+        for _result, _future in _futures:
+            try:
+                _size = _future.result()
+                _result['files'] += 1
+                _result['bytes'] += _size
+                _bytes += _size
+
+            except (OSError, ValueError) as ex:
+                if _result['error'] is None:
+                    _result['error'] = f'{type(ex).__name__}: {ex}'
+
+    # 全てのファイルを移動出来たら元のディレクトリを削除
+    for _result, _src, _dst in _copies:
+        if _result['error'] is None and os.path.isdir(_src):
+            try:
+                shutil.rmtree(_src)
+            except OSError as ex:
+                _result['error'] = f'{type(ex).__name__}: {ex}'
+
+    _copy_elapsed = time.perf_counter() - _copy_start
+
+    return {
+        'results': _results,
+        'renamed': sum(1 for _result in _results if _result['method'] == 'rename' and not _result['error']),
+        'copied': sum(1 for _result in _results if _result['method'] == 'copy' and not _result['error']),
+        'errors': sum(1 for _result in _results if _result['error']),
+        'bytes': _bytes,
+        'elapsed': time.perf_counter() - _start,
+        'throughput': _bytes / _copy_elapsed if _copies and _copy_elapsed else 0.0,
+    }
+
+
+def _iter_move_files(src: str, dst: str):
+    """ move_many 用。(コピー元ファイル, コピー先ファイル) を返す。ディレクトリは先に作成
+
+    * ディレクトリへのシンボリックリンクはファイルとして返す（リンクのままコピーされる）
     """
-    _lines = load_lines(filepath)
+    if os.path.islink(src) or not os.path.isdir(src):
+        yield src, dst
+        return
 
-    # pprint.pprint(_lines)
+    for _root, _dirnames, _filenames in os.walk(src):
+        _dst_root = os.path.join(dst, os.path.relpath(_root, src))
+        os.makedirs(_dst_root, exist_ok=True)
 
-    for _i, _line in enumerate(_lines):
-        for _replace in replace_list:
-            _src, _dst = _replace
+        # os.walk はディレクトリへのシンボリックリンクを dirnames に入れて辿らない
+        _links = [_dirname for _dirname in _dirnames if os.path.islink(os.path.join(_root, _dirname))]
 
-            if _src in _line:
-                _src_text = f'{_i}: {_line}'
+        for _filename in _filenames + _links:
+            yield os.path.join(_root, _filename), os.path.join(_dst_root, _filename)
 
-                try:
-                    _line = _line.replace(_src, _dst)
 
-                except Exception as ex:
-                    print(ex)
+def _move_file(src: str, dst: str, verify: str, chunk_size: int) -> int:
+    """ move_many 用。一時ファイルにコピーして検証後にリネームし、元ファイルを削除 """
+    _tmp = os.path.join(os.path.dirname(dst), f'.{os.path.basename(dst)}.{uuid.uuid4().hex[:8]}.tmp')
 
-                    print(f'MDK | line = {_line}')
-                    print(f'MDK | _src = {_src}')
-                    print(f'MDK | _dst = {_dst}')
+    try:
+        shutil.copy2(src, _tmp, follow_symlinks=False)
 
-                    raise RuntimeError(ex)
+        _size = os.lstat(src).st_size
 
+        if verify and os.lstat(_tmp).st_size != _size:
+            raise ValueError(f'Size mismatch.\nsrc={src}')
 
-                _dst_text = f'{_line}'
+        if verify == 'checksum' and not os.path.islink(src):
+            if get_checksum(src, chunk_size) != get_checksum(_tmp, chunk_size):
+                raise ValueError(f'Checksum mismatch.\nsrc={src}')
 
-                print(f'{_src_text} => {_dst_text}')
+        os.replace(_tmp, dst)
 
-            _lines[_i] = _line
+    except BaseException:
+        try:
+            os.unlink(_tmp)
+        except OSError:
+            pass
 
-    save_lines(filepath, _lines)
+        raise
 
+    os.unlink(src)
 
-#=======================================#
-# I/O
-#=======================================#
-def open_file(filepath):
-    """ <filepath>をOSで開く """
-    if os.path.isfile(filepath):
+    return _size
 
-        if platform.system() == 'Windows':
-            cmd = 'explorer {}'.format(filepath.replace('/', '\\'))
-            subprocess.Popen(cmd)
-        
-        elif platform.system() == 'Darwin':
-            subprocess.call(['open', filepath])
-        
+
+def get_checksum(filepath, chunk_size: int = 8 * 1024 * 1024, algorithm: str = 'blake2b') -> str:
+    """ ファイルのハッシュ値を取得
+
+    Args:
+        filepath (str): ファイルパス
+        chunk_size (int): 1回に読み込むサイズ (byte)
+        algorithm (str): hashlib のアルゴリズム名
+
+    Returns:
+        str: 16進数のハッシュ値
+    """
+    _hash = hashlib.new(algorithm)
+
+    with open(filepath, 'rb') as _f:
+        while True:
+            _chunk = _f.read(chunk_size)
+
+            if not _chunk:
+                break
+
+            _hash.update(_chunk)
+
+    return _hash.hexdigest()
+
+
+def package(
+            paths,
+            dst,
+            format: str = 'tar',
+            root=None,
+            checksum: str = None,
+            volume_size: int = None,
+            max_workers: int = 4,
+            chunk_size: int = 8 * 1024 * 1024,
+            buffer_size: int = 256 * 1024 * 1024) -> dict:
+    """ ファイル、ディレクトリを tar / zip に直接書き込んで納品用アーカイブを作成
+
+    * 読み込みはスレッドプールで先読み、書き込みは1本で順番に行う
+    * 先読みに使うメモリは buffer_size まで。chunk_size より大きいファイルは先読みせず、
+      書き込み時に chunk_size ずつ読み込む
+    * volume_size を指定するとファイルサイズの合計で分割
+      (<dst>.001.tar, <dst>.002.tar ... 各ボリュームは単体で展開可能)
+    * checksum を指定するとアーカイブ内パスのハッシュ値をマニフェストに保存
+      (<dst>.<checksum>、sha256sum -c などで検証出来る形式)
+    * 書き込み中は .part の一時ファイルに書き込み、完了後にリネーム
+    * ディレクトリのシンボリックリンクはリンク先を格納し、空のディレクトリもエントリとして格納
+    * アーカイブ内パスが重複する場合、シンボリックリンクが循環している場合は ValueError
+
+    Args:
+        paths (str or list[str]): ファイル、ディレクトリのパス
+        dst (str): 出力ファイルパス (format の拡張子が無い場合は追加)
+        format (str): 'tar' | 'tar.gz' | 'zip' (zip は無圧縮)
+        root (str, optional): アーカイブ内パスの基準ディレクトリ。None の場合は各パスの親ディレクトリ
+        checksum (str, optional): マニフェストのハッシュアルゴリズム名 ('sha256', 'md5' など)
+        volume_size (int, optional): 1ボリュームの最大サイズ (byte)。
+            1ファイルで超える場合はそのファイルだけのボリュームになる
+        max_workers (int): 読み込みの並列数
+        chunk_size (int): 先読みするファイルサイズの上限、ストリーム読み込みのサイズ (byte)
+        buffer_size (int): 先読みに使うメモリの上限 (byte)
+
+    Returns:
+        dict: 結果
+            * volumes (list[str]): 作成したアーカイブのパス
+            * manifest (str): マニフェストのパス (checksum=None の場合は None)
+            * files (int): ファイル数
+            * dirs (int): ディレクトリ数
+            * bytes (int): ファイルサイズの合計
+            * elapsed (float): 処理時間 (秒)
+            * throughput (float): 書き込み速度 (byte/秒)
+
+    Examples:
+        >>> _result = mdk.file.package(
+        >>>     [SHOT_DIR, EDL_FILE],
+        >>>     'D:/delivery/20261019_client',
+        >>>     format='zip',
+        >>>     checksum='sha256',
+        >>>     volume_size=4 * 1024 ** 3)
+        >>> print(_result['volumes'], _result['manifest'])
+    """
+    if format not in _ARCHIVE_EXTS:
+        raise ValueError(f'Unsupported format.\nformat={format}')
+
+    _start = time.perf_counter()
+    _ext = _ARCHIVE_EXTS[format]
+    _base = pathlib.Path(dst).as_posix()
+
+    if _base.lower().endswith(_ext):
+        _base = _base[:-len(_ext)]
+
+    _entries = list(_iter_package_files(paths, root))
+    _volumes = []
+    _manifest = []
+    _bytes = 0
+
+    def _open_volume():
+        if volume_size:
+            _volume = f'{_base}.{len(_volumes) + 1:03d}{_ext}'
         else:
-            subprocess.Popen(["xdg-open", filepath])
+            _volume = f'{_base}{_ext}'
 
-    else:
-        raise TypeError('"filepath" is not file.')
-    
+        _volumes.append(_volume)
 
-#----------------------------
-# CSV
-#----------------------------
-def load_csv(filepath) -> dict:
-    """ CSVファイルを開く """
-    _result = []
+        return _ArchiveWriter(_volume, format, chunk_size)
 
-    with open(filepath, 'r') as _f:
-        _reader = csv.reader(_f)
-        _header = next(_reader)
+    os.makedirs(os.path.dirname(os.path.abspath(_base)), exist_ok=True)
+    _writer = None
+    _volume_bytes = 0
 
-        for _row in _reader:
-            _value = {}
-            for _name, _data in zip(_header, _row):
-                try:
-                    _value[_name] = _data.encode()
-                except:
-                    _value[_name] = _data
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as _executor:
+        _futures = {}
+        _next = 0
+        _buffered = 0
 
-            #print(value)
-            _result.append(_value)
+        try:
+            for _index, (_filepath, _arcname, _stat) in enumerate(_entries):
+                # buffer_size の範囲で先読み
+                while _next < len(_entries):
+                    _size = _entries[_next][2].st_size
 
-    return _result
+                    if stat.S_ISDIR(_entries[_next][2].st_mode):
+                        pass
 
+                    elif _size <= chunk_size:
+                        if _futures and _buffered + _size > buffer_size:
+                            break
 
-def save_csv(filepath, data: list[str]):
-    """ CSVファイルを保存する """
-    with open(filepath, 'w') as _f:
-        _writer = csv.writer(_f, lineterminator='\n') # 改行コード（\n）を指定しておく
-        _writer.writerows(data)
+                        _futures[_next] = _executor.submit(_read_package_file, _entries[_next][0], checksum)
+                        _buffered += _size
 
+                    _next += 1
 
+                if stat.S_ISDIR(_stat.st_mode):
+                    if _writer is None:
+                        _writer = _open_volume()
 
-#----------------------------
-# JSON
-#----------------------------
-def load_json(json_file_path: str) -> dict:
-    """
-    Windows版 Blender 対策でencodeを'cp932'に。
-        * Blender依存なのか？Python 3.10のせいか？理由は不明
+                    _writer.add_dir(_arcname, _stat)
+                    continue
 
-        
-    Todo:
-        * CP932がDOS用のJISコードであるため、将来的にOS判定が必要かも by Yamagishi
+                if _writer is None or (
+                        volume_size and _volume_bytes and _volume_bytes + _stat.st_size > volume_size):
+                    if _writer is not None:
+                        _writer.close()
+
+                    _writer = _open_volume()
+                    _volume_bytes = 0
+
+                _future = _futures.pop(_index, None)
+
+                if _future is not None:
+                    _data, _digest = _future.result()
+                    _buffered -= _stat.st_size
+                    _writer.add_bytes(_arcname, _stat, _data)
+                    _size = len(_data)
+                    del _data
+
+                else:
+                    _size, _digest = _writer.add_file(_arcname, _stat, _filepath, checksum)
+
+                _volume_bytes += _size
+                _bytes += _size
+
+                if checksum:
+                    _manifest.append(f'{_digest}  {_arcname}\n')
+
+            if _writer is None:
+                _writer = _open_volume()
+
+            _writer.close()
+
+        except BaseException:
+            for _future in _futures.values():
+                _future.cancel()
+
+            if _writer is not None:
+                _writer.abort()
+
+            raise
+
+    _manifest_path = None
+
+    if checksum:
+        _manifest_path = f'{_base}.{checksum}'
+        save_lines(_manifest_path, _manifest)
+
+    _elapsed = time.perf_counter() - _start
+
+    return {
+        'volumes': _volumes,
+        'manifest': _manifest_path,
+        'files': sum(1 for _entry in _entries if not stat.S_ISDIR(_entry[2].st_mode)),
+        'dirs': sum(1 for _entry in _entries if stat.S_ISDIR(_entry[2].st_mode)),
+        'bytes': _bytes,
+        'elapsed': _elapsed,
+        'throughput': _bytes / _elapsed if _elapsed else 0.0,
+    }
 
+
+def _iter_package_files(paths, root=None):
+    """ package 用。(パス, アーカイブ内パス, os.stat_result) を名前順に返す
+
+    * ディレクトリのシンボリックリンクはリンク先をたどる (循環している場合は ValueError)
+    * 空のディレクトリも含めて、ディレクトリ自体のエントリを返す
+    * アーカイブ内パスが重複する場合は ValueError
     """
-    try:
-        with open(json_file_path, encoding='UTF-8') as f:
-            result = json.load(f)
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    _arcnames = set()
+
+    for _path in paths:
+        _path = os.path.abspath(_path)
+        _base = os.path.abspath(root) if root else os.path.dirname(_path)
+
+        for _filepath, _stat in _walk_package_path(_path, ()):
+            _arcname = pathlib.Path(os.path.relpath(_filepath, _base)).as_posix()
+
+            if _arcname == '.':
+                continue
+
+            if _arcname.startswith('../'):
+                raise ValueError(f'Path is outside of root.\npath={_filepath}\nroot={root}')
 
-        return result
+            if _arcname in _arcnames:
+                raise ValueError(f'Duplicate path in archive.\npath={_filepath}\narcname={_arcname}')
 
-    except:
-        with open(json_file_path, encoding='CP932') as f:
-            result = json.load(f)
+            _arcnames.add(_arcname)
 
-        return result
+            yield _filepath, _arcname, _stat
 
 
-def save_json(json_file_path: str, dict_data: dict):
+def _walk_package_path(path: str, ancestors: tuple):
+    """ _iter_package_files 用。(パス, os.stat_result) を再帰的に返す
+
+    ancestors は親ディレクトリの (st_dev, st_ino)。リンク先が親ディレクトリの場合は循環
     """
-    Jsonファイルの保存
+    _stat = os.stat(path)
+
+    if not stat.S_ISDIR(_stat.st_mode):
+        yield path, _stat
+        return
+
+    _dir_id = (_stat.st_dev, _stat.st_ino)
+
+    if _dir_id in ancestors:
+        raise ValueError(f'Symbolic link loop.\npath={path}')
+
+    yield path, _stat
+
+    _filenames = []
+    _dirnames = []
+
+    with os.scandir(path) as _it:
+        for _entry in _it:
+            if _entry.is_dir():
+                _dirnames.append(_entry.name)
+            else:
+                _filenames.append(_entry.name)
+
+    for _name in sorted(_filenames) + sorted(_dirnames):
+        yield from _walk_package_path(os.path.join(path, _name), ancestors + (_dir_id,))
+
+
+def _read_package_file(filepath: str, checksum: str = None) -> tuple:
+    """ package 用。ファイルを読み込んでハッシュ値を計算 """
+    with open(filepath, 'rb') as _f:
+        _data = _f.read()
+
+    return _data, hashlib.new(checksum, _data).hexdigest() if checksum else None
+
+
+class _ArchiveWriter:
+    """ package 用。tar / zip の1ボリュームを .part に書き込み、close でリネーム """
+    def __init__(self, filepath: str, format: str, chunk_size: int):
+        self._filepath = filepath
+        self._tmp = f'{filepath}.part'
+        self._chunk_size = chunk_size
+        self._f = open(self._tmp, 'wb', buffering=1024 * 1024)
+
+        try:
+            if format == 'zip':
+                self._tar = None
+                self._zip = zipfile.ZipFile(self._f, 'w', compression=zipfile.ZIP_STORED, allowZip64=True)
+
+            else:
+                self._zip = None
+                self._tar = tarfile.open(
+                    name=filepath,
+                    mode='w:gz' if format == 'tar.gz' else 'w',
+                    fileobj=self._f,
+                    format=tarfile.PAX_FORMAT)
+                self._tar.copybufsize = chunk_size
+
+        except BaseException:
+            self.abort()
+            raise
+
+    def _get_tarinfo(self, arcname: str, stat_result, size: int):
+        _info = tarfile.TarInfo(arcname)
+        _info.size = size
+        _info.mtime = stat_result.st_mtime
+        _info.mode = stat.S_IMODE(stat_result.st_mode)
+
+        return _info
+
+    def _get_zipinfo(self, arcname: str, stat_result, size: int):
+        _date_time = time.localtime(max(stat_result.st_mtime, 315532800))[:6]
+        _info = zipfile.ZipInfo(arcname, _date_time)
+        _info.file_size = size
+        _info.compress_type = zipfile.ZIP_STORED
+        _info.external_attr = (stat_result.st_mode & 0xFFFF) << 16
+
+        return _info
+
+    def add_dir(self, arcname: str, stat_result):
+        """ ディレクトリのエントリを追加 """
+        if self._zip is not None:
+            _info = self._get_zipinfo(f'{arcname}/', stat_result, 0)
+            _info.external_attr |= 0x10
+            self._zip.writestr(_info, b'')
+        else:
+            _info = self._get_tarinfo(arcname, stat_result, 0)
+            _info.type = tarfile.DIRTYPE
+            self._tar.addfile(_info)
+
+    def add_bytes(self, arcname: str, stat_result, data: bytes):
+        """ 読み込み済みのデータを追加 """
+        if self._zip is not None:
+            self._zip.writestr(self._get_zipinfo(arcname, stat_result, len(data)), data)
+        else:
+            self._tar.addfile(self._get_tarinfo(arcname, stat_result, len(data)), io.BytesIO(data))
+
+    def add_file(self, arcname: str, stat_result, filepath: str, checksum: str = None) -> tuple:
+        """ ファイルを chunk_size ずつ読み込んで追加
+
+        Returns:
+            tuple: (書き込んだサイズ, ハッシュ値)
+        """
+        _hash = hashlib.new(checksum) if checksum else None
+
+        with open(filepath, 'rb') as _src:
+            _size = os.fstat(_src.fileno()).st_size
+
+            if self._zip is not None:
+                with self._zip.open(self._get_zipinfo(arcname, stat_result, _size), 'w') as _dst:
+                    _remain = _size
+
+                    while _remain:
+                        _chunk = _src.read(min(self._chunk_size, _remain))
+
+                        if not _chunk:
+                            raise OSError(f'File size changed while reading.\nfilepath={filepath}')
+
+                        if _hash is not None:
+                            _hash.update(_chunk)
+
+                        _dst.write(_chunk)
+                        _remain -= len(_chunk)
+
+            else:
+                _reader = _HashReader(_src, _hash) if _hash is not None else _src
+                self._tar.addfile(self._get_tarinfo(arcname, stat_result, _size), _reader)
+
+        return _size, _hash.hexdigest() if _hash is not None else None
+
+    def close(self):
+        """ アーカイブを閉じてリネーム """
+        try:
+            if self._zip is not None:
+                self._zip.close()
+            else:
+                self._tar.close()
+
+            self._f.close()
+
+        except BaseException:
+            self.abort()
+            raise
+
+        os.replace(self._tmp, self._filepath)
+
+    def abort(self):
+        """ 書き込みを中止して .part を削除 """
+        try:
+            self._f.close()
+        except OSError:
+            pass
+
+        try:
+            os.unlink(self._tmp)
+        except OSError:
+            pass
+
+
+class _HashReader:
+    """ package 用。read したデータのハッシュ値を計算するファイルオブジェクト """
+    def __init__(self, f, hash_obj):
+        self._f = f
+        self._hash = hash_obj
+
+    def read(self, size: int = -1) -> bytes:
+        _data = self._f.read(size)
+        self._hash.update(_data)
+
+        return _data
+
+
+def get_purger() -> 'Purger':
+    """ soft_delete が使用するプロセス共通の Purger を取得 """
+    return _PURGER
+
+
+def get_trash_dir(filepath) -> str:
+    """ <filepath> と同じボリュームのゴミ箱ディレクトリを取得（無ければ作成）
+
+    * ボリュームのルート (マウントポイント) の .mdk_trash
+    * ルートに作成出来ない場合、別のボリュームになる場合、書き込み出来ない場合（他のユーザーが作成したものなど）は
+      <filepath> の親ディレクトリの .mdk_trash
 
     Args:
-        json_file_path (str): 保存先
-        dict_data (dict): 保存するデータ
+        filepath (str): 削除するファイルパス
+
+    Returns:
+        str: ゴミ箱ディレクトリパス
     """
-    with open(json_file_path, 'w', encoding='UTF-8') as f:
-        json.dump( dict_data, f, indent=4, sort_keys=True, ensure_ascii=False)
+    _parent = os.path.dirname(os.path.abspath(filepath))
+    _dev = os.stat(_parent).st_dev
 
-        
-#----------------------------
-# TEXT
-#----------------------------
-def load_lines(filepath) -> list:
+    with _TRASH_LOCK:
+        _trash_dir = _TRASH_DIRS.get(_dev)
+
+        if _trash_dir is None:
+            _mount = _parent
+
+            while not os.path.ismount(_mount):
+                _next = os.path.dirname(_mount)
+
+                if _next == _mount:
+                    break
+
+                _mount = _next
+
+            for _dirname in (_mount, _parent):
+                _trash_dir = os.path.join(_dirname, TRASH_DIRNAME)
+
+                try:
+                    os.makedirs(_trash_dir, exist_ok=True)
+
+                    if os.stat(_trash_dir).st_dev == _dev and os.access(_trash_dir, os.W_OK | os.X_OK):
+                        break
+
+                except OSError:
+                    pass
+
+            else:
+                raise PermissionError(f'Could not create trash directory.\nfilepath={filepath}')
+
+            # 親ディレクトリのゴミ箱はボリューム共通にしない
+            if os.path.dirname(_trash_dir) == _mount:
+                _TRASH_DIRS[_dev] = _trash_dir
+
+    # 前回のセッションで削除しきれなかったもの（ゴミ箱ごとにセッションで1回）
+    _PURGER.purge_trash(_trash_dir, once=True)
+
+    return _trash_dir
+
+
+def compile_replace_list(replace_list: list[str]):
+    """ 置き換えリストを1つの正規表現（選択）にまとめる
+
+    * 長い文字列を優先してマッチ
+    * 空文字の置き換え元は無視
+
+    Args:
+        replace_list (list): 置き換える文字リスト（['test', 'hoge'], ['moji', 'string']）
+
+    Returns:
+        tuple: (re.Pattern, {置き換え元: 置き換え先}, 置き換え元の最大長)
     """
-    <file_path> のテキストをlinesで開く
+    _table = {_src: _dst for _src, _dst in replace_list if _src}
+
+    if not _table:
+        return None, _table, 0
+
+    _keys = sorted(_table, key=len, reverse=True)
+    _pattern = re.compile('|'.join(re.escape(_key) for _key in _keys))
+
+    return _pattern, _table, len(_keys[0])
+
+
+def replace_text(
+            filepath: str,
+            replace_list: list[str],
+            dry_run: bool = False,
+            chunk_size: int = 4 * 1024 * 1024,
+            max_changes: int = 10000) -> dict:
+    """ 
+    ファイル内の文字列をまとめて置き換える
+
+    * 全ての置き換えを1つの正規表現にまとめ、1回の走査で置き換える（置き換え結果は再置換されない）
+    * chunk_size ずつ読み込み、チャンク境界をまたぐ文字列も置き換える
+    * 置き換えがあった場合のみ atomic_open で保存
+    * 改行コード、デコード出来ないバイトはそのまま保持
+    
+    Args:
+        replcae_list(list): 置き換える文字リスト（['test', 'hoge'], ['moji', 'string']）
+        dry_run(bool): 保存せずに結果だけ返す
+        chunk_size(int): 1回に読み込む文字数
+        max_changes(int): changes に記録する最大数
+
+    Returns:
+        dict: 置き換え結果
+            * filepath (str): ファイルパス
+            * changed (bool): 置き換えがあったか
+            * count (int): 置き換え数
+            * counts (dict): {置き換え元: 置き換え数}
+            * changes (list[dict]): [{'line': 行番号(1~), 'src': 置き換え元, 'dst': 置き換え先}, ...]
+
+    Examples:
+        >>> mdk.file.replace_text(<filepath>, [['X:/show', '/mnt/show']])
+        {'filepath': ..., 'changed': True, 'count': 2, 'counts': {'X:/show': 2}, 'changes': [{'line': 12, ...}, ...]}
     """
-    with open(filepath, encoding='utf8', errors='ignore') as _f:
-        _result = _f.readlines()
+    _pattern, _table, _max_len = compile_replace_list(replace_list)
+
+    _result = {
+        'filepath': str(filepath),
+        'changed': False,
+        'count': 0,
+        'counts': {},
+        'changes': [],
+    }
+
+    if _pattern is None:
+        return _result
+
+    _kwargs = {'encoding': 'utf8', 'errors': 'surrogateescape', 'newline': ''}
+
+    try:
+        with open(filepath, 'r', **_kwargs) as _src_f:
+            if dry_run:
+                _replace_stream(_src_f, None, _pattern, _table, _max_len, chunk_size, max_changes, _result)
+
+            else:
+                with atomic_open(filepath, 'w', **_kwargs) as _dst_f:
+                    _replace_stream(_src_f, _dst_f, _pattern, _table, _max_len, chunk_size, max_changes, _result)
+
+                    if not _result['changed']:
+                        raise _NotChanged()
+
+    except _NotChanged:
+        pass
 
     return _result
 
 
+class _NotChanged(Exception):
+    """ replace_text で置き換えが無かった場合に保存を中止する """
 
-def load_text(filepath):
-    return pathlib.Path(filepath).read_text(encoding='utf8')
- 
 
+def _replace_stream(src_f, dst_f, pattern, table, max_len, chunk_size, max_changes, result):
+    """ src_f を chunk_size ずつ置き換えて dst_f に書き込む """
+    _counts = result['counts']
+    _changes = result['changes']
+    _carry = ''
+    _line = 1
+
+    while True:
+        _chunk = src_f.read(chunk_size)
+        _eof = not _chunk
+        _buffer = _carry + _chunk
+
+        if not _buffer:
+            break
+
+        # 境界から max_len - 1 文字は次のチャンクと合わせて判定
+        _limit = len(_buffer) if _eof else max(0, len(_buffer) - max_len + 1)
+        _pieces = []
+        _pos = 0
+
+        for _match in pattern.finditer(_buffer):
+            _start = _match.start()
+
+            if _start >= _limit:
+                break
+
+            _src = _match.group()
+            _dst = table[_src]
+
+            _line += _buffer.count('\n', _pos, _start)
+            _pieces.append(_buffer[_pos:_start])
+            _pieces.append(_dst)
+            _pos = _match.end()
+
+            _counts[_src] = _counts.get(_src, 0) + 1
+            result['count'] += 1
 
-def save_lines(filepath, lines: list[str]):
+            if len(_changes) < max_changes:
+                _changes.append({'line': _line, 'src': _src, 'dst': _dst})
+
+            _line += _src.count('\n')
+
+        _end = max(_pos, _limit) if not _eof else len(_buffer)
+        _line += _buffer.count('\n', _pos, _end)
+        _pieces.append(_buffer[_pos:_end])
+        _carry = _buffer[_end:]
+
+        if dst_f is not None:
+            dst_f.write(''.join(_pieces))
+
+        if _eof:
+            break
+
+    result['changed'] = result['count'] > 0
+
+
+def repath(
+            filepaths,
+            path_substitutions: list[dict],
+            file_filter=None,
+            platform_name: str = None,
+            dry_run: bool = False,
+            max_workers: int = None) -> dict:
+    """ 複数のシーンファイル内のパスをまとめて置き換える
+
+    * path_substitutions は mdk.path.mapping と同じ形式 (mdk.path.get_mapping_pairs で置き換えリストに変換)
+    * ファイルごとに mdk.file.replace_text をプロセスプールで並列実行
+    * バイナリファイル (.mb, .usdc など) はスキップ
+    * プロセスプールを使用するため、スクリプトから実行する場合は `if __name__ == '__main__':` 内で呼ぶこと
+
+    Args:
+        filepaths (str or list[str]): ファイルリスト、またはディレクトリ（ディレクトリの場合は iter_files で探索）
+        path_substitutions (list[dict]): パスの置き換え設定
+        file_filter (re.Pattern or tuple[re.Pattern], optional): ファイル名フィルタ
+            (未指定なら FILE_FILTER_TEXT, FILE_FILTER_MAYA, FILE_FILTER_USD)
+        platform_name (str, optional): 置き換え先のOS（未指定なら実行中のOS）
+        dry_run (bool): 保存せずに結果だけ返す
+        max_workers (int, optional): プロセス数（1の場合は並列化しない）
+
+    Returns:
+        dict: 結果
+            * results (list[dict]): ファイルごとの replace_text の結果 ('skipped', 'error' を追加)
+            * files (int): 対象ファイル数
+            * changed (int): 置き換えがあったファイル数
+            * skipped (int): スキップしたファイル数
+            * errors (int): エラーになったファイル数
+            * count (int): 置き換え数の合計
+            * elapsed (float): 処理時間 (秒)
+
+    Examples:
+        >>> _result = mdk.file.repath(SHOW_ROOT, PATH_SUBSTITUTIONS, dry_run=True)
+        >>> print(_result['changed'], _result['count'])
     """
-    lines を <file_path> で保存
+    _start = time.perf_counter()
+
+    if file_filter is None:
+        file_filter = (mdk.path.FILE_FILTER_TEXT, mdk.path.FILE_FILTER_MAYA, mdk.path.FILE_FILTER_USD)
+
+    if isinstance(filepaths, (str, os.PathLike)) and os.path.isdir(filepaths):
+        filepaths = iter_files(filepaths, file_filter)
+
+    _replace_list = mdk.path.get_mapping_pairs(path_substitutions, platform_name)
+    _tasks = [(str(_filepath), _replace_list, dry_run) for _filepath in filepaths]
+
+    if max_workers == 1 or len(_tasks) <= 1:
+        _results = [_repath_worker(_task) for _task in _tasks]
+
+    else:
+        _chunksize = max(1, len(_tasks) // ((max_workers or os.cpu_count() or 1) * 4))
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as _executor:
+            _results = list(_executor.map(_repath_worker, _tasks, chunksize=_chunksize))
+
+    return {
+        'results': _results,
+        'files': len(_results),
+        'changed': sum(1 for _result in _results if _result['changed']),
+        'skipped': sum(1 for _result in _results if _result['skipped']),
+        'errors': sum(1 for _result in _results if _result['error']),
+        'count': sum(_result['count'] for _result in _results),
+        'elapsed': time.perf_counter() - _start,
+    }
+
+
+def _repath_worker(task: tuple) -> dict:
+    """ repath のプロセスプール用関数 """
+    _filepath, _replace_list, _dry_run = task
+
+    _result = {
+        'filepath': _filepath,
+        'changed': False,
+        'count': 0,
+        'counts': {},
+        'changes': [],
+        'skipped': False,
+        'error': None,
+    }
+
+    try:
+        if is_binary(_filepath):
+            _result['skipped'] = True
+        else:
+            _result.update(replace_text(_filepath, _replace_list, dry_run=_dry_run))
+
+    except Exception as ex:
+        _result['error'] = f'{type(ex).__name__}: {ex}'
+
+    return _result
+
+
+def search(
+            root,
+            pattern,
+            regex: bool = False,
+            ignore_case: bool = False,
+            file_filter=None,
+            max_workers: int = None,
+            chunk_size: int = 4 * 1024 * 1024,
+            errors: list = None):
+    """ <root> 以下のテキストファイルから <pattern> を含む行を検索するジェネレータ (grep)
+
+    * os.scandir で探索し、ファイルは chunk_size ずつバイト列で読み込む
+    * 通常の文字列は bytes.find で検索し、regex=True または ignore_case=True の場合のみ正規表現を使用
+    * ファイル単位でプロセスプールで並列検索し、検索が終わったファイルから順に結果を返す
+    * ジェネレータを途中で止める (break / close) と未処理の検索はキャンセル
+    * バイナリファイルはスキップ
+    * root がファイルの場合はそのファイルを検索 (file_filter は使わない)
+    * 読み込めなかったファイル、フォルダはスキップ（errors を指定した場合は追加）
+    * プロセスプールを使用するため、スクリプトから実行する場合は `if __name__ == '__main__':` 内で呼ぶこと
 
     Args:
-        * lines<list> : 文字列リスト
+        root (str or list[str]): ルートディレクトリ、またはファイルリスト
+        pattern (str or re.Pattern): 検索文字列
+        regex (bool): pattern を正規表現として扱う
+        ignore_case (bool): 大文字小文字を区別しない
+        file_filter (re.Pattern or tuple[re.Pattern], optional): ファイル名フィルタ
+            (未指定なら FILE_FILTER_TEXT, FILE_FILTER_MAYA, FILE_FILTER_USD)
+        max_workers (int, optional): プロセス数（1の場合は並列化しない）
+        chunk_size (int): 1回に読み込むバイト数
+        errors (list, optional): 読み込めなかったファイル、フォルダの (パス, エラー) を追加するリスト
+
+    Yields:
+        tuple: (ファイルパス, 行番号(1~), 行)
+
+    Examples:
+        >>> for _filepath, _line_no, _line in mdk.file.search(SHOW_ROOT, 'sh010_plate_v003'):
+        >>>     print(f'{_filepath}:{_line_no}: {_line}')
     """
+    if file_filter is None:
+        file_filter = (mdk.path.FILE_FILTER_TEXT, mdk.path.FILE_FILTER_MAYA, mdk.path.FILE_FILTER_USD)
 
-    with open(filepath, mode='w', encoding='utf8') as _f:
-        _f.writelines(lines)
+    if isinstance(root, (str, os.PathLike)) and os.path.isfile(root):
+        _filepaths = iter([pathlib.Path(root).as_posix()])
+    elif isinstance(root, (str, os.PathLike)):
+        _filepaths = iter_files(root, file_filter, errors=errors)
+    else:
+        _filepaths = iter(root)
 
+    def _get_results(result: tuple) -> list[tuple]:
+        _results, _error = result
 
-def save_text(filepath, data):
-    _path = pathlib.Path(filepath)
-    _path.parent.mkdir(parents=True, exist_ok=True)
-    _path.write_text(data, encoding='utf8')
+        if _error is not None and errors is not None:
+            errors.append(_error)
 
+        return _results
 
+    if isinstance(pattern, re.Pattern):
+        _pattern = pattern.pattern
+        _flags = pattern.flags
+        regex = True
+    else:
+        _pattern = pattern
+        _flags = 0
 
+    if isinstance(_pattern, str):
+        _pattern = _pattern.encode('utf8')
 
-#----------------------------
-# Image
+    if ignore_case and not regex:
+        _pattern = re.escape(_pattern)
+        regex = True
+
+    if ignore_case:
+        _flags |= re.IGNORECASE
+
+    _flags = (_flags | re.MULTILINE) & ~re.UNICODE
+
+    if max_workers == 1:
+        for _filepath in _filepaths:
+            yield from _get_results(_search_worker((_filepath, _pattern, regex, _flags, chunk_size)))
+
+        return
+
+    _max_workers = max_workers or os.cpu_count() or 1
+    _executor = concurrent.futures.ProcessPoolExecutor(max_workers=_max_workers)
+    _futures = set()
+
+    try:
+        for _filepath in itertools.chain(_filepaths, (None,)):
+            if _filepath is not None:
+                _futures.add(_executor.submit(
+                        _search_worker, (_filepath, _pattern, regex, _flags, chunk_size)))
+
+            # 実行待ちは プロセス数 x 4 まで
+            while _futures and (_filepath is None or len(_futures) >= _max_workers * 4):
+                _done, _futures = concurrent.futures.wait(
+                        _futures, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for _future in _done:
+                    yield from _get_results(_future.result())
+
+    finally:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _search_worker(task: tuple) -> tuple:
+    """ search のプロセスプール用関数。(ファイル内で見つかった行のリスト, (パス, エラー) or None) を返す """
+    _filepath, _pattern, _regex, _flags, _chunk_size = task
+    _compiled = re.compile(_pattern, _flags) if _regex else None
+    _result = []
+    _line_no = 1
+    _carry = b''
+
+    try:
+        with open(_filepath, 'rb') as _f:
+            _chunk = _f.read(max(_chunk_size, 8192))
+
+            # バイナリファイルはスキップ
+            if b'\0' in _chunk[:8192]:
+                return _result, None
+
+            while True:
+                _data = _carry + _chunk
+
+                if not _data:
+                    break
+
+                # 行の途中で切らないように、最後の改行までを検索
+                _cut = len(_data) if not _chunk else _data.rfind(b'\n') + 1
+
+                if _cut == 0:
+                    _carry = _data
+                    _chunk = _f.read(_chunk_size)
+                    continue
+
+                _block = _data[:_cut]
+                _carry = _data[_cut:]
+                _pos = 0
+                _counted = 0
+
+                while True:
+                    if _compiled is None:
+                        _hit = _block.find(_pattern, _pos)
+                    else:
+                        _match = _compiled.search(_block, _pos)
+                        _hit = _match.start() if _match else -1
+
+                    if _hit < 0:
+                        break
+
+                    _start = _block.rfind(b'\n', 0, _hit) + 1
+                    _end = _block.find(b'\n', _hit)
+                    _end = len(_block) if _end < 0 else _end
+
+                    _line_no += _block.count(b'\n', _counted, _start)
+                    _counted = _start
+
+                    _line = _block[_start:_end].rstrip(b'\r').decode('utf8', errors='replace')
+                    _result.append((_filepath, _line_no, _line))
+
+                    _pos = _end + 1
+
+                    if _pos >= len(_block):
+                        break
+
+                _line_no += _block.count(b'\n', _counted)
+
+                if not _chunk:
+                    break
+
+                _chunk = _f.read(_chunk_size)
+
+    except OSError as ex:
+        return _result, (_filepath, f'{type(ex).__name__}: {ex}')
+
+    return _result, None
+
+
+#=======================================#
+# I/O
+#=======================================#
+@contextlib.contextmanager
+def atomic_open(filepath, mode: str = 'w', fsync: bool = False, **kwargs):
+    """ 一時ファイルに書き込み、完了後に <filepath> へリネームするコンテキストマネージャ
+
+    * 書き込み中にクラッシュしても <filepath> は書き込み前か後の状態のどちらか
+    * 一時ファイルは同じディレクトリに作成し、os.replace で置き換える
+    * シンボリックリンクの場合はリンク先のファイルを置き換える（リンクは残る）
+    * 既存ファイルがあればパーミッション（可能であれば所有者も）を引き継ぐ
+    * 置き換えのため、既存ファイルのハードリンクは切れる
+    * fsync=True の場合はファイルとディレクトリを fsync してからリネーム
+
+    Args:
+        filepath (str): 保存先
+        mode (str): 'w' or 'wb'
+        fsync (bool): ディスクへの書き込みを保証
+        **kwargs: open() に渡す引数 (encoding など)
+
+    Examples:
+        >>> with mdk.file.atomic_open(<filepath>, 'w', encoding='utf8') as _f:
+        >>>     _f.write('test')
+    """
+    if mode not in ('w', 'wb'):
+        raise ValueError(f'Unsupported mode. mode={mode}')
+
+    _filepath = os.path.realpath(filepath)
+    _dirname, _name = os.path.split(_filepath)
+    _tmp_filepath = os.path.join(_dirname, f'.{_name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp')
+
+    _fd = os.open(_tmp_filepath, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+
+    try:
+        with open(_fd, mode, **kwargs) as _f:
+            yield _f
+
+            if fsync:
+                _f.flush()
+                os.fsync(_f.fileno())
+
+        try:
+            _stat = os.stat(_filepath)
+        except FileNotFoundError:
+            _stat = None
+
+        if _stat is not None:
+            os.chmod(_tmp_filepath, stat.S_IMODE(_stat.st_mode))
+
+            if hasattr(os, 'chown'):
+                try:
+                    os.chown(_tmp_filepath, _stat.st_uid, _stat.st_gid)
+                except OSError:
+                    # 他のユーザーのファイル（root 以外は変更出来ない）
+                    pass
+
+        os.replace(_tmp_filepath, _filepath)
+
+    except BaseException:
+        try:
+            os.unlink(_tmp_filepath)
+        except OSError:
+            pass
+
+        raise
+
+    if fsync and platform.system() != 'Windows':
+        _dir_fd = os.open(_dirname, os.O_RDONLY)
+
+        try:
+            os.fsync(_dir_fd)
+        finally:
+            os.close(_dir_fd)
+
+
+def open_file(filepath):
+    """ <filepath>をOSで開く """
+    if os.path.isfile(filepath):
+
+        if platform.system() == 'Windows':
+            cmd = 'explorer {}'.format(filepath.replace('/', '\\'))
+            subprocess.Popen(cmd)
+        
+        elif platform.system() == 'Darwin':
+            subprocess.call(['open', filepath])
+        
+        else:
+            subprocess.Popen(["xdg-open", filepath])
+
+    else:
+        raise TypeError('"filepath" is not file.')
+    
+
+#----------------------------
+# CSV
+#----------------------------
+def iter_csv(
+            filepath,
+            columns: list[str] = None,
+            converters: dict = None,
+            chunk_size: int = None,
+            encoding: str = None):
+    """ CSVファイルを1行ずつ読み込むジェネレータ
+
+    * ヘッダーは1度だけtupleで作成し、各行で使い回す
+    * 列数が足りない行は空文字で補完
+    * converters で型変換する列の空欄は None になる
+    * 拡張子が .gz の場合は gzip 圧縮ファイルとして読み込む
+
+    Args:
+        filepath (str): CSVファイルパス
+        columns (list[str], optional): 読み込む列名（未指定なら全列）
+        converters (dict, optional): {列名: 変換関数} 例: {'frame': int}
+        chunk_size (int, optional): 指定すると chunk_size 行ごとの list[dict] を返す
+        encoding (str, optional): 文字コード
+
+    Yields:
+        dict or list[dict]: 1行分の辞書（chunk_size指定時は辞書のリスト）
+
+    Raises:
+        KeyError: columns, converters に存在しない列名が指定された場合に発生
+
+    Examples:
+        >>> for _row in mdk.file.iter_csv(<filepath>, columns=['shot', 'frame'], converters={'frame': int}):
+        >>>     print(_row)
+        {'shot': 'sh010', 'frame': 1001}
+    """
+    if str(filepath).endswith('.gz'):
+        _f = gzip.open(filepath, 'rt', encoding=encoding, newline='')
+    else:
+        _f = open(filepath, 'r', encoding=encoding, newline='')
+
+    with _f:
+        _reader = csv.reader(_f)
+        _header = tuple(next(_reader, ()))
+
+        # 列の射影
+        if columns:
+            _names = tuple(columns)
+
+            for _name in _names:
+                if _name not in _header:
+                    raise KeyError(f'Column is not found. column={_name}')
+
+            _indices = [_header.index(_name) for _name in _names]
+            _width = max(_indices) + 1
+
+            if len(_indices) == 1:
+                _getter = lambda _row: (_row[_indices[0]],)
+            else:
+                _getter = operator.itemgetter(*_indices)
+
+        else:
+            _names = _header
+            _width = len(_header)
+            _getter = None
+
+        # 型変換
+        _converters = []
+
+        for _name, _func in (converters or {}).items():
+            if _name not in _names:
+                raise KeyError(f'Column is not found. column={_name}')
+
+            _converters.append((_names.index(_name), _func))
+
+        def _iter_rows():
+            for _row in _reader:
+                if len(_row) < _width:
+                    _row = _row + [''] * (_width - len(_row))
+
+                if _getter:
+                    _row = _getter(_row)
+
+                if _converters:
+                    _row = list(_row)
+
+                    for _i, _func in _converters:
+                        if _i < len(_row):
+                            _row[_i] = _func(_row[_i]) if _row[_i] != '' else None
+
+                yield dict(zip(_names, _row))
+
+        if chunk_size:
+            _rows = _iter_rows()
+
+            while True:
+                _chunk = list(itertools.islice(_rows, chunk_size))
+
+                if not _chunk:
+                    break
+
+                yield _chunk
+
+        else:
+            yield from _iter_rows()
+
+
+def load_csv(
+            filepath,
+            columns: list[str] = None,
+            converters: dict = None,
+            columnar: bool = False,
+            encoding: str = None) -> list[dict]:
+    """ CSVファイルを開く
+
+    * iter_csv のラッパー
+    * columnar=True の場合は {列名: 値} の列形式で返す。
+      数値列は numpy.ndarray (int64 / float64, 空欄は nan) 、それ以外は list
+
+    Args:
+        filepath (str): CSVファイルパス
+        columns (list[str], optional): 読み込む列名
+        converters (dict, optional): {列名: 変換関数}
+        columnar (bool): 列形式で返す（NumPyが必要）
+        encoding (str, optional): 文字コード
+
+    Returns:
+        list[dict] or dict: 行のリスト、または列形式の辞書
+
+    Raises:
+        ImportError: columnar=True でNumPyが無い場合に発生
+
+    Examples:
+        >>> mdk.file.load_csv(<filepath>)
+        [{'shot': 'sh010', 'frame': '1001'}, ...]
+        >>> mdk.file.load_csv(<filepath>, columns=['frame'], columnar=True)
+        {'frame': array([1001, 1002, ...])}
+    """
+    _rows = iter_csv(
+            filepath,
+            columns=columns,
+            converters=converters,
+            encoding=encoding)
+
+    if not columnar:
+        return list(_rows)
+
+    if numpy is None:
+        raise ImportError('numpy is required for columnar mode.')
+
+    _columns = {}
+
+    for _row in _rows:
+        if not _columns:
+            _columns = {_name: [] for _name in _row}
+
+        for _name, _value in _row.items():
+            _columns[_name].append(_value)
+
+    return {_name: _to_numeric_array(_values) for _name, _values in _columns.items()}
+
+
+def _to_numeric_array(values: list):
+    """ 数値列を numpy.ndarray に変換。変換できない場合は list のまま返す """
+    if not any(type(_value) == float for _value in values):
+        try:
+            return numpy.fromiter(
+                        (int(_value) for _value in values),
+                        dtype=numpy.int64,
+                        count=len(values))
+        except (TypeError, ValueError):
+            pass
+
+    try:
+        return numpy.fromiter(
+                    (numpy.nan if _value in ('', None) else float(_value) for _value in values),
+                    dtype=numpy.float64,
+                    count=len(values))
+    except (TypeError, ValueError):
+        return values
+
+
+def save_csv(
+            filepath,
+            data,
+            fieldnames: list[str] = None,
+            compress: bool = None,
+            encoding: str = None,
+            chunk_size: int = 10000,
+            buffer_size: int = 1024 * 1024) -> int:
+    """ CSVファイルを保存する
+
+    * data は list だけでなく、ジェネレータなど任意のイテレータを受け付ける
+    * 行が dict の場合、fieldnames（未指定なら先頭行のキー）をヘッダーとして書き込む
+    * 行が list / tuple の場合、fieldnames 指定時のみヘッダーを書き込む
+    * chunk_size 行ずつまとめて、buffer_size のバッファ経由で書き込む
+    * compress=True、または拡張子が .gz の場合は gzip 圧縮で保存
+
+    Args:
+        filepath (str): 保存先
+        data (Iterable[dict or Sequence]): 行データ
+        fieldnames (list[str], optional): ヘッダー（列名）
+        compress (bool, optional): gzip 圧縮（未指定なら拡張子で判定）
+        encoding (str, optional): 文字コード
+        chunk_size (int): まとめて書き込む行数
+        buffer_size (int): 書き込みバッファサイズ (byte)
+
+    Returns:
+        int: 書き込んだ行数（ヘッダーを除く）
+
+    Examples:
+        >>> mdk.file.save_csv(<filepath>, [['shot', 'frame'], ['sh010', 1001]])
+        >>> mdk.file.save_csv(<filepath>.csv.gz, ({'shot': _shot, 'frame': _frame} for ...))
+    """
+    if compress is None:
+        compress = str(filepath).endswith('.gz')
+
+    _rows = iter(data)
+    _first = next(_rows, None)
+    _count = 0
+
+    if compress:
+        _f = io.TextIOWrapper(
+                io.BufferedWriter(gzip.GzipFile(filepath, 'wb'), buffer_size),
+                encoding=encoding,
+                newline='')
+    else:
+        _f = open(filepath, 'w', encoding=encoding, newline='', buffering=buffer_size)
+
+    with _f:
+        _writer = csv.writer(_f, lineterminator='\n') # 改行コード（\n）を指定しておく
+
+        if _first is None:
+            if fieldnames:
+                _writer.writerow(fieldnames)
+
+            return _count
+
+        _rows = itertools.chain((_first,), _rows)
+
+        if isinstance(_first, dict):
+            if fieldnames is None:
+                fieldnames = list(_first)
+
+            _writer.writerow(fieldnames)
+            _rows = (tuple(_row.get(_name, '') for _name in fieldnames) for _row in _rows)
+
+        elif fieldnames:
+            _writer.writerow(fieldnames)
+
+        while True:
+            _chunk = list(itertools.islice(_rows, chunk_size))
+
+            if not _chunk:
+                break
+
+            _writer.writerows(_chunk)
+            _count += len(_chunk)
+
+    return _count
+
+
+
+#----------------------------
+# JSON
+#----------------------------
+def decode_text(data: bytes, encodings: tuple[str] = ('utf-8', 'cp932')) -> str:
+    """ バイト列の文字コードを判定して文字列に変換
+
+    * BOM があればBOMの文字コードでデコード
+    * BOM が無ければ encodings の順に試しデコードし、最初に成功したものを使用
+
+    Args:
+        data (bytes): バイト列
+        encodings (tuple[str]): 試す文字コード
+
+    Returns:
+        str: デコードした文字列
+
+    Raises:
+        UnicodeDecodeError: 全ての文字コードでデコード出来なかった場合に発生
+    """
+    for _bom, _encoding in _BOMS:
+        if data.startswith(_bom):
+            return data.decode(_encoding)
+
+    for _encoding in encodings[:-1]:
+        try:
+            return data.decode(_encoding)
+        except UnicodeDecodeError:
+            pass
+
+    return data.decode(encodings[-1])
+
+
+def dump_json(dict_data: dict, indent: int = 4) -> bytes:
+    """ データを UTF-8 の JSON バイト列に変換（キーはソート） """
+    if orjson is not None and indent in (None, 2):
+        _option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+        if indent:
+            _option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(dict_data, option=_option)
+
+    return json.dumps(
+            dict_data, indent=indent, sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+
+def load_json(json_file_path: str) -> dict:
+    """
+    Windows版 Blender 対策でencodeを'cp932'に。
+        * Blender依存なのか？Python 3.10のせいか？理由は不明
+
+    * ファイルは1度だけバイト列で読み込む
+    * orjson がインストールされていれば、まずバイト列をそのまま orjson でパース
+        * JSONDecodeError の場合だけ標準json でパースし直す
+          (BOM 付き、UTF-8 でない (CP932)、NaN / Infinity を含むなど orjson が非対応のもの)
+    * 文字コードは UTF-8 でデコード出来なかった場合だけ decode_text で判定
+
+    Todo:
+        * CP932がDOS用のJISコードであるため、将来的にOS判定が必要かも by Yamagishi
+
+    """
+    with open(json_file_path, 'rb') as _f:
+        _data = _f.read()
+
+    if orjson is not None:
+        try:
+            return orjson.loads(_data)
+        except orjson.JSONDecodeError:
+            pass
+
+    try:
+        _text = _data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        _text = decode_text(_data, ('cp932',))
+
+    return json.loads(_text)
+
+
+def freeze(data):
+    """ dict / list を変更不可の MappingProxyType / tuple に再帰的に変換 """
+    if isinstance(data, dict):
+        return types.MappingProxyType({_key: freeze(_value) for _key, _value in data.items()})
+
+    elif isinstance(data, list):
+        return tuple(freeze(_value) for _value in data)
+
+    return data
+
+
+def thaw(data):
+    """ freeze したデータを変更可能な dict / list に再帰的に戻す """
+    if isinstance(data, (dict, types.MappingProxyType)):
+        return {_key: thaw(_value) for _key, _value in data.items()}
+
+    elif isinstance(data, (list, tuple)):
+        return [thaw(_value) for _value in data]
+
+    return data
+
+
+def load_json_cached(json_file_path: str, copy: bool = False):
+    """ プロセス共通キャッシュ経由で Json ファイルを読み込む
+
+    * os.stat 1回 (st_mtime_ns, st_size) で変更を確認し、変更が無ければパースしない
+    * 戻り値は変更不可 (dict -> MappingProxyType, list -> tuple)
+    * copy=True の場合は変更可能なコピー (dict / list) を返す
+
+    Args:
+        json_file_path (str): Jsonファイルパス
+        copy (bool): 変更可能なコピーを返す
+
+    Examples:
+        >>> _config = mdk.file.load_json_cached(<filepath>)
+        >>> _config['ROOT']
+        >>> mdk.file.get_json_cache().get_stats()
+        {'hits': 120, 'misses': 3, 'size': 3, 'maxsize': 256}
+    """
+    return _JSON_CACHE.load(json_file_path, copy=copy)
+
+
+def get_json_cache():
+    """ load_json_cached が使用するプロセス共通の JsonCache を取得 """
+    return _JSON_CACHE
+
+
+def save_json(
+            json_file_path: str,
+            dict_data: dict,
+            indent: int = 4,
+            atomic: bool = True,
+            fsync: bool = False):
+    """
+    Jsonファイルの保存
+
+    * orjson がインストールされていて indent が 2 または None の場合は orjson で書き出す
+      (orjson はインデント2のみ対応のため、デフォルトの indent=4 は標準json)
+    * atomic=True の場合は atomic_open で書き込む（途中で落ちても壊れたJsonが残らない）
+
+    Args:
+        json_file_path (str): 保存先
+        dict_data (dict): 保存するデータ
+        indent (int, optional): インデント幅
+        atomic (bool): 一時ファイル + リネームで保存
+        fsync (bool): ディスクへの書き込みを保証 (atomic=True の場合のみ)
+    """
+    _data = dump_json(dict_data, indent=indent)
+
+    if atomic:
+        with atomic_open(json_file_path, 'wb', fsync=fsync) as f:
+            f.write(_data)
+    else:
+        with open(json_file_path, 'wb') as f:
+            f.write(_data)
+
+    _JSON_CACHE.invalidate(json_file_path)
+
+        
+#----------------------------
+# TEXT
+#----------------------------
+def load_lines(filepath) -> list:
+    """
+    <file_path> のテキストをlinesで開く
+    """
+    with open(filepath, encoding='utf8', errors='ignore') as _f:
+        _result = _f.readlines()
+
+    return _result
+
+
+
+def load_text(filepath):
+    return pathlib.Path(filepath).read_text(encoding='utf8')
+ 
+
+
+def save_lines(filepath, lines: list[str], atomic: bool = True, fsync: bool = False):
+    """
+    lines を <file_path> で保存
+
+    Args:
+        * lines<list> : 文字列リスト
+        * atomic<bool> : 一時ファイル + リネームで保存
+        * fsync<bool> : ディスクへの書き込みを保証 (atomic=True の場合のみ)
+    """
+    if atomic:
+        with atomic_open(filepath, mode='w', fsync=fsync, encoding='utf8') as _f:
+            _f.writelines(lines)
+
+    else:
+        with open(filepath, mode='w', encoding='utf8') as _f:
+            _f.writelines(lines)
+
+
+def save_text(filepath, data, atomic: bool = True, fsync: bool = False):
+    """
+    data を <file_path> で保存。親ディレクトリが無ければ作成
+
+    Args:
+        * data<str> : 文字列
+        * atomic<bool> : 一時ファイル + リネームで保存
+        * fsync<bool> : ディスクへの書き込みを保証 (atomic=True の場合のみ)
+    """
+    _path = pathlib.Path(filepath)
+    _path.parent.mkdir(parents=True, exist_ok=True)
+
+    if atomic:
+        with atomic_open(_path, mode='w', fsync=fsync, encoding='utf8') as _f:
+            _f.write(data)
+
+    else:
+        _path.write_text(data, encoding='utf8')
+
+
+
+
+#----------------------------
+# Image
 #----------------------------
 def save_image_from_url(url, image_filepath):
     """ urlで指定された画像ファイルを保存する """
     try:
-        with urllib.request.urlopen(url) as web_file:
-            data = web_file.read()
-            with open(image_filepath, mode='wb') as local_file:
-                local_file.write(data)
+        download_url(url, image_filepath)
                 
     except urllib.error.URLError as ex:
-        raise urllib.error.URLError(ex)
\ No newline at end of file
+        raise urllib.error.URLError(ex)
+
+
+
+#=======================================#
+# Class
+#=======================================#
+class JsonCache:
+    """ Json ファイル用 LRU キャッシュ
+
+    * パスをキーに、os.stat の (st_mtime_ns, st_size) で変更を判定
+    * キャッシュしたデータは変更不可の形 (MappingProxyType / tuple) で保持
+    * maxsize を超えると最も古く参照されたファイルから破棄
+
+    Attributes:
+        _entries (OrderedDict): {パス: ((st_mtime_ns, st_size), データ)}
+        _maxsize (int): 最大キャッシュ数
+        _hits (int): ヒット数
+        _misses (int): ミス数
+    """
+    def __init__(self, maxsize: int = 256) -> None:
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+
+        self._hits = 0
+        self._misses = 0
+
+
+    def clear(self):
+        """ キャッシュと統計をクリア """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+    def get_stats(self) -> dict:
+        """ ヒット数、ミス数、キャッシュ数を取得 """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'size': len(self._entries),
+                'maxsize': self._maxsize,
+            }
+
+
+    def invalidate(self, filepath: str):
+        """ <filepath> のキャッシュを破棄 """
+        with self._lock:
+            self._entries.pop(os.path.abspath(filepath), None)
+
+
+    def load(self, filepath: str, copy: bool = False):
+        """ Json ファイルをキャッシュ経由で読み込む
+
+        Args:
+            filepath (str): Jsonファイルパス
+            copy (bool): 変更可能なコピーを返す
+
+        Raises:
+            FileNotFoundError: ファイルが無い場合に発生
+        """
+        _key = os.path.abspath(filepath)
+        _stat = os.stat(_key)
+        _signature = (_stat.st_mtime_ns, _stat.st_size)
+
+        with self._lock:
+            _entry = self._entries.get(_key)
+
+            if _entry and _entry[0] == _signature:
+                self._entries.move_to_end(_key)
+                self._hits += 1
+                _value = _entry[1]
+            else:
+                self._misses += 1
+                _value = _MISSING
+
+        if _value is _MISSING:
+            _value = freeze(load_json(_key))
+
+            with self._lock:
+                self._entries[_key] = (_signature, _value)
+                self._entries.move_to_end(_key)
+
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+
+        if copy:
+            return thaw(_value)
+
+        return _value
+
+
+
+class BatchWriter:
+    """ 小さな書き込みをまとめて保存するライター
+
+    * window 秒の間に同じファイルへ書き込まれた内容は最後の1回だけ保存する
+    * append_text は window 内の追記をまとめて1回で追記する
+    * 保存は atomic_open（append_text は追記モード）で行う
+    * with 文を抜ける時、close() 時に未保存の内容を全て保存
+    * 保存に失敗した内容は未保存に戻して再保存（get_errors でエラーを取得）
+        * 再保存の間隔は window から倍々に延ばす（最大 BATCH_WRITER_MAX_BACKOFF 秒）
+        * 同じファイルが BATCH_WRITER_MAX_RETRIES 回続けて失敗した場合は、その内容を破棄
+        * flush(), close() は失敗、破棄があった場合 OSError（バックグラウンドで破棄した内容も含む）
+
+    Attributes:
+        _window (float): まとめる時間 (秒)
+        _fsync (bool): ディスクへの書き込みを保証
+        _pending (dict): {パス: (モード, データ)}
+        _failures (dict): {パス: 続けて失敗した回数}
+        _dropped (list): 破棄した内容のエラー（次の flush(), close() で OSError）
+        _errors (deque): 直近のエラー（最大100件）
+
+    Examples:
+        >>> with mdk.file.BatchWriter(window=0.5) as _writer:
+        >>>     for _shot in _shots:
+        >>>         _writer.write_json(f'{ROOT}/{_shot}/info.json', _data)
+        >>>         _writer.append_text(f'{ROOT}/log.txt', f'{_shot}\n')
+    """
+    def __init__(self, window: float = 0.5, fsync: bool = False) -> None:
+        self._window = window
+        self._fsync = fsync
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._event = threading.Event()
+        self._stop = threading.Event()
+        self._closed = False
+        self._failures = {}
+        self._dropped = []
+        self._errors = collections.deque(maxlen=100)
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def _flush(self) -> tuple:
+        """ 未保存の内容を全て保存
+
+        * 保存に失敗したファイルは未保存に戻す（その間に新しく書き込まれた内容がある場合はまとめる）
+        * BATCH_WRITER_MAX_RETRIES 回続けて失敗したファイルは破棄して _dropped に追加
+
+        Returns:
+            tuple: (保存したファイル数, エラーのリスト)
+        """
+        _count = 0
+        _errors = []
+
+        with self._flush_lock:
+            with self._lock:
+                _pending = self._pending
+                self._pending = {}
+
+            for _filepath, (_mode, _data) in _pending.items():
+                try:
+                    self._write(_filepath, _mode, _data)
+                    self._failures.pop(_filepath, None)
+                    _count += 1
+
+                except Exception as ex:
+                    _error = f'{_filepath}: {type(ex).__name__}: {ex}'
+                    self._failures[_filepath] = self._failures.get(_filepath, 0) + 1
+
+                    if self._failures[_filepath] >= BATCH_WRITER_MAX_RETRIES:
+                        del self._failures[_filepath]
+                        _error = f'{_error} (discarded after {BATCH_WRITER_MAX_RETRIES} attempts)'
+
+                        with self._lock:
+                            self._dropped.append(_error)
+
+                    else:
+                        self._restore(_filepath, _mode, _data)
+
+                    _errors.append(_error)
+
+        if _errors:
+            self._errors.extend(_errors)
+
+        return _count, _errors
+
+
+    def _run(self):
+        _retries = 0
+
+        while not self._closed:
+            self._event.wait()
+            self._event.clear()
+
+            if not self._closed:
+                time.sleep(self._window)
+
+                if self._flush()[1]:
+                    # 失敗した内容は _pending に戻っているので、間隔を延ばして再保存
+                    _retries += 1
+                    self._stop.wait(min(self._window * 2 ** _retries, BATCH_WRITER_MAX_BACKOFF))
+                    self._event.set()
+
+                else:
+                    _retries = 0
+
+
+    def _put(self, filepath, mode: str, data: bytes):
+        if self._closed:
+            raise RuntimeError('BatchWriter is closed.')
+
+        _key = os.path.abspath(filepath)
+
+        with self._lock:
+            _entry = self._pending.get(_key)
+
+            if mode == 'w' or _entry is None:
+                self._pending[_key] = (mode, [data] if mode == 'a' else data)
+            elif _entry[0] == 'a':
+                _entry[1].append(data)
+            else:
+                # 上書き予定の内容に追記
+                self._pending[_key] = ('w', _entry[1] + data)
+
+        self._event.set()
+
+
+    def append_text(self, filepath, text: str):
+        """ テキストを追記（window 内の追記はまとめて1回で書き込む） """
+        self._put(filepath, 'a', text.encode('utf8'))
+
+
+    def close(self):
+        """ 未保存の内容を保存して終了 """
+        if not self._closed:
+            self._closed = True
+            self._event.set()
+            self._stop.set()
+            self._thread.join()
+
+        self.flush()
+
+
+    def flush(self) -> int:
+        """ 未保存の内容を全て保存
+
+        Returns:
+            int: 保存したファイル数
+
+        Raises:
+            OSError: 保存に失敗したファイル、前回の flush 以降に破棄した内容がある場合
+                （全てのファイルを試してから発生）
+        """
+        _count, _errors = self._flush()
+
+        with self._lock:
+            _dropped = [_error for _error in self._dropped if _error not in _errors]
+            self._dropped = []
+
+        _errors = _dropped + _errors
+
+        if _errors:
+            raise OSError(f'Failed to write {len(_errors)} file(s).\n' + '\n'.join(_errors))
+
+        return _count
+
+
+    def get_errors(self) -> list[str]:
+        """ 直近の保存エラー（最大100件）を取得 """
+        return list(self._errors)
+
+
+    def _restore(self, filepath: str, mode: str, data):
+        """ 保存に失敗した内容を _pending に戻す """
+        with self._lock:
+            _entry = self._pending.get(filepath)
+
+            if _entry is None:
+                self._pending[filepath] = (mode, data)
+
+            elif _entry[0] == 'a':
+                # 失敗した内容の後に新しい追記
+                if mode == 'a':
+                    self._pending[filepath] = ('a', data + _entry[1])
+                else:
+                    self._pending[filepath] = ('w', data + b''.join(_entry[1]))
+
+            # 新しい上書きがある場合はそちらを保存
+
+
+    def _write(self, filepath: str, mode: str, data):
+        if mode == 'a':
+            with open(filepath, 'ab') as _f:
+                _f.write(b''.join(data))
+
+                if self._fsync:
+                    _f.flush()
+                    os.fsync(_f.fileno())
+
+        else:
+            with atomic_open(filepath, 'wb', fsync=self._fsync) as _f:
+                _f.write(data)
+
+        if filepath.endswith('.json'):
+            _JSON_CACHE.invalidate(filepath)
+
+
+    def write_bytes(self, filepath, data: bytes):
+        """ バイト列を保存（window 内の同じファイルへの書き込みは最後の1回のみ） """
+        self._put(filepath, 'w', data)
+
+
+    def write_json(self, filepath, dict_data: dict, indent: int = 4):
+        """ Json を保存（save_json と同じ形式） """
+        self._put(filepath, 'w', dump_json(dict_data, indent=indent))
+
+
+    def write_text(self, filepath, text: str):
+        """ テキストを保存 """
+        self._put(filepath, 'w', text.encode('utf8'))
+
+
+
+class LineIndex:
+    """ 巨大なテキストファイル用の行インデックス
+
+    * ファイルを mmap し、各行の開始位置 (uint64 の array) で行を管理
+    * 行の取得、スライスは必要な範囲だけデコード
+    * インデックスは <filepath>.lidx に保存し、次回はファイルの変更が無ければ再利用
+    * refresh() で追記された部分だけインデックスを追加（ログファイル用。ローテーションされた場合は開き直す）
+    * NumPy があればインデックス作成に NumPy を使用
+
+    Attributes:
+        _filepath (str): ファイルパス
+        _index_filepath (str): インデックスファイルパス
+        _starts (array.array): 各行の開始位置
+        _size (int): インデックス作成済みのサイズ (byte)
+
+    Examples:
+        >>> with mdk.file.LineIndex('/mnt/show/logs/render.log') as _index:
+        >>>     print(len(_index))
+        >>>     print(_index[-1])
+        >>>     print(_index[1000:1010])
+        >>>     _index.refresh()
+    """
+    _MAGIC = b'MDKLIDX1'
+    _HEADER = struct.Struct('<8sQQII')
+    _CHECK_SIZE = 4096
+    _SCAN_SIZE = 64 * 1024 * 1024
+
+    def __init__(
+                self,
+                filepath: str,
+                index_filepath: str = None,
+                persist: bool = True,
+                encoding: str = 'utf8') -> None:
+        """
+        Args:
+            filepath (str): テキストファイルパス
+            index_filepath (str, optional): インデックスファイルパス（未指定なら <filepath>.lidx）
+            persist (bool): インデックスをファイルに保存、読み込みする
+            encoding (str): 文字コード
+        """
+        self._filepath = str(filepath)
+        self._index_filepath = index_filepath or f'{self._filepath}.lidx'
+        self._persist = persist
+        self._encoding = encoding
+
+        self._file = open(self._filepath, 'rb')
+        self._mmap = None
+        self._starts = array.array('Q', [0])
+        self._size = 0
+
+        self._map()
+
+        if not (persist and self._load()):
+            self._scan()
+
+            if persist:
+                self.save()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            _start, _stop, _step = key.indices(len(self))
+
+            if _step == 1:
+                return self.get_lines(_start, _stop)
+
+            return [self.get_line(_i) for _i in range(_start, _stop, _step)]
+
+        return self.get_line(key)
+
+
+    def __len__(self) -> int:
+        if self._starts[-1] == self._size:
+            return len(self._starts) - 1
+
+        return len(self._starts)
+
+
+    def _checksum(self, size: int) -> tuple:
+        """ 先頭と <size> 直前の CHECK_SIZE byte の crc32 """
+        _head = zlib.crc32(self._mmap[:min(self._CHECK_SIZE, size)]) if size else 0
+        _tail = zlib.crc32(self._mmap[max(0, size - self._CHECK_SIZE):size]) if size else 0
+
+        return _head, _tail
+
+
+    def _load(self) -> bool:
+        """ インデックスファイルを読み込む。使えない場合は False """
+        try:
+            with open(self._index_filepath, 'rb') as _f:
+                _magic, _size, _count, _head, _tail = self._HEADER.unpack(_f.read(self._HEADER.size))
+
+                if _magic != self._MAGIC or _size > self._mapped_size():
+                    return False
+
+                if self._checksum(_size) != (_head, _tail):
+                    return False
+
+                _starts = array.array('Q')
+                _starts.fromfile(_f, _count)
+
+        except (OSError, EOFError, struct.error):
+            return False
+
+        if sys.byteorder == 'big':
+            _starts.byteswap()
+
+        self._starts = _starts
+        self._size = _size
+
+        # 保存後に追記された部分
+        self._scan()
+
+        return True
+
+
+    def _map(self):
+        """ ファイルを mmap し直す """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+    def _mapped_size(self) -> int:
+        return len(self._mmap) if self._mmap is not None else 0
+
+
+    def _scan(self):
+        """ インデックス作成済みの位置からファイル末尾までの改行を探索 """
+        _end = self._mapped_size()
+        _pos = self._size
+
+        while _pos < _end:
+            _stop = min(_pos + self._SCAN_SIZE, _end)
+
+            if numpy is not None:
+                _data = numpy.frombuffer(self._mmap, dtype=numpy.uint8, count=_stop - _pos, offset=_pos)
+                _found = numpy.flatnonzero(_data == 10).astype(numpy.uint64) + (_pos + 1)
+                self._starts.frombytes(_found.tobytes())
+                del _data
+
+            else:
+                _find = self._mmap.find
+                _append = self._starts.append
+                _hit = _find(b'\n', _pos, _stop)
+
+                while _hit >= 0:
+                    _append(_hit + 1)
+                    _hit = _find(b'\n', _hit + 1, _stop)
+
+            _pos = _stop
+
+        self._size = _end
+
+
+    def close(self):
+        """ mmap とファイルを閉じる """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        self._file.close()
+
+
+    def get_bytes(self, index: int) -> bytes:
+        """ <index> 行目 (0~) をバイト列で取得（改行は含まない） """
+        _count = len(self)
+
+        if index < 0:
+            index += _count
+
+        if not 0 <= index < _count:
+            raise IndexError(f'Line index out of range. index={index}')
+
+        _start = self._starts[index]
+        _end = self._starts[index + 1] - 1 if index + 1 < len(self._starts) else self._size
+
+        _data = self._mmap[_start:_end]
+
+        return _data[:-1] if _data.endswith(b'\r') else _data
+
+
+    def get_line(self, index: int) -> str:
+        """ <index> 行目 (0~) を取得（改行は含まない） """
+        return self.get_bytes(index).decode(self._encoding, errors='replace')
+
+
+    def get_lines(self, start: int, stop: int) -> list[str]:
+        """ <start> 行目から <stop> 行目の手前までを取得（改行は含まない） """
+        _count = len(self)
+        start = max(0, min(start, _count))
+        stop = max(start, min(stop, _count))
+
+        if start == stop:
+            return []
+
+        _begin = self._starts[start]
+        _end = self._starts[stop] - 1 if stop < len(self._starts) else self._size
+        _text = self._mmap[_begin:_end].decode(self._encoding, errors='replace')
+
+        return [_line[:-1] if _line.endswith('\r') else _line for _line in _text.split('\n')]
+
+
+    def refresh(self) -> int:
+        """ ファイルの変更を反映
+
+        * 追記された場合は追記部分だけインデックスを追加
+        * それ以外の変更（縮小、書き換え）の場合はインデックスを作り直す
+        * パスのファイルが別のファイルになった場合（ローテーション、atomic_open など rename での置き換え）は
+          開き直してインデックスを作り直す（パスのファイルが無い場合は何もしない）
+
+        Returns:
+            int: 増えた行数（別のファイルになった場合は新しいファイルの行数）
+        """
+        _count = len(self)
+
+        try:
+            _stat = os.stat(self._filepath)
+        except FileNotFoundError:
+            return 0
+
+        _opened = os.fstat(self._file.fileno())
+
+        if (_stat.st_dev, _stat.st_ino) != (_opened.st_dev, _opened.st_ino):
+            _file = open(self._filepath, 'rb')
+
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+            self._file.close()
+            self._file = _file
+            self._starts = array.array('Q', [0])
+            self._size = 0
+
+            self._map()
+            self._scan()
+
+            if self._persist:
+                self.save()
+
+            return len(self)
+
+        _size = _opened.st_size
+
+        if _size == self._size:
+            return 0
+
+        _checksum = self._checksum(self._size) if self._size else None
+        self._map()
+
+        if _size < self._size or (_checksum and self._checksum(self._size) != _checksum):
+            self._starts = array.array('Q', [0])
+            self._size = 0
+
+        self._scan()
+
+        if self._persist:
+            self.save()
+
+        return len(self) - _count
+
+
+    def save(self):
+        """ インデックスをファイルに保存（保存出来ない場合は何もしない） """
+        _starts = self._starts
+
+        if sys.byteorder == 'big':
+            _starts = array.array('Q', _starts)
+            _starts.byteswap()
+
+        try:
+            with atomic_open(self._index_filepath, 'wb') as _f:
+                _f.write(self._HEADER.pack(
+                        self._MAGIC, self._size, len(_starts), *self._checksum(self._size)))
+                _starts.tofile(_f)
+
+        except OSError:
+            pass
+
+
+class Downloader:
+    """ URL ダウンロードマネージャ
+
+    * chunk_size ずつ <dst_path>.part に書き込み、完了後にリネーム（メモリ使用量は一定）
+    * <dst_path>.part が残っていれば Range リクエストで続きからダウンロード
+        * 最初のレスポンスの ETag / Last-Modified と全体サイズを <dst_path>.part.validator に保存し、If-Range で送信
+        * サーバー側のファイルが変わった場合 (200)、全体サイズ、Content-Range の開始位置が違う場合、
+          .validator が無い場合は最初からダウンロード
+    * ホストごとに HTTP 接続をプールして再利用 (Keep-Alive)
+    * download_many は max_workers 並列でダウンロード
+    * リダイレクト (301, 302, 303, 307, 308) に対応
+    * プロキシ (HTTP(S)_PROXY など urllib.request.getproxies) を使う URL、http(s) 以外 (file:// など) は
+      urllib.request のオープナーでダウンロード（接続の再利用なし）
+
+    Attributes:
+        _max_workers (int): 並列数
+        _chunk_size (int): 1回に読み書きするサイズ (byte)
+        _pool (dict): {(scheme, host): [HTTPConnection, ...]}
+
+    Examples:
+        >>> def _progress(url, size, total):
+        >>>     print(f'{url} {size}/{total}')
+        >>>
+        >>> with mdk.file.Downloader(max_workers=8) as _downloader:
+        >>>     _results = _downloader.download_many(
+        >>>         [(_version['image'], f'{ROOT}/{_version["code"]}.jpg') for _version in _versions],
+        >>>         progress=_progress)
+    """
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+    def __init__(
+                self,
+                max_workers: int = 4,
+                chunk_size: int = 1024 * 1024,
+                timeout: float = 60,
+                retries: int = 3,
+                headers: dict = None) -> None:
+        """
+        Args:
+            max_workers (int): download_many の並列数
+            chunk_size (int): 1回に読み書きするサイズ (byte)
+            timeout (float): タイムアウト (秒)
+            retries (int): 接続エラー時のリトライ回数（続きからダウンロード）
+            headers (dict, optional): 全てのリクエストに付けるヘッダー
+        """
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._timeout = timeout
+        self._retries = retries
+        self._headers = dict(headers or {})
+
+        self._pool = {}
+        self._lock = threading.Lock()
+        self._proxies = urllib.request.getproxies()
+        self._opener = urllib.request.build_opener(urllib.request.ProxyHandler(self._proxies))
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def _acquire(self, scheme: str, netloc: str, reuse: bool = True):
+        """ プールから接続を取得（無ければ作成） """
+        if reuse:
+            with self._lock:
+                _connections = self._pool.get((scheme, netloc))
+
+                if _connections:
+                    return _connections.pop()
+
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self._timeout)
+
+        elif scheme == 'http':
+            return http.client.HTTPConnection(netloc, timeout=self._timeout)
+
+        raise ValueError(f'Unsupported scheme. scheme={scheme}')
+
+
+    def _release(self, scheme: str, netloc: str, connection):
+        """ 接続をプールに戻す """
+        with self._lock:
+            self._pool.setdefault((scheme, netloc), []).append(connection)
+
+
+    def _request(self, url: str, offset: int, headers: dict):
+        """ GET リクエスト。リダイレクトを辿って (接続, レスポンス, scheme, netloc) を返す """
+        for _i in range(10):
+            _url = urllib.parse.urlsplit(url)
+            _path = _url.path or '/'
+
+            if _url.query:
+                _path = f'{_path}?{_url.query}'
+
+            _headers = dict(self._headers)
+            _headers.update(headers or {})
+
+            if offset:
+                _headers['Range'] = f'bytes={offset}-'
+
+            _connection = self._acquire(_url.scheme, _url.netloc)
+
+            try:
+                _connection.request('GET', _path, headers=_headers)
+                _response = _connection.getresponse()
+
+            except (OSError, http.client.HTTPException):
+                _connection.close()
+
+                # Keep-Alive が切れていた場合は新しい接続で再送
+                _connection = self._acquire(_url.scheme, _url.netloc, reuse=False)
+
+                try:
+                    _connection.request('GET', _path, headers=_headers)
+                    _response = _connection.getresponse()
+
+                except BaseException:
+                    _connection.close()
+                    raise
+
+            if _response.status in self.REDIRECT_CODES:
+                _response.read()
+                self._release(_url.scheme, _url.netloc, _connection)
+                url = urllib.parse.urljoin(url, _response.getheader('Location'))
+                continue
+
+            return _connection, _response, _url.scheme, _url.netloc
+
+        raise urllib.error.URLError(f'Too many redirects. url={url}')
+
+
+    def close(self):
+        """ プールしている接続を全て閉じる """
+        with self._lock:
+            _pool = self._pool
+            self._pool = {}
+
+        for _connections in _pool.values():
+            for _connection in _connections:
+                _connection.close()
+
+
+    def download(self, url: str, dst_path: str, progress=None, headers: dict = None) -> dict:
+        """ URL のファイルをダウンロード
+
+        Args:
+            url (str): URL
+            dst_path (str): 保存先
+            progress (callable, optional): progress(url, ダウンロード済みbyte, 全体byte or None)
+            headers (dict, optional): リクエストヘッダー
+
+        Returns:
+            dict: 結果
+                * url (str): URL
+                * filepath (str): 保存先
+                * size (int): ファイルサイズ (byte)
+                * resumed (int): 続きからダウンロードした位置 (byte)
+                * elapsed (float): 処理時間 (秒)
+
+        Raises:
+            urllib.error.HTTPError: HTTP エラーの場合に発生
+            urllib.error.URLError: 接続エラーの場合に発生
+        """
+        _start = time.perf_counter()
+        _part_path = f'{dst_path}.part'
+        os.makedirs(os.path.dirname(os.path.abspath(dst_path)), exist_ok=True)
+
+        _resumed = None
+        _retries = self._retries
+
+        while True:
+            _offset = os.path.getsize(_part_path) if os.path.exists(_part_path) else 0
+            _validator = self._load_validator(_part_path) if _offset else None
+
+            if _offset and (_validator is None or (_validator['total'] is not None and _offset > _validator['total'])):
+                # 確認出来ない .part は使わない
+                self._remove_part(_part_path)
+                _offset = 0
+
+            if _resumed is None:
+                _resumed = _offset
+
+            try:
+                _size = self._download_part(url, _part_path, _offset, progress, headers, _validator)
+                break
+
+            except urllib.error.URLError:
+                raise
+
+            except (OSError, http.client.HTTPException) as ex:
+                if _retries <= 0:
+                    raise urllib.error.URLError(ex)
+
+                _retries -= 1
+
+        os.replace(_part_path, dst_path)
+        self._remove_part(f'{_part_path}.validator')
+
+        return {
+            'url': url,
+            'filepath': str(dst_path),
+            'size': _size,
+            'resumed': _resumed,
+            'elapsed': time.perf_counter() - _start,
+        }
+
+
+    def _download_part(
+                self, url: str, part_path: str, offset: int, progress, headers: dict, validator: dict = None) -> int:
+        """ <offset> から <part_path> に書き込む。ダウンロード後のファイルサイズを返す """
+        if self._use_urlopen(url):
+            return self._download_part_urlopen(url, part_path, offset, progress, headers, validator)
+
+        _connection, _response, _scheme, _netloc = self._request(
+                url, offset, self._get_resume_headers(offset, headers, validator))
+
+        try:
+            if _response.status == 416 and offset:
+                # ダウンロード済み、またはサーバー側のファイルが変わった
+                _response.read()
+                self._release(_scheme, _netloc, _connection)
+
+                if self._get_total(_response) == offset == validator['total']:
+                    return offset
+
+                self._remove_part(part_path)
+
+                return self._download_part(url, part_path, 0, progress, headers)
+
+            if _response.status not in (200, 206):
+                _response.read()
+                raise urllib.error.HTTPError(
+                        url, _response.status, _response.reason, _response.headers, None)
+
+            if _response.status == 206 and offset and not self._is_resumable(_response, offset, validator):
+                # サーバー側のファイルが変わった
+                _connection.close()
+                self._remove_part(part_path)
+
+                return self._download_part(url, part_path, 0, progress, headers)
+
+            if _response.status == 200:
+                # Range 非対応のサーバー、If-Range が一致しない（サーバー側のファイルが変わった）場合は最初から
+                offset = 0
+
+            _size = self._write_response(_response, url, part_path, offset, progress)
+
+        except BaseException:
+            _connection.close()
+            raise
+
+        self._release(_scheme, _netloc, _connection)
+
+        return _size
+
+
+    def _download_part_urlopen(
+                self, url: str, part_path: str, offset: int, progress, headers: dict, validator: dict = None) -> int:
+        """ _download_part の urllib.request.urlopen 版（プロキシ、file:// など） """
+        _headers = dict(self._headers)
+        _headers.update(self._get_resume_headers(offset, headers, validator))
+
+        if offset:
+            _headers['Range'] = f'bytes={offset}-'
+
+        try:
+            _response = self._opener.open(urllib.request.Request(url, headers=_headers), timeout=self._timeout)
+
+        except urllib.error.HTTPError as ex:
+            if ex.code != 416 or not offset:
+                raise
+
+            # ダウンロード済み、またはサーバー側のファイルが変わった
+            _total = self._get_total(ex)
+            ex.close()
+
+            if _total == offset == validator['total']:
+                return offset
+
+            self._remove_part(part_path)
+
+            return self._download_part_urlopen(url, part_path, 0, progress, headers)
+
+        with _response:
+            if getattr(_response, 'status', None) == 206 and offset and not self._is_resumable(_response, offset, validator):
+                # サーバー側のファイルが変わった
+                _response.close()
+                self._remove_part(part_path)
+
+                return self._download_part_urlopen(url, part_path, 0, progress, headers)
+
+            if getattr(_response, 'status', None) != 206:
+                # Range 非対応（file:// など）、If-Range が一致しない場合は最初から
+                offset = 0
+
+            return self._write_response(_response, url, part_path, offset, progress)
+
+
+    def _get_resume_headers(self, offset: int, headers: dict, validator: dict) -> dict:
+        """ 続きからダウンロードする場合は .validator の ETag / Last-Modified を If-Range に追加 """
+        headers = dict(headers or {})
+
+        if offset and validator and validator['validator']:
+            headers['If-Range'] = validator['validator']
+
+        return headers
+
+
+    def _is_resumable(self, response, offset: int, validator: dict) -> bool:
+        """ 206 のレスポンスが .part の続きか（Content-Range の開始位置と全体サイズを確認） """
+        _match = re.match(r'bytes\s+(\d+)-\d+/(\d+|\*)', response.headers.get('Content-Range') or '')
+
+        if _match is None or int(_match.group(1)) != offset:
+            return False
+
+        _total = int(_match.group(2)) if _match.group(2) != '*' else None
+
+        return validator['total'] is None or _total == validator['total']
+
+
+    def _load_validator(self, part_path: str) -> dict:
+        """ <part_path>.validator を読み込む（無い、壊れている場合は None） """
+        try:
+            with open(f'{part_path}.validator', 'r', encoding='utf-8') as _f:
+                _data = json.load(_f)
+
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(_data, dict):
+            return None
+
+        return {'validator': _data.get('validator'), 'total': _data.get('total')}
+
+
+    def _remove_part(self, path: str):
+        """ ファイルを削除（.part の場合は .validator も） """
+        for _path in (path, f'{path}.validator') if path.endswith('.part') else (path,):
+            try:
+                os.remove(_path)
+            except FileNotFoundError:
+                pass
+
+
+    def _save_validator(self, part_path: str, response):
+        """ レスポンスの ETag（弱い ETag 以外）or Last-Modified と全体サイズを <part_path>.validator に保存 """
+        _etag = response.headers.get('ETag')
+
+        if _etag and _etag.startswith('W/'):
+            _etag = None
+
+        _total = self._get_total(response) if getattr(response, 'status', None) == 206 else None
+        _length = response.headers.get('Content-Length')
+
+        if _total is None and _length is not None:
+            _total = int(_length)
+
+        with open(f'{part_path}.validator', 'w', encoding='utf-8') as _f:
+            json.dump({'validator': _etag or response.headers.get('Last-Modified'), 'total': _total}, _f)
+
+
+    def _get_total(self, response) -> int:
+        """ Content-Range: bytes */<total> から全体サイズを取得 """
+        _range = response.headers.get('Content-Range') or ''
+
+        try:
+            return int(_range.rsplit('/', 1)[1])
+        except (IndexError, ValueError):
+            return None
+
+
+    def _use_urlopen(self, url: str) -> bool:
+        """ urlopen でダウンロードする URL か（http(s) 以外、プロキシを使う URL） """
+        _url = urllib.parse.urlsplit(url)
+
+        if _url.scheme not in ('http', 'https'):
+            return True
+
+        return _url.scheme in self._proxies and not urllib.request.proxy_bypass(_url.hostname or '')
+
+
+    def _write_response(self, response, url: str, part_path: str, offset: int, progress) -> int:
+        """ レスポンスを chunk_size ずつ <part_path> に書き込む。書き込み後のファイルサイズを返す """
+        _length = response.headers.get('Content-Length')
+        _total = offset + int(_length) if _length is not None else None
+        _size = offset
+
+        if not offset:
+            self._save_validator(part_path, response)
+
+        with open(part_path, 'ab' if offset else 'wb') as _f:
+            while True:
+                _chunk = response.read(self._chunk_size)
+
+                if not _chunk:
+                    break
+
+                _f.write(_chunk)
+                _size += len(_chunk)
+
+                if progress:
+                    progress(url, _size, _total)
+
+        if _total is not None and _size != _total:
+            raise http.client.IncompleteRead(b'', _total - _size)
+
+        return _size
+
+
+    def download_many(self, items: list[tuple], progress=None, headers: dict = None) -> list[dict]:
+        """ 複数の URL を並列でダウンロード
+
+        Args:
+            items (list[tuple]): [(url, 保存先), ...]
+            progress (callable, optional): progress(url, ダウンロード済みbyte, 全体byte or None)
+            headers (dict, optional): リクエストヘッダー
+
+        Returns:
+            list[dict]: items と同じ順番の download の結果（失敗した場合は 'error' にエラーメッセージ）
+        """
+        def _download(item):
+            _url, _dst_path = item
+
+            try:
+                _result = self.download(_url, _dst_path, progress=progress, headers=headers)
+                _result['error'] = None
+
+            except Exception as ex:
+                _result = {
+                    'url': _url,
+                    'filepath': str(_dst_path),
+                    'size': 0,
+                    'resumed': 0,
+                    'elapsed': 0.0,
+                    'error': f'{type(ex).__name__}: {ex}',
+                }
+
+            return _result
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as _executor:
+            return list(_executor.map(_download, items))
+
+
+class Purger:
+    """ ゴミ箱 (soft_delete) の中身をバックグラウンドで削除
+
+    * ディスパッチ用スレッドが1つ、削除用スレッドが max_workers 個
+    * ディレクトリは直下のファイル、フォルダ単位で削除用スレッドに振り分け（同時 I/O は max_workers まで）
+    * get_status() で状態と削除数などを取得
+
+    Attributes:
+        _queue (queue.Queue): 削除待ちのパス
+        _metrics (dict): 削除数などの集計
+
+    Examples:
+        >>> mdk.file.delete(<filepath>, soft=True)
+        >>> mdk.file.get_purger().get_status()
+        {'running': True, 'queued': 0, 'active': '/mnt/show/.mdk_trash/...', 'items': 3, 'files': 12034, ...}
+    """
+    def __init__(self, max_workers: int = 4) -> None:
+        self._max_workers = max_workers
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread = None
+        self._stopped = None
+        self._start_lock = threading.Lock()
+        self._active = None
+        self._scanned = set()
+
+        self._metrics = {
+            'items': 0,
+            'files': 0,
+            'dirs': 0,
+            'bytes': 0,
+            'errors': 0,
+            'elapsed': 0.0,
+        }
+        self._errors = collections.deque(maxlen=100)
+
+
+    def _count(self, key: str, value=1):
+        with self._lock:
+            self._metrics[key] += value
+
+
+    def _remove(self, filepath: str):
+        """ ファイル、ディレクトリを削除（ディレクトリは os.scandir で再帰） """
+        try:
+            if os.path.isdir(filepath) and not os.path.islink(filepath):
+                with os.scandir(filepath) as _entries:
+                    for _entry in _entries:
+                        if _entry.is_dir(follow_symlinks=False):
+                            self._remove(_entry.path)
+                        else:
+                            self._unlink(_entry.path, _entry.stat(follow_symlinks=False).st_size)
+
+                _retry_permission(os.rmdir, filepath)
+                self._count('dirs')
+
+            else:
+                self._unlink(filepath, os.lstat(filepath).st_size)
+
+        except FileNotFoundError:
+            pass
+
+        except OSError as ex:
+            self._count('errors')
+            self._errors.append(f'{filepath}: {ex}')
+
+
+    def _run(self):
+        while True:
+            _filepath = self._queue.get()
+
+            if _filepath is None:
+                self._queue.task_done()
+                break
+
+            with self._lock:
+                self._active = _filepath
+
+            _start = time.perf_counter()
+
+            try:
+                if os.path.isdir(_filepath) and not os.path.islink(_filepath):
+                    with os.scandir(_filepath) as _entries:
+                        _children = [_entry.path for _entry in _entries]
+
+                    # 直下のファイル、フォルダを並列で削除
+                    list(self._executor.map(self._remove, _children))
+
+                self._remove(_filepath)
+
+            except FileNotFoundError:
+                pass
+
+            except Exception as ex:
+                self._count('errors')
+                self._errors.append(f'{_filepath}: {ex}')
+
+            with self._lock:
+                self._active = None
+                self._metrics['items'] += 1
+                self._metrics['elapsed'] += time.perf_counter() - _start
+
+            self._queue.task_done()
+
+
+    def _unlink(self, filepath: str, size: int):
+        _retry_permission(os.unlink, filepath)
+
+        with self._lock:
+            self._metrics['files'] += 1
+            self._metrics['bytes'] += size
+
+
+    def get_errors(self) -> list[str]:
+        """ 直近のエラー（最大100件）を取得 """
+        return list(self._errors)
+
+
+    def get_status(self) -> dict:
+        """ 状態と集計を取得
+
+        Returns:
+            dict:
+                * running (bool): スレッドが動いているか
+                * queued (int): 削除待ちの数
+                * active (str): 削除中のパス
+                * items (int): 削除したゴミ箱内のアイテム数
+                * files (int): 削除したファイル数
+                * dirs (int): 削除したディレクトリ数
+                * bytes (int): 削除したファイルサイズの合計
+                * errors (int): エラー数
+                * elapsed (float): 削除にかかった時間の合計 (秒)
+        """
+        with self._lock:
+            _status = {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'queued': self._queue.qsize(),
+                'active': self._active,
+            }
+            _status.update(self._metrics)
+
+        return _status
+
+
+    def join(self):
+        """ 削除待ちが無くなるまで待つ """
+        self._queue.join()
+
+
+    def _join_stopped(self):
+        """ stop(wait=False) したスレッドの終了を待つ（_start_lock 内で呼ぶ） """
+        if self._stopped is not None:
+            _thread, _executor = self._stopped
+            _thread.join()
+            _executor.shutdown()
+            self._stopped = None
+
+
+    def purge(self, filepath: str):
+        """ <filepath> を削除待ちに追加（スレッドが無ければ開始）
+
+        * stop(wait=False) 後の場合は、前のスレッドが終了してから新しいスレッドを開始
+        """
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._join_stopped()
+
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers)
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+            self._queue.put(str(filepath))
+
+
+    def purge_trash(self, trash_dir: str, once: bool = False) -> int:
+        """ ゴミ箱内に残っているもの（前回のセッションの残りなど）を全て削除待ちに追加
+
+        Args:
+            trash_dir (str): ゴミ箱ディレクトリパス
+            once (bool): 既に追加したゴミ箱の場合は何もしない
+
+        Returns:
+            int: 追加した数
+        """
+        _key = os.path.abspath(trash_dir)
+
+        with self._lock:
+            if once and _key in self._scanned:
+                return 0
+
+            self._scanned.add(_key)
+
+        _count = 0
+
+        try:
+            with os.scandir(trash_dir) as _entries:
+                for _entry in _entries:
+                    self.purge(_entry.path)
+                    _count += 1
+
+        except FileNotFoundError:
+            pass
+
+        return _count
+
+
+    def stop(self, wait: bool = True):
+        """ スレッドを停止（削除待ちを全て削除してから停止）
+
+        Args:
+            wait (bool): False の場合は停止を待たない（次の purge で前のスレッドの終了を待つ）
+        """
+        with self._start_lock:
+            _thread = self._thread
+            self._thread = None
+
+            if _thread is not None:
+                self._queue.put(None)
+                self._stopped = (_thread, self._executor)
+
+            if wait:
+                self._join_stopped()
+
+
+
+_JSON_CACHE = JsonCache()
+_PURGER = Purger()
+_TRASH_DIRS = {}
+_TRASH_LOCK = threading.Lock()
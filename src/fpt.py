@@ -9,18 +9,48 @@ Info:
 
 
 Release Note:
-    * LastUpdated : 2025-01-20 Tatsuya Yamagishi
+    * LastUpdated : 2026-10-19 Tatsuya Yamagishi
+        * added : Session (スレッドごとのクライアントを再利用)
+        * changed : login (クライアントは使用時に作成、同じ接続情報の場合は再利用)
+        * added : get_client, refresh, close
+        * added : QueryCache (find / find_one の結果をキャッシュ、書き込み時に破棄)
+        * changed : get_* (cache 引数を追加。False の場合はキャッシュを使わない)
+        * added : batch_create, batch_update
+        * added : gather
+        * added : AsyncFpt
+        * added : iter_find, iter_all_assets, iter_all_shots, iter_all_tasks, iter_all_versions
+        * added : IdentityMap, resolve_codes
+        * changed : get_asset, get_entity, get_shot など find_one の getter (IdentityMap で2回目以降は取得しない)
+        * added : BatchLoader, get_loader, AsyncFpt.load_entity_by_id, AsyncFpt.load_task
+        * added : SchemaCache, get_schema, Fpt(validate=True)
+        * changed : get_field_data, get_asset_type_list (SchemaCache から取得)
+        * added : LocalReplica, get_replica
+
+    * 2025-01-20 Tatsuya Yamagishi
         * added : get_asset
         * added : add_filter
 """
+import asyncio
+import collections
+import concurrent.futures
+import copy
 import datetime
 import functools
+import json
+import os
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+import weakref
 import webbrowser
 
 try:
     import shotgun_api3
-except:
-    pass
+except ImportError:
+    shotgun_api3 = None
 
 
 import mdk_libs as mdk
@@ -28,6 +58,113 @@ import mdk_libs as mdk
 #=======================================#
 # Settings
 #=======================================#
+# この秒数以上使用していないクライアントは、使用前に info() で接続を確認
+SESSION_VALIDATE_INTERVAL = 300
+
+# 認証エラー（クライアントを作り直して再実行）
+_AUTH_ERRORS = (shotgun_api3.AuthenticationFault,) if shotgun_api3 else ()
+
+# batch() の項目のエラー（サーバーが処理して返したエラー。チャンクを分けて再実行）
+_FAULT_ERRORS = (shotgun_api3.Fault,) if shotgun_api3 else ()
+
+# find / find_one のキャッシュ (Fpt(cache_ttl=0) で無効)
+QUERY_CACHE_TTL = 60
+QUERY_CACHE_MAXSIZE = 512
+
+# batch_create / batch_update の1回の batch() の件数と並列数
+BATCH_CHUNK_SIZE = 100
+BATCH_MAX_WORKERS = 4
+
+# gather のスレッドプールのサイズ（同時に実行する数の上限）
+GATHER_MAX_WORKERS = 8
+
+# iter_find の次のページの先読み用のスレッドプールのサイズ
+# （gather とは別。gather の中で iter_find を使ってもスレッドプールを使い切らないように）
+PREFETCH_MAX_WORKERS = 4
+
+# gather で cancel_event を確認する間隔 (秒)
+GATHER_POLL_INTERVAL = 0.05
+
+# BatchLoader で個別の取得をまとめる時間 (秒) と1回の find にまとめる最大件数
+LOADER_WINDOW = 0.01
+LOADER_MAX_BATCH_SIZE = 200
+
+# SchemaCache の保存先、この秒数より古い場合はバックグラウンドで取得し直す
+SCHEMA_CACHE_DIR = os.environ.get('MDK_FPT_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.mdk_libs', 'fpt')
+SCHEMA_CACHE_MAX_AGE = 24 * 60 * 60
+
+# SchemaCache.validate でスキーマに無いフィールドがあった場合、この秒数以上経っていれば取得し直して再確認
+SCHEMA_REFRESH_MIN_INTERVAL = 60
+
+# LocalReplica で複製するエンティティタイプとフィールド
+REPLICA_FIELDS = {
+    'Asset': ['code', 'description', 'sg_asset_type', 'sg_status_list'],
+    'Shot': ['code', 'description', 'sg_cut_in', 'sg_cut_out', 'sg_name', 'sg_sequence', 'sg_status_list'],
+    'Task': ['content', 'due_date', 'entity', 'sg_status_list', 'start_date', 'step', 'task_assignees'],
+    'Version': ['code', 'created_at', 'description', 'entity', 'sg_path_to_frames', 'sg_path_to_movie', 'sg_status_list', 'sg_task', 'user'],
+}
+
+# LocalReplica でインデックスを作るフィールド (コード, リンク先)
+REPLICA_KEY_FIELDS = {
+    'Asset': ('code', None),
+    'Shot': ('sg_name', None),
+    'Task': ('content', 'entity'),
+    'Version': ('code', 'entity'),
+}
+
+# LocalReplica の読み込み時、最後の sync からこの秒数以上経っていればバックグラウンドで sync
+REPLICA_SYNC_INTERVAL = 5 * 60
+
+# 差分取得で前回の updated_at の最大値から遡る秒数（同じ時刻の更新の取りこぼし対策）
+REPLICA_SYNC_OVERLAP = 60
+
+# AsyncFpt の同時実行数
+ASYNC_MAX_CONCURRENCY = 8
+
+# ページ単位で取得する場合の1ページの件数 (ShotGrid の上限)
+PAGE_SIZE = 500
+
+# AsyncFpt で async メソッドにする Fpt のメソッド
+_ASYNC_METHODS = (
+    'batch_create',
+    'batch_update',
+    'create_entity',
+    'create_playlist',
+    'create_timelog',
+    'create_version',
+    'get_all_assets',
+    'get_all_episodes',
+    'get_all_playlists',
+    'get_all_projects',
+    'get_all_scequences',
+    'get_all_shootdays',
+    'get_all_shots',
+    'get_all_task_template',
+    'get_all_tasks',
+    'get_all_users',
+    'get_all_versions',
+    'get_asset',
+    'get_asset_type_list',
+    'get_entity',
+    'get_entity_by_id',
+    'get_episode',
+    'get_field_data',
+    'get_playlist',
+    'get_scene',
+    'get_sequence',
+    'get_shootday',
+    'get_shot',
+    'get_task',
+    'get_version',
+    'update',
+    'upload',
+)
+
+# QueryCache で全てのエンティティタイプの書き込みで破棄する結果のタイプ
+ANY_ENTITY_TYPE = '*'
+
+# フィルター、フィールドのパスに含まれるエンティティタイプ  例: tasks.Task.task_assignees
+_LINKED_ENTITY_TYPE_PATTERN = re.compile(r'\.([A-Z][A-Za-z0-9]*)\.')
 
 
 #=======================================#
@@ -43,6 +180,7 @@ def login_required(func):
 
         logger.debug('UNF | [fpt Loggin required]')
 
+        # ログイン済みの場合はセッションを再利用
         sg.login()
         
         return func(*args, **kwargs)
@@ -78,64 +216,2258 @@ def refine_fpt_entity_list(fpt_entity_list: list[dict]):
         refine_fpt_data(_fpt_entity)
 
 
+def get_query_entity_types(entity_type: str, filters=None, fields=None) -> set:
+    """ クエリが参照しているエンティティタイプを取得
+
+    Examples:
+        >>> mdk.fpt.get_query_entity_types('Shot', [['tasks.Task.task_assignees', 'is', _user]], ['code'])
+        {'Shot', 'Task'}
+    """
+    _entity_types = {entity_type}
+
+    for _text in _iter_query_paths(filters):
+        _entity_types.update(_LINKED_ENTITY_TYPE_PATTERN.findall(_text))
+
+    for _field in fields or ():
+        _entity_types.update(_LINKED_ENTITY_TYPE_PATTERN.findall(_field))
+
+    return _entity_types
+
+
+def _compact_field(props: dict) -> dict:
+    """ SchemaCache 用。schema_read のフィールド情報から必要な項目だけを取り出す """
+    _properties = props.get('properties') or {}
+
+    _field = {
+        'name': (props.get('name') or {}).get('value'),
+        'data_type': (props.get('data_type') or {}).get('value'),
+        'editable': (props.get('editable') or {}).get('value'),
+        'valid_values': (_properties.get('valid_values') or {}).get('value'),
+        'valid_types': (_properties.get('valid_types') or {}).get('value'),
+    }
+
+    return {_key: _value for _key, _value in _field.items() if _value is not None}
+
+
+def _dump_replica_data(entity: dict) -> str:
+    """ LocalReplica 用。エンティティを JSON に変換（datetime, date は型を残す） """
+    def _default(value):
+        if isinstance(value, datetime.datetime):
+            return {'$datetime': value.isoformat()}
+
+        if isinstance(value, datetime.date):
+            return {'$date': value.isoformat()}
+
+        raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+    return json.dumps(entity, default=_default, ensure_ascii=False)
+
+
+def _get_cache_filepath(prefix: str, url: str, project: dict = None, ext: str = '.json') -> str:
+    """ SchemaCache, LocalReplica のファイルパス (<SCHEMA_CACHE_DIR>/<prefix>_<サイト>_<プロジェクトID><ext>) """
+    _site = re.sub(r'[^A-Za-z0-9._-]', '_', urllib.parse.urlparse(url or '').netloc or 'local')
+    _project_id = (project or {}).get('id', 'site')
+
+    return pathlib.Path(SCHEMA_CACHE_DIR, f'{prefix}_{_site}_{_project_id}{ext}').as_posix()
+
+
+def _get_result_entity_types(value, fields) -> set:
+    """ QueryCache 用。結果のフィールドに含まれるリンク先のエンティティタイプ
+
+    * エンティティ、マルチエンティティのフィールドの値の type ('tasks' の Task など)
+    * 空のリストのフィールドはリンク先のタイプが分からないため ANY_ENTITY_TYPE (全ての書き込みで破棄)
+    """
+    _types = set()
+
+    if isinstance(value, dict):
+        value = [value]
+
+    for _entity in value or ():
+        for _field in fields or ():
+            _data = _entity.get(_field)
+
+            if isinstance(_data, dict):
+                if 'type' in _data:
+                    _types.add(_data['type'])
+
+            elif isinstance(_data, list):
+                if not _data:
+                    _types.add(ANY_ENTITY_TYPE)
+
+                for _item in _data:
+                    if isinstance(_item, dict) and 'type' in _item:
+                        _types.add(_item['type'])
+
+    return _types
+
+
+def _iter_filters(filters):
+    """ フィルターを [path, operator, value...] ごとに返す（filter_operator の入れ子にも対応） """
+    for _filter in filters or ():
+        if isinstance(_filter, dict):
+            yield from _iter_filters(_filter.get('filters'))
+
+        elif _filter and isinstance(_filter[0], str):
+            yield _filter
+
+
+def _iter_query_paths(filters):
+    """ フィルターのフィールドパスを返す（filter_operator の入れ子にも対応） """
+    for _filter in _iter_filters(filters):
+        yield _filter[0]
+
+
+def _load_replica_data(text: str) -> dict:
+    """ LocalReplica 用。_dump_replica_data の JSON をエンティティに戻す """
+    def _object_hook(value: dict):
+        if len(value) == 1:
+            if '$datetime' in value:
+                return datetime.datetime.fromisoformat(value['$datetime'])
+
+            if '$date' in value:
+                return datetime.date.fromisoformat(value['$date'])
+
+        return value
+
+    return json.loads(text, object_hook=_object_hook)
+
+
+def _match_replica_filter(entity: dict, filter_: list) -> bool:
+    """ LocalReplica 用。'is' / 'is_not' / 'in' / 'not_in' のフィルターを確認（マルチエンティティは含むかどうか） """
+    _field, _operator, _value = filter_
+    _data = entity.get(_field)
+
+    if isinstance(_data, list):
+        _items = {_normalize(_item) for _item in _data} or {None}
+    else:
+        _items = {_normalize(_data)}
+
+    if _operator in ('in', 'not_in'):
+        _values = {_normalize(_item) for _item in _value}
+    else:
+        _values = {_normalize(_value)}
+
+    _matched = not _items.isdisjoint(_values)
+
+    return not _matched if _operator in ('is_not', 'not_in') else _matched
+
+
+def _normalize(value):
+    """ キャッシュのキー用に値を hash 可能な形に変換（エンティティは (type, id)） """
+    if isinstance(value, dict):
+        if 'type' in value and 'id' in value:
+            return (value['type'], value['id'])
+
+        return tuple(sorted((_key, _normalize(_value)) for _key, _value in value.items()))
+
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_normalize(_value) for _value in value)
+
+    return value
+
+
+def _parse_calls(owner, calls: list) -> list[tuple]:
+    """ gather 用。(メソッド名 or 関数, args, kwargs) を (名前, 関数, args, kwargs) に変換
+
+    * args, kwargs は省略可。(名前, args) の2要素も可
+    * メソッド名 or 関数だけ（タプルでない）も可
+    * 形式が違う場合は TypeError
+    """
+    _calls = []
+
+    for _call in calls:
+        if isinstance(_call, str) or callable(_call):
+            _call = (_call,)
+
+        _call = tuple(_call)
+
+        if not 1 <= len(_call) <= 3:
+            raise TypeError(f'gather call must be (name, args, kwargs): {_call!r}')
+
+        _func, _args, _kwargs = _call + ((), {})[len(_call) - 1:]
+
+        if not isinstance(_args, (tuple, list)) or not isinstance(_kwargs, dict):
+            raise TypeError(f'gather call args must be tuple/list and kwargs dict: {_call!r}')
+
+        if isinstance(_func, str):
+            _name = _func
+            _func = getattr(owner, _func)
+        else:
+            _name = getattr(_func, '__name__', repr(_func))
+
+        _calls.append((_name, _func, _args, _kwargs))
+
+    return _calls
+
+
+def _get_page_request(
+            filters: list,
+            order: list[dict],
+            page_size: int,
+            entities: list[dict] = None,
+            page: int = 0) -> tuple:
+    """ ページ単位の取得用。次のページの find の (ページ番号, filters, kwargs)。最後のページの後は None
+
+    * order が None の場合は id 順で ['id', 'greater_than', 前のページの最後の id] を追加してページング
+      （offset と違い、取得中に作成、削除されてもページ間で重複、抜けが無く、後ろのページも遅くならない）
+    * order を指定した場合は limit, page (offset) でページング
+
+    Args:
+        filters (list): フィルター
+        order (list[dict]): 並び順
+        page_size (int): 1ページの件数
+        entities (list[dict], optional): 前のページの結果。None の場合は最初のページ
+        page (int): 前のページのページ番号
+    """
+    if entities is not None and len(entities) < page_size:
+        return None
+
+    page += 1
+    filters = filters or []
+
+    if order:
+        return page, filters, {'order': order, 'limit': page_size, 'page': page}
+
+    if entities:
+        _filter = ['id', 'greater_than', entities[-1]['id']]
+        filters = list(filters) + [_filter] if isinstance(filters, list) else [filters, _filter]
+
+    return page, filters, {'order': [{'field_name': 'id', 'direction': 'asc'}], 'limit': page_size}
+
+
+def _run_timed(func, args: tuple, kwargs: dict) -> tuple:
+    """ gather 用。(結果, エラー, 実行時間) を返す """
+    _start = time.perf_counter()
+
+    try:
+        return func(*args, **kwargs), None, time.perf_counter() - _start
+
+    except Exception as ex:
+        return None, f'{type(ex).__name__}: {ex}', time.perf_counter() - _start
+
+
 #=======================================#
 # Class
 #=======================================#
-class Fpt:
-    """ FPT用クラス
- 
-    ShotGrid Python APIラッパークラス
- 
+class Session:
+    """ shotgun_api3.Shotgun クライアントをスレッドごとに1つ作成して再利用
+
+    * shotgun_api3.Shotgun はスレッドセーフではないため、スレッドごとにクライアントを作成
+    * 作成したクライアント（HTTP接続、server_info）は同じスレッドで使い回す
+    * validate_interval 秒以上使っていないクライアントは使用前に info() で確認し、失敗したら作り直す
+    * AuthenticationFault の場合は refresh してクライアントを作り直し、1回だけ再実行
+    * session.find(...) のように shotgun_api3.Shotgun のメソッドをそのまま呼び出し可能
+
+    Examples:
+        >>> _session = mdk.fpt.Session(URL, SCRIPT_NAME, API_KEY)
+        >>> _session.find('Shot', [['project', 'is', _project]], ['code'])
+        >>> _session.get_stats()
+        {'created': 1, 'validated': 0, 'refreshed': 0, 'calls': 1}
+    """
+    def __init__(
+                self,
+                url: str,
+                script_name: str = None,
+                api_key: str = None,
+                factory=None,
+                validate_interval: float = SESSION_VALIDATE_INTERVAL,
+                **kwargs) -> None:
+
+        if factory is None:
+            if shotgun_api3 is None:
+                raise ImportError('shotgun_api3 is not installed.')
+
+            factory = shotgun_api3.Shotgun
+
+        self._url = url
+        self._kwargs = dict(script_name=script_name, api_key=api_key, **kwargs)
+        self._factory = factory
+        self._validate_interval = validate_interval
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._clients = weakref.WeakSet()
+        self._generation = 0
+        self._stats = {'created': 0, 'validated': 0, 'refreshed': 0, 'calls': 0}
+
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return functools.partial(self.call, name)
+
+
+    def _create_client(self):
+        _client = self._factory(self._url, **self._kwargs)
+
+        with self._lock:
+            self._clients.add(_client)
+            self._stats['created'] += 1
+            _generation = self._generation
+
+        self._local.client = _client
+        self._local.generation = _generation
+        self._local.last_used = time.monotonic()
+
+        return _client
+
+
+    def call(self, method_name: str, *args, **kwargs):
+        """ 現在のスレッドのクライアントでメソッドを実行（認証エラーの場合は1回だけ再実行） """
+        _client = self.get_client()
+
+        try:
+            _result = getattr(_client, method_name)(*args, **kwargs)
+
+        except _AUTH_ERRORS:
+            self.refresh()
+            _result = getattr(self.get_client(), method_name)(*args, **kwargs)
+
+        self._local.last_used = time.monotonic()
+
+        with self._lock:
+            self._stats['calls'] += 1
+
+        return _result
+
+
+    def close(self):
+        """ 全てのスレッドのクライアントの接続を閉じる（次の呼び出しで自動的に再接続） """
+        with self._lock:
+            _clients = list(self._clients)
+
+        for _client in _clients:
+            _close = getattr(_client, 'close', None)
+
+            if _close is not None:
+                try:
+                    _close()
+                except Exception:
+                    pass
+
+
+    def get_client(self):
+        """ 現在のスレッドのクライアントを取得（無ければ作成） """
+        _client = getattr(self._local, 'client', None)
+
+        if _client is None or self._local.generation != self._generation:
+            return self._create_client()
+
+        if time.monotonic() - self._local.last_used > self._validate_interval:
+            with self._lock:
+                self._stats['validated'] += 1
+
+            try:
+                _client.info()
+                self._local.last_used = time.monotonic()
+
+            except Exception:
+                return self._create_client()
+
+        return _client
+
+
+    def get_stats(self) -> dict:
+        """ クライアントの作成数、確認数、作り直し数、呼び出し数を取得 """
+        with self._lock:
+            return dict(self._stats)
+
+
+    def refresh(self):
+        """ 全てのスレッドのクライアントを作り直す（各スレッドの次の呼び出し時に作成） """
+        with self._lock:
+            self._generation += 1
+            self._stats['refreshed'] += 1
+
+        _client = getattr(self._local, 'client', None)
+        self._local.client = None
+
+        if _client is not None and hasattr(_client, 'close'):
+            try:
+                _client.close()
+            except Exception:
+                pass
+
+
+class IdentityMap:
+    """ Fpt で取得したエンティティを (type, id) で保持するマップ
+
+    * 同じエンティティを何度取得しても1つの dict にフィールドをマージ
+    * find_one のフィルター（'is' のみの場合）をキーにして id を記録し、2回目以降はサーバーに問い合わせない
+      例: [['project', 'is', _project], ['code', 'is', 'sh010']] -> ('Shot', 12)
+    * 足りないフィールドだけを id で取得してマージ
+    * update したフィールドはマージし、そのフィールドを含むキーは破棄（code の変更など）
+    * フィールド、キーは ttl 秒で期限切れ（QueryCache と同じ）
+        * 期限切れのフィールドは足りないフィールドとして id で取得し直す
+        * 期限切れのキーはサーバーに問い合わせ直す（サーバー側での code の変更など）
+        * 期限切れのフィールド、キーは add / resolve の際に破棄
+    * maxsize を超えると最も古く参照されたエンティティから破棄（QueryCache と同じ）
+
     Attributes:
-        core (:obj:`core`): パイプラインコア
-        logger (:obj:`logging.logger`): パイプラインロガー
- 
+        _entities (OrderedDict): {(type, id): エンティティ}
+        _expires (dict): {(type, id): {フィールド名: 期限}}
+        _keys (dict): {キー: ((type, id), 期限)}
+        _entity_keys (dict): {(type, id): {キー, ...}}
     """
-    def __init__(self, logger) -> None:
-        self.logger = logger
+    def __init__(self, ttl: float = QUERY_CACHE_TTL, maxsize: int = QUERY_CACHE_MAXSIZE) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entities = collections.OrderedDict()
+        self._expires = {}
+        self._keys = {}
+        self._entity_keys = {}
+        self._lock = threading.Lock()
 
-        self._fpt = None
+        self._stats = {'hits': 0, 'partial': 0, 'misses': 0, 'evictions': 0}
 
-        self._project: dict = None
-        self._user: dict = None
 
-        self._url: str = None
+    def add(self, entity: dict, key: tuple = None, fields: list[str] = None) -> dict:
+        """ エンティティを追加（既にある場合はフィールドをマージ）
 
+        Returns:
+            dict: マージ後の type, id, fields だけのコピー
+        """
+        _id = (entity['type'], entity['id'])
+        _entity = copy.deepcopy(entity)
+        _now = time.monotonic()
+        _expiry = _now + self._ttl
 
-    def exists(self):
-        """  
-        fpt インスタンスオブジェクトの有無。ログイン判定に使用
+        with self._lock:
+            self._purge(_id, _now)
+            self._entities.setdefault(_id, {}).update(_entity)
+            self._entities.move_to_end(_id)
+            self._expires.setdefault(_id, {}).update(dict.fromkeys(_entity, _expiry))
+
+            if key is not None:
+                self._keys[key] = (_id, _expiry)
+                self._entity_keys.setdefault(_id, set()).add(key)
+
+            _result = self._copy(_id, fields)
+
+            # 追加したエンティティは残す
+            while len(self._entities) > max(self._maxsize, 1):
+                self._discard(next(iter(self._entities)))
+                self._stats['evictions'] += 1
+
+        return _result
+
+
+    def clear(self):
+        """ 全てのエンティティと統計をクリア """
+        with self._lock:
+            self._entities.clear()
+            self._expires.clear()
+            self._keys.clear()
+            self._entity_keys.clear()
+
+            for _key in self._stats:
+                self._stats[_key] = 0
+
+
+    def _copy(self, entity_id: tuple, fields: list[str] = None) -> dict:
+        """ type, id, fields だけのコピー（無い場合は None）。_lock の中で呼ぶ """
+        _entity = self._entities.get(entity_id)
+
+        if _entity is None:
+            return None
+
+        return copy.deepcopy({
+            _field: _entity[_field]
+            for _field in ['type', 'id', *(fields or ())]
+            if _field in _entity
+        })
+
+
+    def _discard(self, entity_id: tuple):
+        """ エンティティとキーを破棄。_lock の中で呼ぶ """
+        self._entities.pop(entity_id, None)
+        self._expires.pop(entity_id, None)
+
+        for _key in self._entity_keys.pop(entity_id, ()):
+            self._keys.pop(_key, None)
+
+
+    def _purge(self, entity_id: tuple, now: float):
+        """ 期限切れのフィールド（type, id 以外）、キーを破棄。_lock の中で呼ぶ """
+        _entity = self._entities.get(entity_id)
+
+        if _entity is None:
+            return
+
+        _expires = self._expires.setdefault(entity_id, {})
+
+        for _field, _expiry in list(_expires.items()):
+            if _expiry <= now and _field not in ('type', 'id'):
+                _entity.pop(_field, None)
+                del _expires[_field]
+
+        _keys = self._entity_keys.get(entity_id, set())
+
+        for _key in list(_keys):
+            if self._keys.get(_key, (None, 0))[1] <= now:
+                self._keys.pop(_key, None)
+                _keys.discard(_key)
+
+
+    def get(self, entity_type: str, entity_id: int, fields: list[str] = None) -> dict:
+        """ type, id, fields だけのコピーを取得（無い場合は None） """
+        with self._lock:
+            return self._copy((entity_type, entity_id), fields)
+
+
+    def get_stats(self) -> dict:
+        """ ヒット数（全てのフィールドあり）、部分ヒット数（フィールドが不足）、ミス数、エンティティ数を取得 """
+        with self._lock:
+            _stats = dict(self._stats)
+            _stats['entities'] = len(self._entities)
+            _stats['keys'] = len(self._keys)
+            _stats['maxsize'] = self._maxsize
+
+        return _stats
+
+
+    @staticmethod
+    def make_key(entity_type: str, filters) -> tuple:
+        """ find_one のフィルターからキーを作成（'is' 以外を含む場合は None） """
+        if not filters:
+            return None
+
+        for _filter in filters:
+            if not isinstance(_filter, (list, tuple)) or len(_filter) != 3 or _filter[1] != 'is':
+                return None
+
+        return (entity_type, tuple(sorted((_normalize(_filter) for _filter in filters), key=repr)))
+
+
+    def remove(self, entity_type: str, entity_id: int):
+        """ エンティティを破棄 """
+        _id = (entity_type, entity_id)
+
+        with self._lock:
+            self._discard(_id)
+
+
+    def resolve(self, key: tuple, fields: list[str] = None) -> tuple:
+        """ キーからエンティティを取得
+
+        Returns:
+            tuple: (エンティティ or None, id or None, 足りない（期限切れを含む）フィールドのリスト)
         """
-        return self._fpt
-    
+        _entity_type, _filters = key
+        _now = time.monotonic()
 
-    def login(
-        self, url: str=None, script_name: str=None, api_key: str=None, ) -> None:
+        with self._lock:
+            if len(_filters) == 1 and _filters[0][0] == 'id':
+                _id = (_entity_type, _filters[0][2])
+                _id = _id if _id in self._entities else None
+            else:
+                _id, _expiry = self._keys.get(key, (None, None))
+
+                if _id is not None and _expiry <= _now:
+                    self._keys.pop(key, None)
+                    self._entity_keys.get(_id, set()).discard(key)
+                    _id = None
+
+            if _id is None:
+                self._stats['misses'] += 1
+                return None, None, list(fields or ())
+
+            self._purge(_id, _now)
+            self._entities.move_to_end(_id)
+            _expires = self._expires.get(_id, {})
+            _missing = [_field for _field in fields or () if _expires.get(_field, 0) <= _now]
+
+            if _missing:
+                self._stats['partial'] += 1
+                return None, _id[1], _missing
+
+            self._stats['hits'] += 1
+
+            return self._copy(_id, fields), _id[1], []
+
+
+    def update(self, entity_type: str, entity_id: int, data: dict):
+        """ 保持しているエンティティに更新したフィールドをマージ（そのフィールドで作ったキーは破棄） """
+        _id = (entity_type, entity_id)
+
+        with self._lock:
+            _entity = self._entities.get(_id)
+
+            if _entity is None:
+                return
+
+            _entity.update(copy.deepcopy(data))
+            self._expires.setdefault(_id, {}).update(dict.fromkeys(data, time.monotonic() + self._ttl))
+
+            for _key in list(self._entity_keys.get(_id, ())):
+                if any(_filter[0] in data for _filter in _key[1]):
+                    self._keys.pop(_key, None)
+                    self._entity_keys[_id].discard(_key)
+
+
+class QueryCache:
+    """ Fpt の find / find_one の結果用 LRU キャッシュ
+
+    * キーは正規化した (メソッド名, エンティティタイプ, フィルター, フィールド, その他の引数)
+        * フィルターは順番を無視、エンティティの dict は (type, id) に変換、フィールドはソート
+    * ttl 秒を過ぎた結果は破棄。maxsize を超えると最も古く参照された結果から破棄
+    * 結果はコピーして保持、コピーして返す（呼び出し側で変更してもキャッシュは変わらない）
+    * 結果はクエリで参照しているエンティティタイプと紐付け、invalidate(entity_type) でまとめて破棄
+        * フィルター、フィールドのパスのタイプ（'tasks.Task.task_assignees' の Task など）
+        * 結果のエンティティ、マルチエンティティのフィールドのタイプ（Shot の 'tasks' の Task など）
+        * 空のマルチエンティティのフィールドを含む結果はどのタイプの invalidate でも破棄
+
+    Attributes:
+        _entries (OrderedDict): {キー: (期限, エンティティタイプのset, 結果)}
+        _ttl (float): 有効期間 (秒)。0 の場合はキャッシュしない
+        _maxsize (int): 最大キャッシュ数
+        _version (int): invalidate の回数（取得中に invalidate された結果は保存しない）
+    """
+    def __init__(self, ttl: float = QUERY_CACHE_TTL, maxsize: int = QUERY_CACHE_MAXSIZE) -> None:
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._version = 0
+
+        self._stats = {'hits': 0, 'misses': 0, 'bypasses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0}
+
+
+    def bypass(self):
+        """ キャッシュを使わなかった呼び出しを記録 """
+        with self._lock:
+            self._stats['bypasses'] += 1
+
+
+    def clear(self):
+        """ キャッシュと統計をクリア """
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+            for _key in self._stats:
+                self._stats[_key] = 0
+
+
+    def get(self, key: tuple) -> tuple:
+        """ キャッシュを取得
+
+        Returns:
+            tuple: (ヒットした場合 True, 結果のコピー, 保存時に set に渡すバージョン)
         """
-        
-        ShotGrid ログイン
+        with self._lock:
+            _entry = self._entries.get(key)
+
+            if _entry is not None and _entry[0] < time.monotonic():
+                del self._entries[key]
+                self._stats['expired'] += 1
+                _entry = None
+
+            if _entry is None:
+                self._stats['misses'] += 1
+                return False, None, self._version
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            _value = _entry[2]
+
+        return True, copy.deepcopy(_value), None
+
+
+    def get_stats(self) -> dict:
+        """ ヒット数、ミス数、ヒット率、キャッシュ数などを取得 """
+        with self._lock:
+            _stats = dict(self._stats)
+            _stats['size'] = len(self._entries)
+
+        _total = _stats['hits'] + _stats['misses']
+        _stats['hit_rate'] = _stats['hits'] / _total if _total else 0.0
+        _stats['maxsize'] = self._maxsize
+        _stats['ttl'] = self._ttl
+
+        return _stats
+
+
+    def invalidate(self, entity_type: str = None):
+        """ <entity_type> を参照している結果を破棄（None の場合は全て） """
+        with self._lock:
+            self._version += 1
+            self._stats['invalidations'] += 1
+
+            if entity_type is None:
+                self._entries.clear()
+                return
+
+            for _key in [
+                    _key for _key, _entry in self._entries.items()
+                    if entity_type in _entry[1] or ANY_ENTITY_TYPE in _entry[1]]:
+                del self._entries[_key]
+
+
+    def is_enabled(self) -> bool:
+        return self._ttl > 0 and self._maxsize > 0
+
+
+    @staticmethod
+    def make_key(method_name: str, entity_type: str, filters, fields, kwargs: dict) -> tuple:
+        """ キャッシュのキーを作成 """
+        return (
+            method_name,
+            entity_type,
+            tuple(sorted((_normalize(_filter) for _filter in filters or ()), key=repr)),
+            tuple(sorted(fields or ())),
+            _normalize(kwargs),
+        )
+
+
+    def set(self, key: tuple, value, entity_types: set, version: int):
+        """ 結果を保存（get 以降に invalidate されていた場合は保存しない） """
+        _value = copy.deepcopy(value)
+
+        with self._lock:
+            if version != self._version:
+                return
+
+            self._entries[key] = (time.monotonic() + self._ttl, frozenset(entity_types), _value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+
+class BatchLoader:
+    """ Fpt の個別の取得をまとめて1回の find にする DataLoader
+
+    * window 秒の間に load した取得を、エンティティタイプごとに [field, 'in', [...]] の find 1回にまとめ、
+      結果をそれぞれの Future に返す
+        * window=None の場合は dispatch を呼ぶまで待つ（AsyncFpt はイベントループの1周ごとに dispatch）
+        * max_batch_size 件たまったらすぐに実行
+    * 同じ取得（フィルターとフィールドが同じ）が待機中、実行中の場合は同じ Future を返す（1回だけ取得）
+    * IdentityMap にある場合は取得せずに完了済みの Future を返す。取得した結果は IdentityMap に追加
+    * find は Fpt のスレッドプール（gather と同じ）で実行。
+      スレッドプール内で Future.result() を待つと他の呼び出しが詰まるため、待つのはスレッドプールの外で行う
+
+    Examples:
+        >>> _loader = fpt.get_loader()
+        >>> _futures = [_loader.load_entity_by_id('Shot', _id, ['code']) for _id in _shot_ids]
+        >>> _shots = [_future.result() for _future in _futures]   # find は1回
+        >>>
+        >>> _futures = [_loader.load_task('Comp', _shot, ['sg_status_list']) for _shot in _shots]
+    """
+    def __init__(
+                self,
+                fpt,
+                window: float = LOADER_WINDOW,
+                max_batch_size: int = LOADER_MAX_BATCH_SIZE,
+                executor: concurrent.futures.Executor = None) -> None:
+
+        self._fpt = fpt
+        self._window = window
+        self._max_batch_size = max(1, max_batch_size)
+        self._executor = executor
+
+        self._lock = threading.Lock()
+        self._queue = []
+        self._flights = {}
+        self._timer: threading.Timer = None
+
+        self._stats = {'requests': 0, 'hits': 0, 'deduplicated': 0, 'queries': 0}
+
+
+    def _discard(self, flight_key: tuple, future: concurrent.futures.Future):
+        """ 完了した Future を実行中の取得から外す """
+        with self._lock:
+            if self._flights.get(flight_key) is future:
+                del self._flights[flight_key]
+
+
+    def _load_group(self, entity_type: str, scope: list, key_fields: tuple, requests: list):
+        """ 同じエンティティタイプ、共通のフィルター、キーのフィールドの取得を1回の find で実行
 
         Args:
-            url (str): ShotGrid ホーム URL
-            script_name (str): Script名
-            api_key (str): Script名に紐づくSgトークン
-            
+            requests (list[tuple]): [(IdentityMap のキー, キーの値, フィールド, Future), ...]
         """
-        # CA_CERTS_PATH = self.spp.get_setting('SG_SHOTGUN_API_CACERTS')
+        _requests = [_request for _request in requests if _request[3].set_running_or_notify_cancel()]
 
-        # if not CA_CERTS_PATH.exists():
-        #     message = f'File is not found\nfile = {CA_CERTS_PATH.as_posix()}'
-        #     raise FileNotFoundError(message)
+        if not _requests:
+            return
 
-        self._url = url
+        _fields = list(dict.fromkeys(
+            [_field for _request in _requests for _field in _request[2]] +
+            [_field for _field in key_fields if _field != 'id']))
+
+        _filters = list(scope)
+
+        for _index, _field in enumerate(key_fields):
+            _values = {_normalize(_request[1][_index]): _request[1][_index] for _request in _requests}
+            _filters.append([_field, 'in', list(_values.values())])
+
+        try:
+            _entities = self._fpt.exists().find(entity_type, _filters, _fields)
+
+        except BaseException as ex:
+            for _request in _requests:
+                _request[3].set_exception(ex)
+
+            return
+
+        with self._lock:
+            self._stats['queries'] += 1
+
+        _identity = self._fpt.get_identity_map()
+
+        # ShotGrid と同じく文字列は大文字、小文字を区別せずに照合（完全に一致するエンティティを優先）
+        def _fold(values: tuple) -> tuple:
+            return tuple(_value.lower() if isinstance(_value, str) else _value for _value in values)
+
+        _index = {}
+
+        for _entity in _entities:
+            _values = tuple(_normalize(_entity.get(_field)) for _field in key_fields)
+            _index.setdefault(_fold(_values), []).append((_values, _entity))
+
+        for _key, _values, _request_fields, _future in _requests:
+            _values = tuple(_normalize(_value) for _value in _values)
+            _matches = _index.get(_fold(_values), [])
+            _entity = next((_match for _match_values, _match in _matches if _match_values == _values), None)
+
+            if _entity is None and _matches:
+                _entity = _matches[0][1]
+
+            if _entity is not None:
+                _entity = _identity.add(_entity, _key, _request_fields)
+
+            _future.set_result(_entity)
+
+
+    def _start(self, batch: list):
+        """ 取得をグループごとにスレッドプールで実行 """
+        _groups = {}
+
+        for _group_key, _scope, _request in batch:
+            _groups.setdefault(_group_key, (_scope, []))[1].append(_request)
+
+        _executor = self._executor or self._fpt._get_executor()
+
+        for (_entity_type, _, _key_fields), (_scope, _requests) in _groups.items():
+            try:
+                _executor.submit(self._load_group, _entity_type, _scope, _key_fields, _requests)
+
+            except RuntimeError as ex:
+                # スレッドプールが終了済み
+                for _request in _requests:
+                    if _request[3].set_running_or_notify_cancel():
+                        _request[3].set_exception(ex)
+
+
+    def close(self):
+        """ 待機中の取得をキャンセル """
+        with self._lock:
+            _batch, self._queue = self._queue, []
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        for _group_key, _scope, _request in _batch:
+            _request[3].cancel()
+
+
+    def dispatch(self):
+        """ 待機中の取得をすぐに実行 """
+        with self._lock:
+            _batch, self._queue = self._queue, []
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if _batch:
+            self._start(_batch)
+
+
+    def get_stats(self) -> dict:
+        """ 取得数、IdentityMap のヒット数、重複してまとめた数、find の回数、待機中の数を取得 """
+        with self._lock:
+            _stats = dict(self._stats)
+            _stats['pending'] = len(self._queue)
+
+        return _stats
+
+
+    def load(
+                self,
+                entity_type: str,
+                keys: dict,
+                filters: list = None,
+                fields: list[str] = None,
+                cache: bool = True) -> concurrent.futures.Future:
+        """ 1件の取得を予約
+
+        Args:
+            entity_type (str): エンティティタイプ名
+            keys (dict): 取得ごとに異なるフィールドの値 {'id': 12} {'entity': _shot, 'content': 'Comp'} など。
+                まとめる時は [field, 'in', [...]] になる
+            filters (list, optional): 全ての取得で共通のフィルター ('is' のみ)
+            fields (list[str], optional): フィールド
+            cache (bool): False の場合は IdentityMap を使わずに取得
+
+        Returns:
+            concurrent.futures.Future: エンティティ or None (見つからない場合)
+        """
+        self._fpt.login()
+
+        _fields = tuple(fields or ())
+        _scope = list(filters or [])
+        _key_fields = tuple(keys)
+        _key = IdentityMap.make_key(entity_type, _scope + [[_field, 'is', _value] for _field, _value in keys.items()])
+
+        if _key is None or not keys:
+            raise ValueError(f'BatchLoader supports only "is" filters.\nfilters={filters}\nkeys={keys}')
+
+        if cache:
+            _entity, _, _ = self._fpt.get_identity_map().resolve(_key, list(_fields))
+
+            if _entity is not None:
+                with self._lock:
+                    self._stats['requests'] += 1
+                    self._stats['hits'] += 1
+
+                _future = concurrent.futures.Future()
+                _future.set_result(_entity)
+
+                return _future
+
+        _group_key = (entity_type, tuple(sorted((_normalize(_filter) for _filter in _scope), key=repr)), _key_fields)
+        _flight_key = (_key, tuple(sorted(_fields)))
+        _batch = None
+
+        with self._lock:
+            self._stats['requests'] += 1
+            _future = self._flights.get(_flight_key)
+
+            if _future is not None:
+                self._stats['deduplicated'] += 1
+
+                return _future
+
+            _future = concurrent.futures.Future()
+            self._flights[_flight_key] = _future
+            self._queue.append((_group_key, _scope, (_key, tuple(keys.values()), _fields, _future)))
+
+            if len(self._queue) >= self._max_batch_size:
+                _batch, self._queue = self._queue, []
+
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            elif self._window is not None and self._timer is None:
+                self._timer = threading.Timer(self._window, self.dispatch)
+                self._timer.daemon = True
+                self._timer.start()
+
+        _future.add_done_callback(functools.partial(self._discard, _flight_key))
+
+        if _batch:
+            self._start(_batch)
+
+        return _future
+
+
+    def load_entity_by_id(
+                self,
+                entity_type: str,
+                entity_id: int,
+                fields: list[str] = None,
+                cache: bool = True) -> concurrent.futures.Future:
+        """ Fpt.get_entity_by_id をまとめて取得 ([['id', 'in', [...]]]) """
+        return self.load(entity_type, {'id': entity_id}, fields=fields, cache=cache)
+
+
+    def load_task(
+                self,
+                task_name: str,
+                sg_entity: dict,
+                fields: list[str] = None,
+                cache: bool = True) -> concurrent.futures.Future:
+        """ Fpt.get_task をまとめて取得 ([['entity', 'in', [...]], ['content', 'in', [...]]]) """
+        _filters = self._fpt.add_filter(None, 'project', 'is', self._fpt._project)
+
+        return self.load('Task', {'entity': sg_entity, 'content': task_name}, _filters, fields, cache)
+
+
+class SchemaCache:
+    """ ShotGrid のスキーマ（エンティティタイプ、フィールド、データタイプ、valid_values）のディスクキャッシュ
+
+    * schema_read, schema_entity_read の結果を必要な項目だけにして JSON で保存し、次回の起動時はファイルから読み込む
+      (<SCHEMA_CACHE_DIR>/schema_<サイト>_<プロジェクトID>.json)
+    * max_age 秒より古い場合は古いスキーマを返しつつ、Fpt のスレッドプールで取得し直す
+    * ファイルが無い場合は最初の参照時に取得（その呼び出しだけ待つ）
+    * validate でフィルター、フィールドをクエリ前にローカルで確認
+        * スキーマに無いものがあった場合は、取得から SCHEMA_REFRESH_MIN_INTERVAL 秒以上経っていれば取得し直してから再確認
+    * refresh_field で1つのフィールドだけを取得し直す（Fpt.get_field_data 用）
+
+    Examples:
+        >>> _schema = fpt.get_schema()
+        >>> _schema.get_valid_values('Asset', 'sg_asset_type')
+        ['Character', 'Prop', 'Environment']
+        >>> _schema.validate('Shot', [['sg_status_list', 'is', 'ip']], ['code', 'sg_sequence.Sequence.code'])
+    """
+    def __init__(self, fpt, project: dict = None, filepath: str = None, max_age: float = SCHEMA_CACHE_MAX_AGE) -> None:
+        self._fpt = fpt
+        self._project = project
+        self._max_age = max_age
+        self._filepath = filepath or self.get_default_filepath(fpt.get_url(), project)
+
+        self._lock = threading.Lock()
+        self._data: dict = None
+        self._field_updated = {}
+        self._refreshing: concurrent.futures.Future = None
+
+        self._stats = {'loads': 0, 'refreshes': 0, 'background_refreshes': 0, 'errors': 0}
+
+        self.load()
+
+
+    def _get_data(self) -> dict:
+        """ スキーマを取得（無い場合は取得して待つ、古い場合はバックグラウンドで取得し直す） """
+        _data = self._data
+
+        if _data is None:
+            return self.refresh()
+
+        if self.is_stale():
+            self.refresh(wait=False)
+
+        return _data
+
+
+    def _check(self, entity_type: str, filters, fields) -> list[str]:
+        """ validate 用。問題のリストを返す """
+        _errors = []
+
+        for _field in fields or ():
+            _error = self._check_path(entity_type, _field)
+
+            if _error:
+                _errors.append(_error)
+
+        for _filter in _iter_filters(filters):
+            _error = self._check_path(entity_type, _filter[0])
+
+            if _error:
+                _errors.append(_error)
+                continue
+
+            _entity_type, _field_name = self._resolve_path(entity_type, _filter[0])
+            _valid_values = self.get_field(_entity_type, _field_name).get('valid_values')
+
+            if not _valid_values or len(_filter) < 3 or _filter[1] not in ('is', 'is_not', 'in', 'not_in'):
+                continue
+
+            _values = _filter[2] if isinstance(_filter[2], (list, tuple)) else [_filter[2]]
+
+            for _value in _values:
+                if _value is not None and _value not in _valid_values:
+                    _errors.append(f'Invalid value. {_filter[0]}={_value!r} (valid_values={_valid_values})')
+
+        return _errors
+
+
+    def _check_path(self, entity_type: str, path: str) -> str:
+        """ フィールドのパス (sg_sequence.Sequence.code など) を確認。問題がある場合はメッセージ """
+        _fields = self.get_fields(entity_type)
+
+        if _fields is None:
+            return f'Unknown entity type. entity_type={entity_type}'
+
+        _parts = path.split('.')
+        _field_name = _parts[0]
+
+        if _field_name not in _fields and _field_name != 'type':
+            return f'Unknown field. {entity_type}.{_field_name}'
+
+        if len(_parts) == 1:
+            return None
+
+        if len(_parts) < 3:
+            return f'Invalid field path. {entity_type}.{path}'
+
+        _valid_types = _fields[_field_name].get('valid_types')
+
+        if _valid_types and _parts[1] not in _valid_types:
+            return f'Invalid entity type. {entity_type}.{_field_name} -> {_parts[1]} (valid_types={_valid_types})'
+
+        return self._check_path(_parts[1], '.'.join(_parts[2:]))
+
+
+    def _fetch(self) -> dict:
+        """ サーバーからスキーマを取得して保存 """
+        _client = self._fpt.exists()
+
+        _entities = _client.schema_entity_read(project_entity=self._project)
+        _fields = _client.schema_read(project_entity=self._project)
+
+        _data = {
+            'url': self._fpt.get_url(),
+            'project_id': (self._project or {}).get('id'),
+            'updated': time.time(),
+            'entities': {
+                _entity_type: (_props.get('name') or {}).get('value', _entity_type)
+                for _entity_type, _props in _entities.items()
+            },
+            'fields': {
+                _entity_type: {_field_name: _compact_field(_props) for _field_name, _props in _entity_fields.items()}
+                for _entity_type, _entity_fields in _fields.items()
+            },
+        }
+
+        try:
+            os.makedirs(os.path.dirname(self._filepath), exist_ok=True)
+            mdk.file.save_json(self._filepath, _data, indent=None)
+
+        except OSError as ex:
+            self._fpt.logger.warning(f'MDK | Failed to save schema cache. {ex}\nfilepath={self._filepath}')
+
+        with self._lock:
+            self._data = _data
+            self._field_updated.clear()
+            self._stats['refreshes'] += 1
+
+        return _data
+
+
+    def _resolve_path(self, entity_type: str, path: str) -> tuple:
+        """ フィールドのパスの最後の (エンティティタイプ, フィールド名) """
+        _parts = path.split('.')
+
+        while len(_parts) >= 3:
+            entity_type = _parts[1]
+            _parts = _parts[2:]
+
+        return entity_type, _parts[0]
+
+
+    def clear(self):
+        """ メモリとディスクのキャッシュを破棄（次の参照時に取得） """
+        with self._lock:
+            self._data = None
+            self._field_updated.clear()
+
+        try:
+            os.unlink(self._filepath)
+        except FileNotFoundError:
+            pass
+
+
+    def get_age(self) -> float:
+        """ 取得してからの秒数（無い場合は inf） """
+        _data = self._data
+
+        return time.time() - _data['updated'] if _data else float('inf')
+
+
+    def get_data_type(self, entity_type: str, field_name: str) -> str:
+        """ フィールドのデータタイプ ('text', 'entity', 'list', 'status_list' など) """
+        return self.get_field(entity_type, field_name).get('data_type')
+
+
+    @staticmethod
+    def get_default_filepath(url: str, project: dict = None) -> str:
+        """ キャッシュファイルのパス """
+        return _get_cache_filepath('schema', url, project, '.json')
+
+
+    def get_entity_types(self) -> dict:
+        """ {エンティティタイプ: 表示名} """
+        return dict(self._get_data()['entities'])
+
+
+    def get_field(self, entity_type: str, field_name: str) -> dict:
+        """ フィールドの情報 {'name', 'data_type', 'editable', 'valid_values', 'valid_types'}
+
+        Raises:
+            KeyError: スキーマに無いエンティティタイプ、フィールド
+        """
+        _fields = self.get_fields(entity_type)
+
+        if _fields is None or field_name not in _fields:
+            raise KeyError(f'{entity_type}.{field_name}')
+
+        return _fields[field_name]
+
+
+    def get_field_age(self, entity_type: str, field_name: str) -> float:
+        """ フィールドを取得してからの秒数（refresh_field で取得し直した場合はその時から） """
+        _updated = self._field_updated.get((entity_type, field_name))
+
+        return min(self.get_age(), time.time() - _updated) if _updated else self.get_age()
+
+
+    def get_fields(self, entity_type: str) -> dict:
+        """ {フィールド名: フィールドの情報}（エンティティタイプが無い場合は None） """
+        return self._get_data()['fields'].get(entity_type)
+
+
+    def get_filepath(self) -> str:
+        return self._filepath
+
+
+    def get_stats(self) -> dict:
+        """ 読み込み数、取得数、バックグラウンドでの取得数、エラー数、経過時間を取得 """
+        with self._lock:
+            _stats = dict(self._stats)
+
+        _stats['age'] = self.get_age()
+
+        return _stats
+
+
+    def get_valid_types(self, entity_type: str, field_name: str) -> list[str]:
+        """ エンティティフィールドにリンク出来るエンティティタイプ """
+        return self.get_field(entity_type, field_name).get('valid_types')
+
+
+    def get_valid_values(self, entity_type: str, field_name: str) -> list:
+        """ list, status_list フィールドの valid_values """
+        return self.get_field(entity_type, field_name).get('valid_values')
+
+
+    def is_stale(self) -> bool:
+        return self.get_age() > self._max_age
+
+
+    def load(self) -> bool:
+        """ ディスクのキャッシュを読み込む（無い、壊れている、接続先が違う場合は False） """
+        try:
+            _data = mdk.file.load_json(self._filepath)
+
+        except (OSError, ValueError):
+            return False
+
+        if not isinstance(_data, dict) or _data.get('url') != self._fpt.get_url() or 'fields' not in _data:
+            return False
+
+        with self._lock:
+            self._data = _data
+            self._stats['loads'] += 1
+
+        return True
+
+
+    def refresh_field(self, entity_type: str, field_name: str) -> dict:
+        """ 1つのフィールドだけをサーバー (schema_field_read) から取得し直してメモリのスキーマにマージ
+
+        * ディスクには保存しない（次の refresh で保存）
+
+        Returns:
+            dict: フィールドの情報 (get_field と同じ)
+        """
+        _props = self._fpt.exists().schema_field_read(
+                    entity_type, field_name=field_name, project_entity=self._project)
+
+        if field_name not in _props:
+            raise KeyError(f'{entity_type}.{field_name}')
+
+        _field = _compact_field(_props[field_name])
+
+        with self._lock:
+            if self._data is not None:
+                self._data['fields'].setdefault(entity_type, {})[field_name] = _field
+
+            self._field_updated[(entity_type, field_name)] = time.time()
+
+        return _field
+
+
+    def refresh(self, wait: bool = True):
+        """ サーバーからスキーマを取得し直す
+
+        Args:
+            wait (bool): False の場合は Fpt のスレッドプールで取得して Future を返す（取得中の場合は同じ Future）
+
+        Returns:
+            dict or concurrent.futures.Future: スキーマ
+        """
+        with self._lock:
+            _future = self._refreshing
+
+            if _future is None:
+                _future = self._refreshing = concurrent.futures.Future()
+                _owner = True
+            else:
+                _owner = False
+
+        if _owner:
+            def _run():
+                try:
+                    _future.set_result(self._fetch())
+
+                except BaseException as ex:
+                    with self._lock:
+                        self._stats['errors'] += 1
+
+                    self._fpt.logger.warning(f'MDK | Failed to read schema. {type(ex).__name__}: {ex}')
+                    _future.set_exception(ex)
+
+                finally:
+                    with self._lock:
+                        self._refreshing = None
+
+            if wait:
+                _run()
+            else:
+                with self._lock:
+                    self._stats['background_refreshes'] += 1
+
+                self._fpt._get_executor().submit(_run)
+
+        return _future.result() if wait else _future
+
+
+    def validate(self, entity_type: str, filters=None, fields: list[str] = None):
+        """ フィルター、フィールドをローカルのスキーマで確認
+
+        * フィールド、リンク先のフィールド (sg_sequence.Sequence.code)、list / status_list の値を確認
+        * filter_operator ('any' / 'all') の入れ子にも対応
+
+        Raises:
+            ValueError: スキーマに無いエンティティタイプ、フィールド、valid_values に無い値
+        """
+        _errors = self._check(entity_type, filters, fields)
+
+        if _errors and self.get_age() > SCHEMA_REFRESH_MIN_INTERVAL:
+            # キャッシュ後に追加されたフィールドの可能性
+            self.refresh()
+            _errors = self._check(entity_type, filters, fields)
+
+        if _errors:
+            raise ValueError('Invalid query.\n' + '\n'.join(_errors))
+
+
+class LocalReplica:
+    """ プロジェクトの Shot / Asset / Task / Version を SQLite に複製して、ローカルで読み込む
+
+    * 最初の sync でプロジェクトの全件を取得 (id 順のページ単位)。以降は差分だけを取得
+        * 全件の取得はステージングのテーブルに保存し、最後に1回のトランザクションで入れ替え
+          （取得中の読み込みは前の内容、途中で失敗した場合は前の内容のまま次回に取得し直す）
+        * 更新 : updated_at が前回の基準 (REPLICA_SYNC_OVERLAP 秒前から) より新しいもの
+            * 基準は全件の取得開始時のサーバーの時刻（最新の EventLogEntry の created_at）、
+              以降は取得した updated_at の最大値（クライアントの時計は使わない）
+            * EventLogEntry を読めない場合は、全件の updated_at の最大値を基準にして警告
+        * 削除、復元 : 前回以降の EventLogEntry (Shotgun_<type>_Retirement / Revival)
+    * get_all_* / get_* は Fpt と同じ引数でローカルから取得（インデックス: code, リンク先 + code）
+        * フィルターは複製したフィールドの 'is' / 'is_not' / 'in' / 'not_in' のみ
+        * 最後の sync から max_age 秒経っている場合は、ローカルの結果を返しつつ Fpt のスレッドプールで sync
+    * create_entity / update はサーバーに書き込み、結果をローカルにも反映
+    * 複製するフィールドを変更した場合、そのエンティティタイプは全件を取得し直す
+
+    Examples:
+        >>> _replica = fpt.get_replica()
+        >>> _replica.sync()
+        {'Shot': {'loaded': 1200, 'updated': 0}, ..., 'retired': 0}
+        >>> _shots = _replica.get_all_shots(fields=['code', 'sg_status_list'])
+        >>> _task = _replica.get_task('Comp', _shots[0], fields=['sg_status_list'])
+        >>> _replica.update('Task', _task['id'], {'sg_status_list': 'rev'})
+    """
+    def __init__(
+                self,
+                fpt,
+                project: dict,
+                entity_fields: dict = None,
+                filepath: str = None,
+                max_age: float = REPLICA_SYNC_INTERVAL) -> None:
+
+        self._fpt = fpt
+        self._project = project
+        self._max_age = max_age
+        self._entity_fields = self._get_entity_fields(entity_fields)
+        self._filepath = filepath or _get_cache_filepath('replica', fpt.get_url(), project, '.sqlite')
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._syncing: concurrent.futures.Future = None
+        self._synced: float = None
+
+        os.makedirs(os.path.dirname(self._filepath), exist_ok=True)
+        self._db = sqlite3.connect(self._filepath, check_same_thread=False)
+
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entities ('
+                'entity_type TEXT NOT NULL, id INTEGER NOT NULL, code TEXT, link_type TEXT, link_id INTEGER, '
+                'data TEXT NOT NULL, PRIMARY KEY (entity_type, id)) WITHOUT ROWID')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entities_staging ('
+                'entity_type TEXT NOT NULL, id INTEGER NOT NULL, code TEXT, link_type TEXT, link_id INTEGER, '
+                'data TEXT NOT NULL, PRIMARY KEY (entity_type, id)) WITHOUT ROWID')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entities_code ON entities (entity_type, code)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entities_link ON entities (entity_type, link_type, link_id, code)')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS sync_state ('
+                'entity_type TEXT PRIMARY KEY, fields TEXT, updated_at TEXT, synced REAL)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)')
+
+            _row = self._db.execute("SELECT value FROM meta WHERE key = 'synced'").fetchone()
+            self._synced = _row[0] if _row else None
+
+
+    def _ensure_synced(self):
+        """ 読み込み前に sync（1度も sync していない場合は待つ、古い場合はバックグラウンド） """
+        if self._synced is None:
+            self.sync()
+
+        elif time.time() - self._synced > self._max_age:
+            self.sync(wait=False)
+
+
+    @staticmethod
+    def _get_entity_fields(entity_fields: dict = None) -> dict:
+        """ 複製するフィールド {エンティティタイプ: ソートしたフィールドのリスト}（キーのフィールドを含む） """
+        return {
+            _entity_type: sorted(set(_fields) | {_field for _field in REPLICA_KEY_FIELDS.get(_entity_type, ()) if _field})
+            for _entity_type, _fields in (entity_fields or REPLICA_FIELDS).items()
+        }
+
+
+    def _get_fields(self, entity_type: str, fields) -> list[str]:
+        """ 取得するフィールドを確認（複製していないフィールドは ValueError） """
+        if entity_type not in self._entity_fields:
+            raise ValueError(f'Entity type is not replicated.\nentity_type={entity_type}')
+
+        _fields = list(fields or ())
+        _missing = [_field for _field in _fields if _field not in self._entity_fields[entity_type]]
+
+        if _missing:
+            raise ValueError(f'Fields are not replicated.\nentity_type={entity_type}\nfields={_missing}')
+
+        return _fields
+
+
+    def _get_last_event(self) -> tuple:
+        """ 最新の EventLogEntry の (id, created_at)。created_at をサーバーの現在の時刻として使用 """
+        _entity = self._fpt.exists().find_one(
+                'EventLogEntry', [], ['id', 'created_at'], order=[{'field_name': 'id', 'direction': 'desc'}])
+
+        return (_entity['id'], _entity.get('created_at')) if _entity else (0, None)
+
+
+    def _get_mytask_entity_ids(self, entity_type: str) -> set:
+        """ mytask 用。自分がアサインされたタスクのリンク先の id """
+        self._get_fields('Task', ['entity', 'task_assignees'])
+
+        _user = _normalize(self._fpt._user)
+
+        return {
+            _task['entity']['id']
+            for _task in self._select('Task', link=None)
+            if _task.get('entity') and _task['entity']['type'] == entity_type
+            and _user in _normalize(_task.get('task_assignees') or [])
+        }
+
+
+    def _load_all(self, entity_type: str) -> tuple:
+        """ エンティティタイプの全件を取得し直す
+
+        * 取得前に sync_state を破棄（途中で失敗した場合は次回も全件を取得）
+        * entities_staging に id 順のページ単位 (_get_page_request) で保存し、最後に entities と入れ替え
+        * EventLogEntry を読めない場合は、取得した updated_at の最大値を基準にする
+
+        Returns:
+            tuple: (件数, 取得開始時のサーバーの時刻)
+        """
+        _filters = [['project', 'is', self._project]]
+        _fields = self._entity_fields[entity_type]
+        _count = 0
+
+        _event_id, _updated_at = self._get_last_event()
+        _fallback = _updated_at is None
+
+        if _fallback:
+            _fields = _fields + ['updated_at']
+
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM sync_state WHERE entity_type = ?', (entity_type,))
+            self._db.execute('DELETE FROM entities_staging WHERE entity_type = ?', (entity_type,))
+
+        _request = _get_page_request(_filters, None, PAGE_SIZE)
+
+        while _request is not None:
+            _page, _page_filters, _kwargs = _request
+            _entities = self._fpt.exists().find(entity_type, _page_filters, _fields, **_kwargs)
+
+            _max_updated_at = self._upsert(entity_type, _entities, table='entities_staging')
+            _count += len(_entities)
+
+            if _fallback and _max_updated_at is not None and (_updated_at is None or _max_updated_at > _updated_at):
+                _updated_at = _max_updated_at
+
+            _request = _get_page_request(_filters, None, PAGE_SIZE, _entities, _page)
+
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM entities WHERE entity_type = ?', (entity_type,))
+            self._db.execute('INSERT INTO entities SELECT * FROM entities_staging WHERE entity_type = ?', (entity_type,))
+            self._db.execute('DELETE FROM entities_staging WHERE entity_type = ?', (entity_type,))
+
+        if _fallback:
+            self._fpt.logger.warning(
+                f'MDK | EventLogEntry is not readable. Using the latest updated_at for the replica. '
+                f'entity_type={entity_type} updated_at={_updated_at}')
+
+        return _count, _updated_at
+
+
+    def _row(self, entity_type: str, entity: dict) -> tuple:
+        """ entities テーブルの1行 """
+        _code_field, _link_field = REPLICA_KEY_FIELDS.get(entity_type, (None, None))
+        _link = entity.get(_link_field) if _link_field else None
+
+        return (
+            entity_type,
+            entity['id'],
+            entity.get(_code_field) if _code_field else None,
+            _link['type'] if isinstance(_link, dict) else None,
+            _link['id'] if isinstance(_link, dict) else None,
+            _dump_replica_data(entity),
+        )
+
+
+    def _select(self, entity_type: str, code=None, link=None, entity_id: int = None) -> list[dict]:
+        """ インデックスを使って取得 """
+        _sql = 'SELECT data FROM entities WHERE entity_type = ?'
+        _params = [entity_type]
+
+        if entity_id is not None:
+            _sql += ' AND id = ?'
+            _params.append(entity_id)
+
+        if link is not None:
+            _sql += ' AND link_type = ? AND link_id = ?'
+            _params.extend((link['type'], link['id']))
+
+        if code is not None:
+            _sql += ' AND code = ?'
+            _params.append(code)
+
+        with self._lock:
+            _rows = self._db.execute(_sql + ' ORDER BY id', _params).fetchall()
+
+        return [_load_replica_data(_row[0]) for _row in _rows]
+
+
+    def _upsert(self, entity_type: str, entities: list[dict], updated_at=None, table: str = 'entities'):
+        """ エンティティを保存して updated_at の最大値を返す
+
+        Args:
+            table (str): 保存するテーブル ('entities' or 'entities_staging')
+        """
+        _fields = self._entity_fields[entity_type]
+        _rows = []
+
+        for _entity in entities:
+            _value = _entity.get('updated_at')
+
+            if isinstance(_value, datetime.datetime) and (updated_at is None or _value > updated_at):
+                updated_at = _value
+
+            _rows.append(self._row(entity_type, {
+                'type': entity_type, 'id': _entity['id'],
+                **{_field: _entity.get(_field) for _field in _fields},
+            }))
+
+        if _rows:
+            with self._lock, self._db:
+                self._db.executemany(f'INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?, ?)', _rows)
+
+        return updated_at
+
+
+    def _query(self, entity_type: str, filters: list, fields, code=None, link=None, entity_ids: set = None) -> list[dict]:
+        """ インデックスで絞り込んでからフィルターを確認し、fields だけを返す """
+        self._ensure_synced()
+
+        _fields = self._get_fields(entity_type, fields)
+        _filters = []
+
+        for _filter in filters or ():
+            if not isinstance(_filter, (list, tuple)) or len(_filter) != 3:
+                raise ValueError(f'Unsupported filter for LocalReplica.\nfilter={_filter}')
+
+            _field, _operator, _value = _filter
+
+            if _field == 'project':
+                continue
+
+            if _operator not in ('is', 'is_not', 'in', 'not_in'):
+                raise ValueError(f'Unsupported filter for LocalReplica.\nfilter={_filter}')
+
+            if _field not in ('id', 'type'):
+                self._get_fields(entity_type, [_field])
+
+            _filters.append(_filter)
+
+        _results = []
+
+        for _entity in self._select(entity_type, code, link):
+            if entity_ids is not None and _entity['id'] not in entity_ids:
+                continue
+
+            if all(_match_replica_filter(_entity, _filter) for _filter in _filters):
+                _results.append({'type': entity_type, 'id': _entity['id'], **{_field: _entity.get(_field) for _field in _fields}})
+
+        return _results
+
+
+    def _sync(self, full: bool = False) -> dict:
+        """ sync の本体 """
+        _result = {}
+        _now = time.time()
+
+        with self._lock:
+            _states = {
+                _row[0]: _row[1:]
+                for _row in self._db.execute('SELECT entity_type, fields, updated_at FROM sync_state')
+            }
+            _row = self._db.execute("SELECT value FROM meta WHERE key = 'event_id'").fetchone()
+
+        _event_id = _row[0] if _row else None
+
+        if _event_id is None:
+            # 全件取得の前に EventLogEntry の位置を記録（取得中の削除も次回の sync で反映）
+            _event_id = self._get_last_event()[0]
+            full = True
+
+        for _entity_type, _fields in self._entity_fields.items():
+            _state = _states.get(_entity_type)
+            _fields_text = ','.join(_fields)
+
+            if full or _state is None or _state[0] != _fields_text or not _state[1]:
+                _count, _updated_at = self._load_all(_entity_type)
+                _result[_entity_type] = {'loaded': _count, 'updated': 0}
+
+            else:
+                _since = datetime.datetime.fromisoformat(_state[1]) - datetime.timedelta(seconds=REPLICA_SYNC_OVERLAP)
+                _entities = self._fpt.exists().find(
+                        _entity_type,
+                        [['project', 'is', self._project], ['updated_at', 'greater_than', _since]],
+                        _fields + ['updated_at'])
+
+                _updated_at = self._upsert(_entity_type, _entities, datetime.datetime.fromisoformat(_state[1]))
+                _result[_entity_type] = {'loaded': 0, 'updated': len(_entities)}
+
+            with self._lock, self._db:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)',
+                    (_entity_type, _fields_text, _updated_at.isoformat() if _updated_at else None, _now))
+
+        _result['retired'], _result['revived'], _event_id = self._sync_events(_event_id)
+
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('event_id', ?)", (_event_id,))
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('synced', ?)", (_now,))
+
+        self._synced = _now
+
+        return _result
+
+
+    def _sync_events(self, event_id: int) -> tuple:
+        """ EventLogEntry から削除、復元を反映
+
+        Returns:
+            tuple: (削除数, 復元数, 最後の EventLogEntry の id)
+        """
+        _event_types = {}
+
+        for _entity_type in self._entity_fields:
+            _event_types[f'Shotgun_{_entity_type}_Retirement'] = (_entity_type, False)
+            _event_types[f'Shotgun_{_entity_type}_Revival'] = (_entity_type, True)
+
+        _events = self._fpt.exists().find(
+                'EventLogEntry',
+                [
+                    ['id', 'greater_than', event_id],
+                    ['project', 'is', self._project],
+                    ['event_type', 'in', list(_event_types)],
+                ],
+                ['event_type', 'meta'],
+                order=[{'field_name': 'id', 'direction': 'asc'}])
+
+        # 同じエンティティは最後のイベントだけ
+        _latest = {}
+
+        for _event in _events:
+            event_id = max(event_id, _event['id'])
+            _entity_type, _revived = _event_types[_event['event_type']]
+            _entity_id = (_event.get('meta') or {}).get('entity_id')
+
+            if _entity_id is not None:
+                _latest[(_entity_type, _entity_id)] = _revived
+
+        _retired = [_key for _key, _revived in _latest.items() if not _revived]
+        _revived = {}
+
+        for (_entity_type, _entity_id), _value in _latest.items():
+            if _value:
+                _revived.setdefault(_entity_type, []).append(_entity_id)
+
+        if _retired:
+            with self._lock, self._db:
+                self._db.executemany('DELETE FROM entities WHERE entity_type = ? AND id = ?', _retired)
+
+        for _entity_type, _entity_ids in _revived.items():
+            _entities = self._fpt.exists().find(
+                    _entity_type, [['id', 'in', _entity_ids]], self._entity_fields[_entity_type])
+            self._upsert(_entity_type, _entities)
+
+        return len(_retired), sum(len(_ids) for _ids in _revived.values()), event_id
+
+
+    def close(self):
+        """ バックグラウンドの sync を待ってからデータベースを閉じる（開始前の sync は取り消し） """
+        with self._lock:
+            _syncing = self._syncing
+
+        if _syncing is not None and not _syncing.cancel():
+            concurrent.futures.wait([_syncing])
+
+        with self._sync_lock, self._lock:
+            self._db.close()
+
+
+    def create_entity(self, entity_type: str, fpt_dict: dict) -> dict:
+        """ Fpt.create_entity でサーバーに作成し、ローカルにも追加 """
+        _result = self._fpt.create_entity(entity_type, fpt_dict)
+
+        if entity_type in self._entity_fields:
+            self._upsert(entity_type, [dict(fpt_dict, **_result)])
+
+        return _result
+
+
+    def get_all_assets(self, filters=None, fields=None, mytask=False) -> list[dict]:
+        """ Fpt.get_all_assets のローカル版 """
+        _entity_ids = self._get_mytask_entity_ids('Asset') if mytask else None
+
+        return self._query('Asset', filters, fields, entity_ids=_entity_ids)
+
+
+    def get_all_shots(self, filters=None, fields=None, mytask=False) -> list[dict]:
+        """ Fpt.get_all_shots のローカル版 """
+        _entity_ids = self._get_mytask_entity_ids('Shot') if mytask else None
+
+        return self._query('Shot', filters, fields, entity_ids=_entity_ids)
+
+
+    def get_all_tasks(self, entity: dict = None, filters: list = None, fields: list[str] = None, mytask: bool = False) -> list[dict]:
+        """ Fpt.get_all_tasks のローカル版 """
+        filters = list(filters or [])
+
+        if mytask:
+            filters.append(['task_assignees', 'is', self._fpt._user])
+
+        if fields is None:
+            fields = ['content']
+
+        return self._query('Task', filters, fields, link=entity)
+
+
+    def get_all_versions(self, filters=None, fields=None) -> list[dict]:
+        """ Fpt.get_all_versions のローカル版 """
+        return self._query('Version', filters, fields)
+
+
+    def get_asset(self, code: str, filters=None, fields=None) -> dict:
+        """ Fpt.get_asset のローカル版 """
+        _results = self._query('Asset', filters, fields, code=code)
+
+        return _results[0] if _results else None
+
+
+    def get_entity_by_id(self, entity_type: str, entity_id: int, fields=None) -> dict:
+        """ Fpt.get_entity_by_id のローカル版 """
+        self._ensure_synced()
+
+        _fields = self._get_fields(entity_type, fields)
+        _results = self._select(entity_type, entity_id=entity_id)
+
+        if not _results:
+            return None
+
+        return {'type': entity_type, 'id': entity_id, **{_field: _results[0].get(_field) for _field in _fields}}
+
+
+    def get_filepath(self) -> str:
+        return self._filepath
+
+
+    def get_shot(self, name: str, filters=None, fields=None) -> dict:
+        """ Fpt.get_shot のローカル版 (sg_name) """
+        _results = self._query('Shot', filters, fields, code=name)
+
+        return _results[0] if _results else None
+
+
+    def get_stats(self) -> dict:
+        """ エンティティタイプごとの件数、最後の sync の時刻 """
+        with self._lock:
+            _counts = dict(self._db.execute('SELECT entity_type, COUNT(*) FROM entities GROUP BY entity_type'))
+
+        return {
+            'entities': {_entity_type: _counts.get(_entity_type, 0) for _entity_type in self._entity_fields},
+            'synced': self._synced,
+            'age': time.time() - self._synced if self._synced else float('inf'),
+        }
+
+
+    def get_task(self, task_name: str, sg_entity: dict, filters: list = None, fields: list = None, mytask: bool = False) -> dict:
+        """ Fpt.get_task のローカル版 """
+        filters = list(filters or [])
+
+        if mytask:
+            filters.append(['task_assignees', 'is', self._fpt._user])
+
+        _results = self._query('Task', filters, fields, code=task_name, link=sg_entity)
+
+        return _results[0] if _results else None
+
+
+    def sync(self, full: bool = False, wait: bool = True):
+        """ サーバーの変更をローカルに反映
+
+        Args:
+            full (bool): 全件を取得し直す
+            wait (bool): False の場合は Fpt のスレッドプールで実行して Future を返す（実行中の場合は同じ Future）
+
+        Returns:
+            dict or concurrent.futures.Future: エンティティタイプごとの {'loaded', 'updated'} と 'retired', 'revived'
+        """
+        self._fpt.login()
+
+        if wait:
+            with self._sync_lock:
+                return self._sync(full)
+
+        with self._lock:
+            if self._syncing is None:
+                def _run():
+                    try:
+                        with self._sync_lock:
+                            return self._sync(full)
+
+                    except Exception as ex:
+                        self._fpt.logger.warning(f'MDK | Failed to sync replica. {type(ex).__name__}: {ex}')
+                        raise
+
+                    finally:
+                        with self._lock:
+                            self._syncing = None
+
+                self._syncing = self._fpt._get_executor().submit(_run)
+
+            return self._syncing
+
+
+    def update(self, entity_type: str, entity_id: int, sg_dict: dict) -> dict:
+        """ Fpt.update でサーバーを更新し、ローカルにも反映 """
+        _result = self._fpt.update(entity_type, entity_id, sg_dict)
+
+        if entity_type in self._entity_fields:
+            _entities = self._select(entity_type, entity_id=entity_id)
+
+            if _entities:
+                self._upsert(entity_type, [dict(_entities[0], **sg_dict)])
+
+        return _result
+
+
+class Fpt:
+    """ FPT用クラス
+ 
+    ShotGrid Python APIラッパークラス
+ 
+    Attributes:
+        core (:obj:`core`): パイプラインコア
+        logger (:obj:`logging.logger`): パイプラインロガー
+ 
+    """
+    def __init__(
+                self,
+                logger,
+                cache_ttl: float = QUERY_CACHE_TTL,
+                cache_maxsize: int = QUERY_CACHE_MAXSIZE,
+                validate: bool = False) -> None:
+        """
+        Args:
+            logger (logging.Logger): ロガー
+            cache_ttl (float): find / find_one のキャッシュ、IdentityMap の有効期間 (秒)。0 の場合はキャッシュしない
+            cache_maxsize (int): find / find_one のキャッシュ、IdentityMap のエンティティの最大数
+            validate (bool): True の場合は getter のフィルター、フィールドを SchemaCache で確認してから取得
+        """
+        self.logger = logger
+        self._validate = validate
+
+        self._fpt: Session = None
+        self._login_args: tuple = None
+        self._cache = QueryCache(cache_ttl, cache_maxsize)
+        self._identity = IdentityMap(cache_ttl, cache_maxsize)
+        self._loader: BatchLoader = None
+        self._schemas = {}
+        self._replicas = {}
+        self._executor: concurrent.futures.ThreadPoolExecutor = None
+        self._prefetch_executor: concurrent.futures.ThreadPoolExecutor = None
+        self._executor_lock = threading.Lock()
+
+        self._project: dict = None
+        self._user: dict = None
+
+        self._url: str = None
+
+
+    def exists(self):
+        """  
+        fpt インスタンスオブジェクトの有無。ログイン判定に使用
+        """
+        return self._fpt
+    
+
+    def login(
+        self, url: str=None, script_name: str=None, api_key: str=None, factory=None, **kwargs) -> None:
+        """
+
+        ShotGrid ログイン
+
+        * クライアントはここでは作成せず、最初の呼び出し時にスレッドごとに作成（Session）
+        * 引数なし、または同じ接続情報で呼び出した場合は既存のセッションを再利用
+
+        Args:
+            url (str): ShotGrid ホーム URL
+            script_name (str): Script名
+            api_key (str): Script名に紐づくSgトークン
+            factory (callable, optional): クライアントの作成関数（テスト用の mockgun.Shotgun など）
+            **kwargs: shotgun_api3.Shotgun のその他の引数 (ca_certs, http_proxy など)
+
+        """
+        # CA_CERTS_PATH = self.spp.get_setting('SG_SHOTGUN_API_CACERTS')
+
+        # if not CA_CERTS_PATH.exists():
+        #     message = f'File is not found\nfile = {CA_CERTS_PATH.as_posix()}'
+        #     raise FileNotFoundError(message)
+
+        if url is None:
+            if self._fpt is None:
+                raise RuntimeError('Not logged in. Call login(url, script_name, api_key) first.')
+
+            return
+
+        _login_args = (url, script_name, api_key, factory, tuple(sorted(kwargs.items())))
+
+        if self._fpt is not None and self._login_args == _login_args:
+            return
+
+        if self._fpt is not None:
+            self._fpt.close()
+
+        self._url = url
+        self._login_args = _login_args
+
+        self._fpt = Session(
+            url,
+            script_name,
+            api_key,
+            factory=factory,
+            **kwargs,
+            # ca_certs=CA_CERTS_PATH.as_posix(),
+        )
+
+
+    def close(self):
+        """ gather のスレッドプールを終了し、全てのスレッドのクライアントの接続を閉じる """
+        with self._executor_lock:
+            _executor, self._executor = self._executor, None
+            _prefetch_executor, self._prefetch_executor = self._prefetch_executor, None
+            _loader, self._loader = self._loader, None
+            _replicas, self._replicas = list(self._replicas.values()), {}
+
+        if _loader is not None:
+            _loader.close()
+
+        for _replica in _replicas:
+            _replica.close()
+
+        for _pool in (_executor, _prefetch_executor):
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+
+        if self._fpt is not None:
+            self._fpt.close()
+
+
+    def _find(self, entity_type: str, filters, fields=None, cache: bool = True, **kwargs) -> list[dict]:
+        """ キャッシュ経由の find """
+        if self._validate:
+            self.get_schema().validate(entity_type, filters, fields)
+
+        return self._find_cached('find', entity_type, filters, fields, cache, kwargs)
+
+
+    def _find_one(self, entity_type: str, filters, fields=None, cache: bool = True, **kwargs) -> dict:
+        """ IdentityMap 経由の find_one
+
+        * フィルターが 'is' だけの場合は IdentityMap から取得し、足りないフィールドだけを id で取得
+        * cache=False の場合はサーバーから取得して IdentityMap を更新
+        * それ以外のフィルターは QueryCache 経由
+        """
+        if self._validate:
+            self.get_schema().validate(entity_type, filters, fields)
+
+        _key = IdentityMap.make_key(entity_type, filters) if not kwargs else None
+
+        if _key is None:
+            return self._find_cached('find_one', entity_type, filters, fields, cache, kwargs)
+
+        _fields = list(fields or ())
+
+        if cache:
+            _entity, _entity_id, _missing = self._identity.resolve(_key, _fields)
+
+            if _entity is not None:
+                return _entity
+
+            if _entity_id is not None:
+                _entity = self._fpt.find_one(entity_type, [['id', 'is', _entity_id]], _missing)
+
+                if _entity is not None:
+                    return self._identity.add(_entity, fields=_fields)
+
+                # サーバーで削除されている
+                self._identity.remove(entity_type, _entity_id)
+
+        _entity = self._fpt.find_one(entity_type, filters, _fields)
+
+        if _entity is not None:
+            self._identity.add(_entity, _key)
+
+        return _entity
+
+
+    def _find_cached(self, method_name: str, entity_type: str, filters, fields, cache: bool, kwargs: dict):
+        if not cache or not self._cache.is_enabled():
+            self._cache.bypass()
+
+            return getattr(self._fpt, method_name)(entity_type, filters, fields, **kwargs)
+
+        _key = self._cache.make_key(method_name, entity_type, filters, fields, kwargs)
+        _hit, _value, _version = self._cache.get(_key)
+
+        if _hit:
+            return _value
+
+        _value = getattr(self._fpt, method_name)(entity_type, filters, fields, **kwargs)
+        _entity_types = get_query_entity_types(entity_type, filters, fields) | _get_result_entity_types(_value, fields)
+        self._cache.set(_key, _value, _entity_types, _version)
+
+        return _value
+
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """ gather 用のスレッドプール（スレッドごとのクライアントを使い回すため Fpt ごとに1つ） """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=GATHER_MAX_WORKERS, thread_name_prefix='mdk_fpt')
+
+            return self._executor
+
+
+    def _get_prefetch_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """ iter_find の先読み用のスレッドプール
+
+        * gather の中の iter_find が同じスレッドプールで先読みを待つと、全てのスレッドが待ちになり終わらないため別にする
+        * 先読みは find を実行するだけで他を待たないため、使い切っても順番に実行される
+        """
+        with self._executor_lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix='mdk_fpt_prefetch')
+
+            return self._prefetch_executor
+
+
+    def gather(
+                self,
+                calls: list,
+                max_workers: int = GATHER_MAX_WORKERS,
+                timeout: float = None,
+                cancel_event: threading.Event = None,
+                fail_fast: bool = False) -> list[dict]:
+        """ 複数の get_* などを並列に実行
+
+        * Fpt ごとのスレッドプールで実行し、各スレッドのクライアント (Session) を使い回す
+        * 同時に実行するのは max_workers 件まで (GATHER_MAX_WORKERS が上限)
+        * timeout 秒経過、cancel_event がセット、fail_fast でエラーの場合は未実行の呼び出しをキャンセルして終了
+          (実行中の呼び出しは待たずに cancelled として返す)
+        * gather の中から gather を呼び出さないこと（スレッドプールを使い切ると終わらない）
+            * iter_find は別のスレッドプールで先読みするため gather の中で使用可
+
+        Args:
+            calls (list[tuple]): (メソッド名 or 関数, args, kwargs)。args, kwargs は省略可。形式が違う場合は TypeError
+            max_workers (int): 同時に実行する数
+            timeout (float, optional): 全体のタイムアウト (秒)
+            cancel_event (threading.Event, optional): セットされたらキャンセル
+            fail_fast (bool): エラーがあったら残りをキャンセル
+
+        Returns:
+            list[dict]: calls と同じ順番の結果
+                {'name', 'result', 'error', 'elapsed': 実行時間 (秒), 'cancelled': bool}
+
+        Examples:
+            >>> _episodes, _sequences, _shots, _assets, _tasks = fpt.gather([
+            >>>     ('get_all_episodes',),
+            >>>     ('get_all_scequences',),
+            >>>     ('get_all_shots', (), {'fields': ['code', 'sg_status_list']}),
+            >>>     ('get_all_assets',),
+            >>>     ('get_all_tasks', (), {'fields': ['content', 'entity']}),
+            >>> ])
+            >>> print(_shots['result'], _shots['elapsed'])
+        """
+        self.login()
+
+        _calls = _parse_calls(self, calls)
+
+        _results = [
+            {'name': _name, 'result': None, 'error': None, 'elapsed': None, 'cancelled': False}
+            for _name, _func, _args, _kwargs in _calls
+        ]
+
+        _executor = self._get_executor()
+        _max_workers = max(1, min(max_workers, GATHER_MAX_WORKERS))
+        _deadline = time.monotonic() + timeout if timeout is not None else None
+        _pending = {}
+        _next = 0
+        _stop = False
+
+        while not _stop and (_next < len(_calls) or _pending):
+            while _next < len(_calls) and len(_pending) < _max_workers:
+                _name, _func, _args, _kwargs = _calls[_next]
+                _pending[_executor.submit(_run_timed, _func, _args, _kwargs)] = _next
+                _next += 1
+
+            _wait = GATHER_POLL_INTERVAL if cancel_event is not None else None
+
+            if _deadline is not None:
+                _remain = max(0.0, _deadline - time.monotonic())
+                _wait = _remain if _wait is None else min(_wait, _remain)
+
+            _done, _ = concurrent.futures.wait(_pending, timeout=_wait, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for _future in _done:
+                _result = _results[_pending.pop(_future)]
+                _result['result'], _result['error'], _result['elapsed'] = _future.result()
+
+                if _result['error'] and fail_fast:
+                    _stop = True
+
+            if cancel_event is not None and cancel_event.is_set():
+                _stop = True
+
+            if _deadline is not None and time.monotonic() >= _deadline:
+                _stop = True
+
+        # キャンセル: 実行中は待たない、未実行は実行しない
+        for _future, _index in _pending.items():
+            _future.cancel()
+            _results[_index]['cancelled'] = True
+
+        for _index in range(_next, len(_calls)):
+            _results[_index]['cancelled'] = True
+
+        return _results
+
+
+    def get_cache(self) -> QueryCache:
+        """ find / find_one のキャッシュを取得（get_stats, invalidate, clear） """
+        return self._cache
+
+
+    def get_identity_map(self) -> IdentityMap:
+        """ find_one, resolve_codes で取得したエンティティの IdentityMap を取得（get_stats, clear） """
+        return self._identity
+
+
+    def get_loader(self) -> BatchLoader:
+        """ get_entity_by_id, get_task などの個別の取得をまとめる BatchLoader を取得 """
+        with self._executor_lock:
+            if self._loader is None:
+                self._loader = BatchLoader(self)
+
+            return self._loader
+
+
+    def get_replica(self, entity_fields: dict = None) -> LocalReplica:
+        """ 接続先、現在のプロジェクトの LocalReplica を取得（sync は最初の読み込み時）
+
+        同じ接続先、プロジェクトでは同じ LocalReplica（同じデータベース）を返す。
+        既にある LocalReplica と複製するフィールドが異なる場合は ValueError
+
+        Args:
+            entity_fields (dict, optional): {エンティティタイプ: 複製するフィールドのリスト}。None の場合は REPLICA_FIELDS
+        """
+        self.login()
+
+        if self._project is None:
+            raise RuntimeError('Project is not set. Call set_project(project) first.')
+
+        _key = (self._url, self._project['id'])
+
+        with self._executor_lock:
+            _replica = self._replicas.get(_key)
+
+            if _replica is None:
+                _replica = self._replicas[_key] = LocalReplica(self, self._project, entity_fields)
+
+            elif _replica._entity_fields != LocalReplica._get_entity_fields(entity_fields):
+                raise ValueError(
+                    f'Replica already exists with different fields.\n'
+                    f'entity_fields={_replica._entity_fields}')
+
+        return _replica
+
+
+    def get_schema(self) -> SchemaCache:
+        """ 接続先、現在のプロジェクトの SchemaCache を取得（初回はディスクから読み込み） """
+        self.login()
+
+        _key = (self._url, (self._project or {}).get('id'))
+
+        with self._executor_lock:
+            _schema = self._schemas.get(_key)
+
+        if _schema is None:
+            _schema = SchemaCache(self, self._project)
+
+            with self._executor_lock:
+                _schema = self._schemas.setdefault(_key, _schema)
+
+        return _schema
 
-        self._fpt = shotgun_api3.Shotgun(
-            url,
-            script_name,
-            api_key,
-            # ca_certs=CA_CERTS_PATH.as_posix(),
-        )
 
+    def get_client(self):
+        """ 現在のスレッドの shotgun_api3.Shotgun クライアントを取得 """
+        self.login()
+
+        return self._fpt.get_client()
+
+
+    def refresh(self):
+        """ クライアントを作り直す（認証エラー、接続エラーの後など） """
+        self.login()
+        self._fpt.refresh()
 
 
 
@@ -159,6 +2491,130 @@ class Fpt:
 
 
 
+    def _run_batch(self, entity_type: str, requests: list[dict], chunk_size: int, max_workers: int) -> list[dict]:
+        """ batch_create / batch_update 用。chunk_size ずつ batch() を並列に実行
+
+        * batch() は1回のトランザクションのため、項目のエラー (shotgun_api3.Fault) で失敗したチャンクは
+          半分ずつに分けて再実行し、エラーのある項目だけを特定
+        * 接続エラー、タイムアウトなどはサーバーで処理されたか分からないため再実行せず
+          （create の重複を防ぐ）、チャンクの全ての項目をそのエラーにする
+        """
+        self.login()
+
+        _results = [None] * len(requests)
+        _chunks = [range(_start, min(_start + chunk_size, len(requests))) for _start in range(0, len(requests), chunk_size)]
+
+        def _run_chunk(indices):
+            try:
+                for _index, _entity in zip(indices, self._fpt.batch([requests[_index] for _index in indices])):
+                    _results[_index] = {'entity': _entity, 'error': None}
+
+                    if requests[_index]['request_type'] == 'create':
+                        self._identity.add(_entity)
+                    else:
+                        self._identity.update(entity_type, requests[_index]['entity_id'], requests[_index]['data'])
+
+            except Exception as ex:
+                if len(indices) == 1 or not isinstance(ex, _FAULT_ERRORS) or isinstance(ex, _AUTH_ERRORS):
+                    for _index in indices:
+                        _results[_index] = {'entity': None, 'error': f'{type(ex).__name__}: {ex}'}
+                    return
+
+                # 半分ずつに分けて再実行（成功した側はそのまま作成される）
+                _half = len(indices) // 2
+                _run_chunk(indices[:_half])
+                _run_chunk(indices[_half:])
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as _executor:
+                list(_executor.map(_run_chunk, _chunks))
+
+        finally:
+            self._cache.invalidate(entity_type)
+
+        return _results
+
+
+    def batch_create(
+                self,
+                entity_type: str,
+                fpt_dicts: list[dict],
+                chunk_size: int = BATCH_CHUNK_SIZE,
+                max_workers: int = BATCH_MAX_WORKERS) -> list[dict]:
+        """ エンティティをまとめて作成
+
+        * 1件ずつの作成と同じく project と作成者を設定（fpt_dicts は変更しない）
+            * Version は create_version と同じく user
+            * TimeLog は create_timelog と同じく設定しない（'user' は fpt_dicts で指定）
+            * その他は create_entity と同じく created_by
+        * chunk_size 件ずつ1回の batch() で作成し、チャンクは max_workers 並列で実行
+
+        Args:
+            entity_type (str): エンティティタイプ名
+            fpt_dicts (list[dict]): 作成するエンティティのパラメータ
+            chunk_size (int): 1回の batch() の件数
+            max_workers (int): batch() の並列数
+
+        Returns:
+            list[dict]: fpt_dicts と同じ順番の結果 {'entity': 作成したエンティティ, 'error': エラー}
+
+        Examples:
+            >>> _results = fpt.batch_create('TimeLog', [
+            >>>     {'entity': _task, 'user': _user, 'date': '2026-10-19', 'duration': 60},
+            >>>     ...])
+            >>> _errors = [_result['error'] for _result in _results if _result['error']]
+        """
+        _requests = []
+
+        for _fpt_dict in fpt_dicts:
+            _data = dict(_fpt_dict)
+            _data['project'] = self._project
+
+            if self._user and entity_type == 'Version':
+                _data['user'] = self._user
+
+            elif self._user and entity_type != 'TimeLog':
+                _data['created_by'] = self._user
+
+            _requests.append({'request_type': 'create', 'entity_type': entity_type, 'data': _data})
+
+        return self._run_batch(entity_type, _requests, chunk_size, max_workers)
+
+
+    def batch_update(
+                self,
+                entity_type: str,
+                fpt_dicts: list[dict],
+                chunk_size: int = BATCH_CHUNK_SIZE,
+                max_workers: int = BATCH_MAX_WORKERS) -> list[dict]:
+        """ エンティティをまとめてアップデート
+
+        * 各 dict の 'id' のエンティティを残りのパラメータでアップデート（update と同じく追加の設定はしない）
+        * chunk_size 件ずつ1回の batch() で更新し、チャンクは max_workers 並列で実行
+
+        Args:
+            entity_type (str): エンティティタイプ名
+            fpt_dicts (list[dict]): {'id': エンティティID, フィールド名: 値, ...}
+            chunk_size (int): 1回の batch() の件数
+            max_workers (int): batch() の並列数
+
+        Returns:
+            list[dict]: fpt_dicts と同じ順番の結果 {'entity': 更新したエンティティ, 'error': エラー}
+
+        Examples:
+            >>> _results = fpt.batch_update('Shot', [{'id': _id, 'sg_status_list': 'fin'} for _id in _shot_ids])
+        """
+        _requests = []
+
+        for _fpt_dict in fpt_dicts:
+            _data = dict(_fpt_dict)
+            _entity_id = _data.pop('id')
+
+            _requests.append({'request_type': 'update', 'entity_type': entity_type, 'entity_id': _entity_id, 'data': _data})
+
+        return self._run_batch(entity_type, _requests, chunk_size, max_workers)
+
+
     def create_entity(self, entity_type: str, fpt_dict: dict) -> dict:
         fpt_dict['project'] = self._project
 
@@ -166,12 +2622,17 @@ class Fpt:
             fpt_dict['created_by'] = self._user
 
         try:
-            return self._fpt.create(entity_type, fpt_dict)
+            _result = self._fpt.create(entity_type, fpt_dict)
         
         except Exception as ex:
             self.logger.error(fpt_dict)  
 
             raise RuntimeError(ex)
+
+        self._cache.invalidate(entity_type)
+        self._identity.add(_result)
+
+        return _result
     
 
     def create_playlist(self, fpt_dict: dict) -> dict:
@@ -185,7 +2646,11 @@ class Fpt:
         if self._user:
             fpt_dict['created_by'] = self._user
 
-        return self._fpt.create('Playlist', fpt_dict)
+        _result = self._fpt.create('Playlist', fpt_dict)
+        self._cache.invalidate('Playlist')
+        self._identity.add(_result)
+
+        return _result
 
 
     def create_timelog(self, fpt_dict: dict):
@@ -202,7 +2667,11 @@ class Fpt:
 
         fpt_dict['project'] = self._project
 
-        return self._fpt.create('TimeLog', fpt_dict)
+        _result = self._fpt.create('TimeLog', fpt_dict)
+        self._cache.invalidate('TimeLog')
+        self._identity.add(_result)
+
+        return _result
         
 
     def create_version(self, fpt_dict: dict):
@@ -231,6 +2700,8 @@ class Fpt:
 
             raise ValueError(ex)
 
+        self._cache.invalidate('Version')
+        self._identity.add(_fpt_version)
         
         _upload_movie = self._fpt.upload(
                 'Version', _fpt_version.get('id'),
@@ -238,6 +2709,8 @@ class Fpt:
                 'sg_uploaded_movie'
         )
 
+        self._cache.invalidate('Version')
+
         return _fpt_version
     
 
@@ -260,6 +2733,66 @@ class Fpt:
         webbrowser.open(_url, new=2)
 
 
+    def resolve_codes(
+                self,
+                entity_type: str,
+                codes: list[str],
+                fields: list[str] = None,
+                code_field: str = 'code',
+                filters: list = None) -> dict:
+        """ 複数のコードをまとめてエンティティに変換
+
+        * IdentityMap に無いコードだけを1回の [code_field, 'in', [...]] で取得
+        * ShotGrid と同じく大文字、小文字を区別せずに codes と照合（完全に一致するエンティティを優先）
+        * 取得したエンティティは get_entity, get_shot などと同じキーで IdentityMap に保存
+
+        Args:
+            entity_type (str): エンティティタイプ名
+            codes (list[str]): コードのリスト
+            fields (list[str], optional): フィールド
+            code_field (str): コードのフィールド名 ('code', Shot の場合 'sg_name' など)
+            filters (list, optional): 追加のフィルター (project は自動で追加)
+
+        Returns:
+            dict: {コード: エンティティ or None}
+
+        Examples:
+            >>> _shots = fpt.resolve_codes('Shot', ['sh010', 'sh020', 'sh030'], ['sg_status_list'], code_field='sg_name')
+            >>> _shots['sh010']
+            {'type': 'Shot', 'id': 1234, 'sg_status_list': 'ip'}
+        """
+        _scope = self.add_filter(list(filters or []), 'project', 'is', self._project)
+        _fields = list(fields or ())
+        _results = {}
+        _missing = []
+
+        for _code in dict.fromkeys(codes):
+            _key = IdentityMap.make_key(entity_type, _scope + [[code_field, 'is', _code]])
+            _entity, _entity_id, _missing_fields = self._identity.resolve(_key, _fields)
+
+            if _entity is not None:
+                _results[_code] = _entity
+            else:
+                _missing.append(_code)
+
+        if _missing:
+            _query_fields = list(dict.fromkeys(_fields + [code_field]))
+            _codes = {}
+
+            for _code in _missing:
+                _codes.setdefault(str(_code).lower(), []).append(_code)
+
+            for _entity in self._fpt.find(entity_type, _scope + [[code_field, 'in', _missing]], _query_fields):
+                for _code in _codes.get(str(_entity.get(code_field)).lower(), ()):
+                    if _code in _results and _entity.get(code_field) != _code:
+                        continue
+
+                    _results[_code] = self._identity.add(
+                        _entity, IdentityMap.make_key(entity_type, _scope + [[code_field, 'is', _code]]), _fields)
+
+        return {_code: _results.get(_code) for _code in codes}
+
+
     def update(self, entity_type: str, entity_id: int, sg_dict: dict) -> dict:
         """ Shotgridのエンティティをアップデート
 
@@ -278,7 +2811,11 @@ class Fpt:
             >>> _fpt_asset = fpt.update('Asset', 10658, _sg_dict)        
         """
 
-        return self._fpt.update(entity_type, entity_id, sg_dict)
+        _result = self._fpt.update(entity_type, entity_id, sg_dict)
+        self._cache.invalidate(entity_type)
+        self._identity.update(entity_type, entity_id, sg_dict)
+
+        return _result
     
 
     
@@ -291,6 +2828,8 @@ class Fpt:
                 filepath,  # ファイルパス
                 field_name= field_name  # Call Sheetを格納するフィールド名
             )
+
+            self._cache.invalidate(entity_type)
             
         except Exception as e:
             print("PDFのアップロード中にエラーが発生しました:", e)
@@ -298,7 +2837,7 @@ class Fpt:
     # ----------------------------------
     # Get
     # ----------------------------------
-    def get_all_assets(self, filters=None, fields=None, mytask=False) -> dict:
+    def get_all_assets(self, filters=None, fields=None, mytask=False, cache: bool = True) -> dict:
 
         filters = self.add_filter(filters, 'project', 'is', self._project)
 
@@ -309,10 +2848,10 @@ class Fpt:
             filters = self.add_filter(
                 filters, 'tasks.Task.task_assignees', 'is', self._user)
 
-        return self._fpt.find('Asset', filters, fields)
+        return self._find('Asset', filters, fields, cache=cache)
     
 
-    def get_all_episodes(self, filters=None, fields=None, mytask=False) -> dict:
+    def get_all_episodes(self, filters=None, fields=None, mytask=False, cache: bool = True) -> dict:
         """ 全てのエピソードを取得 """
         filters = self.add_filter(filters, 'project', 'is', self._project)
         self.logger.debug(filters)
@@ -322,20 +2861,20 @@ class Fpt:
                 ['sequences.Sequence.shots.Shot.tasks.Task.task_assignees', 'is', self._user])
 
     
-        return self._fpt.find('Episode', filters, fields)
+        return self._find('Episode', filters, fields, cache=cache)
     
 
-    def get_all_playlists(self, filters=None, fields=None, myversion=False):
+    def get_all_playlists(self, filters=None, fields=None, myversion=False, cache: bool = True):
         # if filters is None:
         #     filters = []
 
         # filters.append(['project', 'is', self._project])
         filters = self.add_filter(filters, 'project', 'is', self._project)
 
-        return self._fpt.find('Playlist', filters, fields)
+        return self._find('Playlist', filters, fields, cache=cache)
 
 
-    def get_all_projects(self, filters=None, fields=None, mytask=False) -> dict:
+    def get_all_projects(self, filters=None, fields=None, mytask=False, cache: bool = True) -> dict:
         """ 全てのプロジェクトを取得 """
         # if filters is None:
         #     filters = []
@@ -359,10 +2898,10 @@ class Fpt:
         if fields is None:
             fields = []
 
-        return self._fpt.find('Project', filters, fields)
+        return self._find('Project', filters, fields, cache=cache)
     
 
-    def get_all_shootdays(self, filters=None, fields=None, mytask=False) -> dict:
+    def get_all_shootdays(self, filters=None, fields=None, mytask=False, cache: bool = True) -> dict:
 
         # if filters is None:
         #     filters = []
@@ -377,10 +2916,10 @@ class Fpt:
             filters.append(
                 ['tasks.Task.task_assignees', 'is', self._user])
 
-        return self._fpt.find('ShootDay', filters, fields)
+        return self._find('ShootDay', filters, fields, cache=cache)
 
 
-    def get_all_scequences(self, filters=None, fields=None, mytask=False) -> dict:
+    def get_all_scequences(self, filters=None, fields=None, mytask=False, cache: bool = True) -> dict:
         """ 全てのシーケンスを取得
         
         """
@@ -396,10 +2935,10 @@ class Fpt:
             
         self.logger.debug(filters)
 
-        return self._fpt.find('Sequence', filters, fields)
+        return self._find('Sequence', filters, fields, cache=cache)
 
 
-    def get_all_shots(self, filters=None, fields=None, mytask=False) -> dict:
+    def get_all_shots(self, filters=None, fields=None, mytask=False, cache: bool = True) -> dict:
         """ 全てのショットを取得
         
         """
@@ -419,11 +2958,11 @@ class Fpt:
         self.logger.debug(filters)
 
 
-        return self._fpt.find('Shot', filters, fields)
+        return self._find('Shot', filters, fields, cache=cache)
     
 
 
-    def get_all_task_template(self, filters=None, fields=None):
+    def get_all_task_template(self, filters=None, fields=None, cache: bool = True):
         """ 全てのタスクテンプレートを取得 """
         if filters is None:
             filters = []
@@ -431,7 +2970,7 @@ class Fpt:
         if fields is None:
             fields=[]
 
-        return self._fpt.find('TaskTemplate', filters, fields)
+        return self._find('TaskTemplate', filters, fields, cache=cache)
     
 
     def get_all_tasks(
@@ -439,7 +2978,8 @@ class Fpt:
                 entity:dict = None,
                 filters: list[list] = None,
                 fields: list[str] = None,
-                mytask: bool = False) -> list[dict]:
+                mytask: bool = False,
+                cache: bool = True) -> list[dict]:
 
         """ プロジェクト内の全てのタスクを取得 """        
 
@@ -458,10 +2998,10 @@ class Fpt:
             fields = ['content',]
 
 
-        return self._fpt.find('Task', filters, fields)
+        return self._find('Task', filters, fields, cache=cache)
 
 
-    def get_all_task_template(self, filters=None, fields=None):
+    def get_all_task_template(self, filters=None, fields=None, cache: bool = True):
         """ 全てのタスクテンプレートを取得 """
         if filters is None:
             filters = []
@@ -469,10 +3009,10 @@ class Fpt:
         if fields is None:
             fields=[]
 
-        return self._fpt.find('TaskTemplate', filters, fields)
+        return self._find('TaskTemplate', filters, fields, cache=cache)
     
 
-    def get_all_users(self, filters: list=None, fields: list=None) -> dict:
+    def get_all_users(self, filters: list=None, fields: list=None, cache: bool = True) -> dict:
         """ 全てのユーザーを取得 """
         if filters is None:
             filters = []
@@ -482,10 +3022,10 @@ class Fpt:
             fields = []
 
 
-        return self._fpt.find('HumanUser', filters, fields)
+        return self._find('HumanUser', filters, fields, cache=cache)
     
     
-    def get_all_versions(self, filters=None, fields=None) -> dict:
+    def get_all_versions(self, filters=None, fields=None, cache: bool = True) -> dict:
         """ 全てのバージョンを取得 """
         if filters is None:
             filters = []
@@ -495,10 +3035,10 @@ class Fpt:
             fields = []
 
 
-        return self._fpt.find('Version', filters, fields)
+        return self._find('Version', filters, fields, cache=cache)
     
 
-    def get_asset(self, code: str, filters=None, fields=None, mytask=False):
+    def get_asset(self, code: str, filters=None, fields=None, mytask=False, cache: bool = True):
         """ Asset をコードで取得
         
 
@@ -509,7 +3049,7 @@ class Fpt:
         if fields is None:
             fields = []
 
-        return self._fpt.find_one('Asset', filters, fields)
+        return self._find_one('Asset', filters, fields, cache=cache)
 
     def get_asset_type_list(self):
         """ アセットタイプリストを取得 """
@@ -521,7 +3061,8 @@ class Fpt:
                 entity_type: str,
                 code: str,
                 filters:list = None,
-                fields=None) -> dict:
+                fields=None,
+                cache: bool = True) -> dict:
         
         """ エンティティをコードで取得 """
         
@@ -536,10 +3077,10 @@ class Fpt:
         if fields is None:
             fields = []
 
-        return self._fpt.find_one(entity_type, filters, fields)
+        return self._find_one(entity_type, filters, fields, cache=cache)
     
 
-    def get_entity_by_id(self, entity_type: str, entity_id: int, filters=None, fields=None) -> dict:
+    def get_entity_by_id(self, entity_type: str, entity_id: int, filters=None, fields=None, cache: bool = True) -> dict:
         """ idでエンティティを取得 
         
         Args:
@@ -558,11 +3099,11 @@ class Fpt:
             fields = []
 
 
-        return self._fpt.find_one(entity_type, filters, fields)
+        return self._find_one(entity_type, filters, fields, cache=cache)
     
 
 
-    def get_episode(self, code: str, filters: list = None, fields=None) -> dict:
+    def get_episode(self, code: str, filters: list = None, fields=None, cache: bool = True) -> dict:
         """ エピソードを取得
         
         * 2025-01-01 Yamagishi
@@ -579,20 +3120,46 @@ class Fpt:
         if fields is None:
             fields = []
 
-        return self._fpt.find_one('Episode', filters, fields)
+        return self._find_one('Episode', filters, fields, cache=cache)
     
 
-    def get_field_data(self, entity: dict, field_name: str):
-        """ フィールドデータを取得 """
-        _context = self._fpt.schema_field_read(
-                    entity,
-                    field_name=field_name,
-                    project_entity=self._project)
-        
-        return _context[field_name]['properties']['valid_values']['value']
+    def get_field_data(self, entity: dict, field_name: str, value=None):
+        """ フィールドデータ (valid_values) を取得
+
+        * SchemaCache から取得（SCHEMA_CACHE_MAX_AGE より古い場合はバックグラウンドで取得し直す）
+        * スキーマに無いフィールド、value が valid_values に無い場合（追加されたステータスなど）は、
+          そのフィールドだけをサーバーから取得し直す（SCHEMA_REFRESH_MIN_INTERVAL 秒に1回まで）
+
+        Args:
+            entity (str): エンティティタイプ名
+            field_name (str): フィールド名
+            value (optional): valid_values にあるはずの値
+
+        Raises:
+            KeyError: スキーマに無いフィールド、valid_values の無いフィールド
+        """
+        _schema = self.get_schema()
+
+        try:
+            _field = _schema.get_field(entity, field_name)
+        except KeyError:
+            _field = None
+
+        _missing = _field is None or (value is not None and value not in _field.get('valid_values', ()))
+
+        if _missing and _schema.get_field_age(entity, field_name) > SCHEMA_REFRESH_MIN_INTERVAL:
+            _field = _schema.refresh_field(entity, field_name)
+
+        if _field is None:
+            raise KeyError(f'{entity}.{field_name}')
+
+        if 'valid_values' not in _field:
+            raise KeyError(f'valid_values. {entity}.{field_name}')
+
+        return _field['valid_values']
     
 
-    def get_playlist(self, code, filters: list = None, fields=None):
+    def get_playlist(self, code, filters: list = None, fields=None, cache: bool = True):
         """ プレイリストをコードで取得
         
         """
@@ -602,10 +3169,10 @@ class Fpt:
         if fields is None:
             fields = []
 
-        return self._fpt.find_one('Playlist', filters, fields)
+        return self._find_one('Playlist', filters, fields, cache=cache)
     
 
-    def get_scene(self, code, filters=None, fields=None):
+    def get_scene(self, code, filters=None, fields=None, cache: bool = True):
         """ シーン（撮影日）をコードで取得
         
         """
@@ -621,11 +3188,11 @@ class Fpt:
             fields = []
 
 
-        return self._fpt.find_one('Scene', filters, fields)
+        return self._find_one('Scene', filters, fields, cache=cache)
     
 
-    def get_sequence(self, episode_code: str, code: str=None, filters=None, fields=None):
-        _episode = self.get_episode(episode_code)
+    def get_sequence(self, episode_code: str, code: str=None, filters=None, fields=None, cache: bool = True):
+        _episode = self.get_episode(episode_code, cache=cache)
 
         filters = self.add_filter(filters, 'project', 'is', self._project)
         filters = self.add_filter(filters, 'code', 'is', code)
@@ -634,10 +3201,10 @@ class Fpt:
         if fields is None:
             fields = []
 
-        return self._fpt.find_one('Sequence', filters, fields)
+        return self._find_one('Sequence', filters, fields, cache=cache)
     
 
-    def get_shootday(self, code: str, filters=None, fields=None):
+    def get_shootday(self, code: str, filters=None, fields=None, cache: bool = True):
         # if filters is None:
         #     filters = []
 
@@ -652,10 +3219,10 @@ class Fpt:
             fields = []
 
 
-        return self._fpt.find_one('ShootDay', filters, fields)
+        return self._find_one('ShootDay', filters, fields, cache=cache)
     
 
-    def get_shot(self, name: str, filters=None, fields=None, mytask=False):
+    def get_shot(self, name: str, filters=None, fields=None, mytask=False, cache: bool = True):
         """ Shotを名前で取得 
         
         * nameはカスタムフィールド: sg_name
@@ -674,7 +3241,7 @@ class Fpt:
         if fields is None:
             fields = []
 
-        return self._fpt.find_one('Shot', filters, fields)
+        return self._find_one('Shot', filters, fields, cache=cache)
     
 
     def get_task(
@@ -683,7 +3250,8 @@ class Fpt:
                 sg_entity: dict,
                 filters: list = None,
                 fields: list = None,
-                mytask: bool = False):
+                mytask: bool = False,
+                cache: bool = True):
         
         # filters = [
         #     ['project', 'is', self._project],
@@ -699,7 +3267,7 @@ class Fpt:
             filters.append(['task_assignees', 'is', self._user])
 
 
-        result = self._fpt.find_one('Task', filters, fields)
+        result = self._find_one('Task', filters, fields, cache=cache)
 
         return result
 
@@ -709,15 +3277,139 @@ class Fpt:
         return self._url
     
 
-    def get_version(self, code: str, filters: list =None, fields: list[str]=None) -> dict:
+    def get_version(self, code: str, filters: list =None, fields: list[str]=None, cache: bool = True) -> dict:
         """ バージョンを名前で取得 """
 
         filters = self.add_filter(filters, 'project', 'is', self._project)
         filters = self.add_filter(filters, 'code', 'is', code)
 
-        return self._fpt.find_one('Version', filters, fields)
+        return self._find_one('Version', filters, fields, cache=cache)
     
 
+    # --------------------------------- #
+    # Iter
+    # --------------------------------- #
+    def iter_all_assets(
+                self,
+                filters: list = None,
+                fields: list[str] = None,
+                mytask: bool = False,
+                page_size: int = PAGE_SIZE):
+        """ 全てのアセットをページ単位で取得して1件ずつ返す（get_all_assets のジェネレータ版） """
+        filters = self.add_filter(filters, 'project', 'is', self._project)
+
+        if mytask:
+            filters = self.add_filter(
+                filters, 'tasks.Task.task_assignees', 'is', self._user)
+
+        return self.iter_find('Asset', filters, fields, page_size=page_size)
+
+
+    def iter_all_shots(
+                self,
+                filters: list = None,
+                fields: list[str] = None,
+                mytask: bool = False,
+                page_size: int = PAGE_SIZE):
+        """ 全てのショットをページ単位で取得して1件ずつ返す（get_all_shots のジェネレータ版） """
+        filters = self.add_filter(filters, 'project', 'is', self._project)
+
+        if mytask:
+            filters = self.add_filter(
+                filters, 'tasks.Task.task_assignees', 'is', self._user)
+
+        return self.iter_find('Shot', filters, fields, page_size=page_size)
+
+
+    def iter_all_tasks(
+                self,
+                entity: dict = None,
+                filters: list[list] = None,
+                fields: list[str] = None,
+                mytask: bool = False,
+                page_size: int = PAGE_SIZE):
+        """ プロジェクト内の全てのタスクをページ単位で取得して1件ずつ返す（get_all_tasks のジェネレータ版） """
+        filters = self.add_filter(filters, 'project', 'is', self._project)
+
+        if entity:
+            filters.append(['entity', 'is', entity])
+
+        if mytask:
+            filters.append(['task_assignees', 'is', self._user])
+
+        if fields is None:
+            fields = ['content',]
+
+        return self.iter_find('Task', filters, fields, page_size=page_size)
+
+
+    def iter_all_versions(self, filters: list = None, fields: list[str] = None, page_size: int = PAGE_SIZE):
+        """ 全てのバージョンをページ単位で取得して1件ずつ返す（get_all_versions のジェネレータ版）
+
+        Examples:
+            >>> for _version in fpt.iter_all_versions([['project', 'is', _project]], ['code', 'sg_status_list']):
+            >>>     print(_version['code'])
+        """
+        if filters is None:
+            filters = []
+
+        return self.iter_find('Version', filters, fields, page_size=page_size)
+
+
+    def iter_find(
+                self,
+                entity_type: str,
+                filters: list,
+                fields: list[str] = None,
+                page_size: int = PAGE_SIZE,
+                order: list[dict] = None):
+        """ find の結果をページ単位で取得して1件ずつ返すジェネレータ
+
+        * order が None の場合は id 順で、前のページの最後の id より大きいものを取得（_get_page_request）
+        * 現在のページを処理している間に、次のページを先読み用のスレッドプールで取得（gather の中でも使用可）
+        * メモリに保持するのは最大2ページ分
+        * フィルターはそのまま使用（project は追加しない）。キャッシュは使わない
+
+        Args:
+            entity_type (str): エンティティタイプ名
+            filters (list): フィルター
+            fields (list[str], optional): フィールド
+            page_size (int): 1ページの件数 (ShotGrid の上限 500 まで)
+            order (list[dict], optional): 並び順。None の場合は id 順（ページ間で重複、抜けが無いように）。
+                指定した場合は limit, page でページング
+
+        Yields:
+            dict: エンティティ
+        """
+        self.login()
+
+        _page_size = max(1, min(page_size, PAGE_SIZE))
+        _executor = self._get_prefetch_executor()
+
+        def _read(request: tuple) -> list[dict]:
+            _page, _filters, _kwargs = request
+            return self._fpt.find(entity_type, _filters, fields, **_kwargs)
+
+        _request = _get_page_request(filters, order, _page_size)
+        _future = _executor.submit(_read, _request)
+
+        try:
+            while _future is not None:
+                _entities = _future.result()
+                _future = None
+
+                _request = _get_page_request(filters, order, _page_size, _entities, _request[0])
+
+                if _request is not None:
+                    _future = _executor.submit(_read, _request)
+
+                yield from _entities
+
+        finally:
+            if _future is not None:
+                _future.cancel()
+
+
     # --------------------------------- #
     # Set
     # --------------------------------- #
@@ -733,6 +3425,283 @@ class Fpt:
 
 
 
+class AsyncFpt:
+    """ Fpt の asyncio 用ラッパー
+
+    * get_* / create_* / update / upload / batch_* は Fpt と同じ引数の async メソッド
+    * 呼び出しは AsyncFpt 専用のスレッドプールで実行し、イベントループをブロックしない
+    * 同時に実行するのは max_concurrency 件まで
+        * キャンセルされた呼び出しも、実行中の場合は終わるまで枠を使用（上限を超えない）
+    * iter_find で find の結果をページ単位で取得しながら async for で処理
+    * gather は呼び出しごとの Task で実行し、gather 自体をキャンセルすると実行中の呼び出しも全てキャンセル
+      (Python 3.10 の DCC でも動くように asyncio.timeout, TaskGroup は使わない)
+    * load_entity_by_id, load_task はイベントループの1周の間の呼び出しを1回の find にまとめる (BatchLoader)
+    * テストでは Fpt.login(factory=...) で疑似 Shotgun クライアントを使用
+
+    Examples:
+        >>> async with mdk.fpt.AsyncFpt(logger=logger) as _fpt:
+        >>>     _fpt.login(URL, SCRIPT_NAME, API_KEY)
+        >>>     _fpt.set_project(_project)
+        >>>     _shots = await _fpt.get_all_shots(fields=['code'])
+        >>>
+        >>>     async for _version in _fpt.iter_find('Version', [['project', 'is', _project]], ['code']):
+        >>>         print(_version['code'])
+    """
+    def __init__(self, fpt: Fpt = None, logger=None, max_concurrency: int = ASYNC_MAX_CONCURRENCY) -> None:
+        self._fpt = fpt if fpt is not None else Fpt(logger)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_concurrency, thread_name_prefix='mdk_async_fpt')
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._loader = BatchLoader(self._fpt, window=None, executor=self._executor)
+        self._dispatch_handle: asyncio.Handle = None
+
+
+    async def __aenter__(self) -> 'AsyncFpt':
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    async def _run(self, func, *args, **kwargs):
+        """ スレッドプールで func を実行（max_concurrency 件まで） """
+        await self._semaphore.acquire()
+
+        _loop = asyncio.get_running_loop()
+
+        def _release(_future):
+            try:
+                _loop.call_soon_threadsafe(self._semaphore.release)
+            except RuntimeError:
+                # イベントループが終了済み
+                pass
+
+        try:
+            _future = self._executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        _future.add_done_callback(_release)
+
+        return await asyncio.wrap_future(_future)
+
+
+    async def _load(self, future: concurrent.futures.Future):
+        """ BatchLoader の取得をイベントループの1周分まとめてから実行して待つ """
+        if not future.done() and self._dispatch_handle is None:
+            def _dispatch():
+                self._dispatch_handle = None
+                self._loader.dispatch()
+
+            self._dispatch_handle = asyncio.get_running_loop().call_soon(_dispatch)
+
+        return await asyncio.wrap_future(future)
+
+
+    def close(self):
+        """ スレッドプールを終了（実行中の呼び出しは待たない） """
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+
+        self._loader.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+    async def gather(self, calls: list, timeout: float = None, fail_fast: bool = False) -> list[dict]:
+        """ 複数の呼び出しを並列に実行（Fpt.gather の async 版）
+
+        Args:
+            calls (list[tuple]): (メソッド名 or async 関数, args, kwargs)。args, kwargs は省略可。形式が違う場合は TypeError
+            timeout (float, optional): 全体のタイムアウト (秒)。経過したら残りをキャンセル
+            fail_fast (bool): エラーがあったら残りをキャンセル
+
+        Returns:
+            list[dict]: calls と同じ順番の結果
+                {'name', 'result', 'error', 'elapsed': 実行時間 (秒), 'cancelled': bool}
+        """
+        _calls = _parse_calls(self, calls)
+
+        _results = [
+            {'name': _name, 'result': None, 'error': None, 'elapsed': None, 'cancelled': True}
+            for _name, _func, _args, _kwargs in _calls
+        ]
+
+        async def _run_call(result: dict, func, args: tuple, kwargs: dict):
+            _start = time.perf_counter()
+
+            try:
+                result['result'] = await func(*args, **kwargs)
+
+            except Exception as ex:
+                result['error'] = f'{type(ex).__name__}: {ex}'
+
+            result['cancelled'] = False
+            result['elapsed'] = time.perf_counter() - _start
+
+        _loop = asyncio.get_running_loop()
+        _deadline = _loop.time() + timeout if timeout is not None else None
+        _pending = {
+            asyncio.ensure_future(_run_call(_result, _func, _args, _kwargs))
+            for _result, (_name, _func, _args, _kwargs) in zip(_results, _calls)
+        }
+
+        try:
+            while _pending:
+                _timeout = max(0.0, _deadline - _loop.time()) if _deadline is not None else None
+                _done, _pending = await asyncio.wait(
+                        _pending,
+                        timeout=_timeout,
+                        return_when=asyncio.FIRST_COMPLETED if fail_fast else asyncio.ALL_COMPLETED)
+
+                # タイムアウト
+                if not _done:
+                    break
+
+                if fail_fast and any(_result['error'] for _result in _results):
+                    break
+
+        finally:
+            # 残りをキャンセルして終わるまで待つ（gather 自体がキャンセルされた場合も）
+            for _task in _pending:
+                _task.cancel()
+
+            if _pending:
+                await asyncio.wait(_pending)
+
+        return _results
+
+
+    async def iter_find(
+                self,
+                entity_type: str,
+                filters: list,
+                fields: list[str] = None,
+                page_size: int = PAGE_SIZE,
+                order: list[dict] = None):
+        """ find の結果をページ単位で取得して1件ずつ返す async ジェネレータ
+
+        * Fpt.iter_find と同じページング（_get_page_request）
+        * 現在のページを処理している間に次のページを取得
+        * フィルターはそのまま使用（project は追加しない）。キャッシュは使わない
+
+        Args:
+            entity_type (str): エンティティタイプ名
+            filters (list): フィルター
+            fields (list[str], optional): フィールド
+            page_size (int): 1ページの件数 (ShotGrid の上限 500 まで)
+            order (list[dict], optional): 並び順。None の場合は id 順。指定した場合は limit, page でページング
+
+        Yields:
+            dict: エンティティ
+        """
+        self._fpt.login()
+
+        _page_size = max(1, min(page_size, PAGE_SIZE))
+
+        def _read(request: tuple):
+            _page, _filters, _kwargs = request
+            return self._run(self._fpt.exists().find, entity_type, _filters, fields, **_kwargs)
+
+        _request = _get_page_request(filters, order, _page_size)
+        _task = asyncio.ensure_future(_read(_request))
+
+        try:
+            while _task is not None:
+                _entities = await _task
+                _task = None
+
+                _request = _get_page_request(filters, order, _page_size, _entities, _request[0])
+
+                if _request is not None:
+                    _task = asyncio.ensure_future(_read(_request))
+
+                for _entity in _entities:
+                    yield _entity
+
+        finally:
+            if _task is not None:
+                _task.cancel()
+
+
+    async def load_entity_by_id(
+                self,
+                entity_type: str,
+                entity_id: int,
+                fields: list[str] = None,
+                cache: bool = True) -> dict:
+        """ get_entity_by_id と同じ結果を、同じイベントループの1周の間の呼び出しとまとめて取得
+
+        Examples:
+            >>> _shots = await asyncio.gather(*[_fpt.load_entity_by_id('Shot', _id, ['code']) for _id in _ids])
+        """
+        return await self._load(self._loader.load_entity_by_id(entity_type, entity_id, fields, cache))
+
+
+    async def load_task(
+                self,
+                task_name: str,
+                sg_entity: dict,
+                fields: list[str] = None,
+                cache: bool = True) -> dict:
+        """ get_task と同じ結果を、同じイベントループの1周の間の呼び出しとまとめて取得 """
+        return await self._load(self._loader.load_task(task_name, sg_entity, fields, cache))
+
+
+    # --------------------------------- #
+    # Fpt (I/O なし)
+    # --------------------------------- #
+    def add_filter(self, filters: list, key: str, operator: str, value):
+        return self._fpt.add_filter(filters, key, operator, value)
+
+    def get_cache(self) -> QueryCache:
+        return self._fpt.get_cache()
+
+    def get_loader(self) -> BatchLoader:
+        """ load_entity_by_id, load_task で使う BatchLoader を取得（get_stats） """
+        return self._loader
+
+    def get_fpt(self) -> Fpt:
+        """ 同期版の Fpt を取得 """
+        return self._fpt
+
+    def get_url(self) -> str:
+        return self._fpt.get_url()
+
+    def get_url_by_entity(self, entity: dict):
+        return self._fpt.get_url_by_entity(entity)
+
+    def login(self, *args, **kwargs):
+        """ Fpt.login と同じ（接続は最初の呼び出し時） """
+        self._fpt.login(*args, **kwargs)
+
+    def set_project(self, project: dict):
+        self._fpt.set_project(project)
+
+    def set_url(self, value: str):
+        self._fpt.set_url(value)
+
+    def set_user(self, entity: dict):
+        self._fpt.set_user(entity)
+
+
+def _make_async_method(name: str):
+    """ AsyncFpt 用。Fpt のメソッドをスレッドプールで実行する async メソッドを作成 """
+    async def _method(self, *args, **kwargs):
+        return await self._run(getattr(self._fpt, name), *args, **kwargs)
+
+    _method.__name__ = name
+    _method.__qualname__ = f'AsyncFpt.{name}'
+    _method.__doc__ = getattr(Fpt, name).__doc__
+
+    return _method
+
+
+for _name in _ASYNC_METHODS:
+    setattr(AsyncFpt, _name, _make_async_method(_name))
+
 
 if __name__ == '__main__':
     pass
@@ -9,7 +9,11 @@ Info:
     * Author : MedakaVFX <medaka.vfx@gmail.com>
 
 Release Note:
-    * LastUpdated : 2025-08-24 Tatsuya Yamagishi
+    * LastUpdated : 2026-10-19 Tatsuya Yamagishi
+        * changed : Path.load_json (cached オプション)
+        * changed : Path.replace_text (置き換え結果を返す)
+        * added : get_mapping_pairs
+        * changed : Path.delete (soft オプション)
 """
 import datetime
 import glob
@@ -220,6 +224,49 @@ def get_versions(filepath) -> list:
 
 
 
+def get_mapping_pairs(path_substitutions: list[dict], platform_name: str = None) -> list[list[str]]:
+    """ path_substitutions から <platform_name> 用の置き換えリストを作成
+
+    * mapping と同じ順番で [他OSのパス, <platform_name>のパス] を返す
+    * mdk.file.replace_text / mdk.file.repath の replace_list として使用可能
+
+    Args:
+        path_substitutions (list[dict]): mapping と同じ形式
+        platform_name (str, optional): 'Darwin' | 'Linux' | 'Windows'（未指定なら実行中のOS）
+
+    Returns:
+        list[list[str]]: 置き換えリスト
+
+    Examples:
+        >>> mdk.path.get_mapping_pairs(PATH_SUBSTITUTIONS, 'Linux')
+        [['.zsh', '.sh'], ['.bat', '.sh'], ['/Volumes/KHAKI-SHARE', '/mnt/KHAKI-SHARE'], ['X:', '/mnt/KHAKI-SHARE']]
+    """
+    if platform_name is None:
+        platform_name = platform.system()
+
+    _others = {
+        'Darwin': ('Linux', 'Windows'),
+        'Linux': ('Darwin', 'Windows'),
+        'Windows': ('Darwin', 'Linux'),
+    }.get(platform_name, ())
+
+    _result = []
+
+    for _path_dict in path_substitutions:
+        _dst = _path_dict.get(platform_name)
+
+        if _dst is None:
+            continue
+
+        for _other in _others:
+            _src = _path_dict.get(_other)
+
+            if _src and _src != _dst:
+                _result.append([_src, _dst])
+
+    return _result
+
+
 def mapping(path_substitutions: list[dict], filepath: str):
     """ Filepath をマッピングする。
 
@@ -236,20 +283,8 @@ def mapping(path_substitutions: list[dict], filepath: str):
         >>>     'Windows': 'X:',
         >>> },
     """
-    _platform = platform.system()
-
-    for _path_dict in path_substitutions:
-        _linux_path = _path_dict.get('Linux')
-        _mac_path = _path_dict.get('Darwin')
-        _windows_path = _path_dict.get('Windows')
-
-        if _platform == 'Darwin':
-                filepath = filepath.replace(_linux_path, _mac_path).replace(_windows_path, _mac_path)
-        elif _platform == 'Linux':
-            filepath = filepath.replace(_mac_path, _linux_path).replace(_windows_path, _linux_path)
-        elif _platform == 'Windows':
-            filepath = filepath.replace(_mac_path, _windows_path).replace(_linux_path, _windows_path)
-
+    for _src, _dst in get_mapping_pairs(path_substitutions):
+        filepath = filepath.replace(_src, _dst)
 
     return filepath
 
@@ -464,8 +499,9 @@ class Path:
 
         
 
-    def delete(self):
-        mdk.file.delete(self.get_value())
+    def delete(self, soft: bool = False):
+        """ 削除 (soft=True の場合はゴミ箱に移動してバックグラウンドで削除) """
+        return mdk.file.delete(self.get_value(), soft=soft)
 
 
     def delete_files(self):
@@ -699,8 +735,17 @@ class Path:
             return []
         
 
-    def load_json(self):
+    def load_json(self, cached: bool = False, copy: bool = False):
+        """ Jsonファイルを読み込む
+
+        Args:
+            cached (bool): mdk.file.load_json_cached（変更確認付きキャッシュ）を使用
+            copy (bool): cached=True の場合に変更可能なコピーを返す
+        """
         _filepath = self.get_value()
+
+        if cached:
+            return mdk.file.load_json_cached(_filepath, copy=copy)
         
         return mdk.file.load_json(_filepath)
     
@@ -750,8 +795,9 @@ class Path:
         return dict(zip(_key_list, _value_list))
 
 
-    def replace_text(self, replace_list: list[str]):
-        mdk.file.replace_text(self.get_value(), replace_list)
+    def replace_text(self, replace_list: list[str], dry_run: bool = False) -> dict:
+        """ ファイル内の文字列を置き換え、置き換え結果を返す (mdk.file.replace_text) """
+        return mdk.file.replace_text(self.get_value(), replace_list, dry_run=dry_run)
 
 
     def relative_to(self, filepath: str):
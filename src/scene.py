@@ -0,0 +1,319 @@
+""" mdklibs.scene
+ 
+* シーンファイル（.nk, .ma, .usda）の依存ファイル解析用モジュール
+* テキスト形式のシーンファイルを1行（.ma は1文）ずつ読み込み、参照しているファイルパスを抽出
+
+Info:
+    * Created : 2026-10-19 Tatsuya YAMAGISHI
+    * Coding : Python 3.12.4 & PySide6
+    * Author : MedakaVFX <medaka.vfx@gmail.com>
+
+
+Release Note:
+    * LastUpdated : 2026-10-19 Tatsuya Yamagishi
+        * added : scan_dependencies, DependencyGraph
+"""
+import concurrent.futures
+import os
+import posixpath
+import re
+
+
+import mdk_libs as mdk
+
+#=======================================#
+# Settings
+#=======================================#
+SCENE_PATTERNS = {
+    # Nuke : file / proxy ノブ
+    '.nk': (
+        re.compile(r'^\s*(?:file|proxy|vfield_file)\s+(?:"([^"]*)"|\{([^}]*)\}|(\S+))'),
+    ),
+    # Maya ASCII : リファレンス、ファイルテクスチャ、キャッシュ
+    '.ma': (
+        re.compile(r'^\s*file\s+.*"([^"]+)"\s*;'),
+        re.compile(r'setAttr\s+"\.(?:ftn|fn|cfn|abc_File|fileName|filename|cachePath|cacheFileName)"\s+-type\s+"string"\s+"([^"]+)"'),
+    ),
+    # USD ASCII : アセットパス @path@
+    '.usda': (
+        re.compile(r'@([^@\n]+)@'),
+    ),
+}
+
+# 複数行を1文に結合する拡張子と文の終わり（Maya ASCII の file -rdi 1 ... \n "path"; など）
+SCENE_STATEMENT_TERMINATORS = {
+    '.ma': ';',
+}
+
+# 1文に結合する最大サイズ（巨大な setAttr のデータ配列などはここで区切る）
+SCENE_STATEMENT_MAX_SIZE = 64 * 1024
+
+
+#=======================================#
+# Funcsions
+#=======================================#
+def get_scene_patterns(filepath: str) -> tuple:
+    """ <filepath> の拡張子に対応する正規表現を取得（非対応の場合は空のtuple） """
+    return SCENE_PATTERNS.get(os.path.splitext(str(filepath))[1].lower(), ())
+
+
+def _iter_statements(f, terminator: str = None):
+    """ scan_dependencies 用。terminator で終わるまでの行を1文に結合して返す（None の場合は1行ずつ）
+
+    * // から始まるコメント行は結合しない
+    * SCENE_STATEMENT_MAX_SIZE を超えた場合はそこで区切る
+    """
+    if terminator is None:
+        yield from f
+        return
+
+    _buffer = []
+    _size = 0
+
+    for _line in f:
+        _line = _line.strip()
+
+        if not _buffer and _line.startswith('//'):
+            yield _line
+            continue
+
+        _buffer.append(_line)
+        _size += len(_line)
+
+        if _line.endswith(terminator) or _size > SCENE_STATEMENT_MAX_SIZE:
+            yield ' '.join(_buffer)
+            _buffer = []
+            _size = 0
+
+    if _buffer:
+        yield ' '.join(_buffer)
+
+
+def scan_dependencies(filepath: str) -> list[str]:
+    """ シーンファイルが参照しているファイルパスを取得
+
+    * ファイルは1行ずつ読み込むため、巨大なシーンでもメモリ使用量は一定
+        * .ma は ; までの複数行を1文に結合 (SCENE_STATEMENT_MAX_SIZE まで)
+    * 空のパス (file "" など) は除外
+    * './', '../' から始まる相対パスはシーンファイルのディレクトリ基準で解決
+    * パスは posix で返す（重複は除外、出現順）
+
+    Args:
+        filepath (str): シーンファイルパス (.nk, .ma, .usda)
+
+    Returns:
+        list[str]: 参照ファイルパスリスト
+
+    Examples:
+        >>> mdk.scene.scan_dependencies('/mnt/show/sh010/comp/sh010_comp_v001.nk')
+        ['/mnt/show/sh010/plate/sh010_plate.%04d.exr', ...]
+    """
+    _patterns = get_scene_patterns(filepath)
+    _terminator = SCENE_STATEMENT_TERMINATORS.get(os.path.splitext(str(filepath))[1].lower())
+    _dirname = mdk.path.as_posix(os.path.dirname(os.path.abspath(filepath)))
+    _result = {}
+
+    if not _patterns:
+        return []
+
+    with open(filepath, encoding='utf8', errors='replace') as _f:
+        for _line in _iter_statements(_f, _terminator):
+            for _pattern in _patterns:
+                for _match in _pattern.finditer(_line):
+                    _value = next((_group for _group in _match.groups() if _group is not None), '')
+                    _value = _value.strip().replace('\\', '/')
+
+                    if not _value:
+                        continue
+
+                    if _value.startswith(('./', '../')):
+                        _value = posixpath.normpath(f'{_dirname}/{_value}')
+
+                    _result[_value] = None
+
+    return list(_result)
+
+
+def _abspath(filepath: str) -> str:
+    return mdk.path.as_posix(os.path.abspath(filepath))
+
+
+def _scan_worker(filepath: str) -> tuple:
+    """ DependencyGraph.scan のプロセスプール用関数 """
+    try:
+        _stat = os.stat(filepath)
+        _signature = (_stat.st_mtime_ns, _stat.st_size)
+
+        return filepath, _signature, scan_dependencies(filepath), None
+
+    except Exception as ex:
+        return filepath, None, [], f'{type(ex).__name__}: {ex}'
+
+
+#=======================================#
+# Class
+#=======================================#
+class DependencyGraph:
+    """ シーンファイルの依存関係グラフ
+
+    * scan したシーンファイルは (st_mtime_ns, st_size) で管理し、変更があったファイルだけ再解析
+    * 逆引き (get_users) で「このテクスチャを使っているシーン」を取得
+
+    Attributes:
+        _scenes (dict): {シーンパス: ((st_mtime_ns, st_size), [依存パス, ...])}
+        _users (dict): {依存パス: {シーンパス, ...}}
+        _errors (dict): {シーンパス: エラーメッセージ}
+
+    Examples:
+        >>> _graph = mdk.scene.DependencyGraph()
+        >>> _graph.scan(SHOW_ROOT)
+        >>> _graph.get_users('/mnt/show/assets/charaA/tex/body_diff.1001.exr')
+        ['/mnt/show/sh010/light/sh010_light_v003.ma', ...]
+    """
+    def __init__(self) -> None:
+        self._scenes: dict = {}
+        self._users: dict = {}
+        self._errors: dict = {}
+
+
+    def _add(self, filepath: str, signature: tuple, dependencies: list[str]):
+        self._remove(filepath)
+        self._scenes[filepath] = (signature, dependencies)
+
+        for _dependency in dependencies:
+            self._users.setdefault(_dependency, set()).add(filepath)
+
+
+    def _remove(self, filepath: str):
+        _entry = self._scenes.pop(filepath, None)
+
+        if _entry:
+            for _dependency in _entry[1]:
+                _users = self._users.get(_dependency)
+
+                if _users:
+                    _users.discard(filepath)
+
+                    if not _users:
+                        del self._users[_dependency]
+
+
+    def get_dependencies(self, filepath: str) -> list[str]:
+        """ シーンファイルが参照しているファイルパスを取得 """
+        _entry = self._scenes.get(_abspath(filepath))
+
+        return list(_entry[1]) if _entry else []
+
+
+    def get_errors(self) -> dict:
+        """ 解析に失敗したシーンファイルを取得 {シーンパス: エラーメッセージ} """
+        return dict(self._errors)
+
+
+    def get_scenes(self) -> list[str]:
+        """ 解析済みのシーンファイルリストを取得 """
+        return list(self._scenes)
+
+
+    def get_users(self, filepath: str) -> list[str]:
+        """ <filepath> を参照しているシーンファイルを取得（逆引き） """
+        return sorted(self._users.get(mdk.path.as_posix(filepath), ()))
+
+
+    def load(self, json_filepath: str):
+        """ save で保存した解析結果を読み込む """
+        _data = mdk.file.load_json(json_filepath)
+
+        self._scenes = {}
+        self._users = {}
+        self._errors = {}
+
+        for _filepath, (_signature, _dependencies) in _data.get('scenes', {}).items():
+            self._add(_filepath, tuple(_signature), _dependencies)
+
+
+    def remove(self, filepath: str):
+        """ シーンファイルをグラフから削除 """
+        _filepath = _abspath(filepath)
+
+        self._remove(_filepath)
+        self._errors.pop(_filepath, None)
+
+
+    def save(self, json_filepath: str):
+        """ 解析結果を Json で保存（次回の scan で未変更のファイルは再解析しない） """
+        _data = {
+            'scenes': {
+                _filepath: [list(_signature), _dependencies]
+                for _filepath, (_signature, _dependencies) in self._scenes.items()
+            },
+        }
+        mdk.file.save_json(json_filepath, _data, indent=None)
+
+
+    def scan(self, filepaths, file_filter=None, max_workers: int = None) -> int:
+        """ シーンファイルを解析してグラフを更新
+
+        * 前回の scan から変更が無いファイル (st_mtime_ns, st_size が同じ) は再解析しない
+        * 解析はプロセスプールで並列実行
+        * ディレクトリを指定した場合、無くなったシーンファイルはグラフから削除
+
+        Args:
+            filepaths (str or list[str]): シーンファイルリスト、またはディレクトリ
+            file_filter (re.Pattern or tuple[re.Pattern], optional): ディレクトリ探索時のファイル名フィルタ
+                (未指定なら SCENE_PATTERNS の拡張子)
+            max_workers (int, optional): プロセス数（1の場合は並列化しない）
+
+        Returns:
+            int: 解析したファイル数
+        """
+        _is_dir = isinstance(filepaths, (str, os.PathLike)) and os.path.isdir(filepaths)
+
+        if _is_dir:
+            if file_filter is None:
+                _exts = '|'.join(re.escape(_ext[1:]) for _ext in SCENE_PATTERNS)
+                file_filter = re.compile(rf'.+\.({_exts})')
+
+            _root = _abspath(filepaths)
+            filepaths = mdk.file.iter_files(filepaths, file_filter)
+
+        _filepaths = [_abspath(_filepath) for _filepath in filepaths]
+        _targets = []
+
+        for _filepath in _filepaths:
+            _entry = self._scenes.get(_filepath)
+
+            try:
+                _stat = os.stat(_filepath)
+            except OSError:
+                self.remove(_filepath)
+                continue
+
+            if _entry is None or _entry[0] != (_stat.st_mtime_ns, _stat.st_size):
+                _targets.append(_filepath)
+
+        if _is_dir:
+            _exists = set(_filepaths)
+
+            for _filepath in list(self._scenes):
+                if _filepath.startswith(f'{_root}/') and _filepath not in _exists:
+                    self.remove(_filepath)
+
+        if max_workers == 1 or len(_targets) <= 1:
+            _results = [_scan_worker(_filepath) for _filepath in _targets]
+
+        else:
+            _chunksize = max(1, len(_targets) // ((max_workers or os.cpu_count() or 1) * 4))
+
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as _executor:
+                _results = list(_executor.map(_scan_worker, _targets, chunksize=_chunksize))
+
+        for _filepath, _signature, _dependencies, _error in _results:
+            if _error:
+                self._remove(_filepath)
+                self._errors[_filepath] = _error
+            else:
+                self._add(_filepath, _signature, _dependencies)
+                self._errors.pop(_filepath, None)
+
+        return len(_targets)
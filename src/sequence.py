@@ -0,0 +1,400 @@
+""" mdklibs.sequence
+
+* 連番ファイル（フレームシーケンス）のチェック用モジュール
+* 欠番、0バイトのフレーム、前後のフレームとサイズが大きく異なるフレームを検出
+
+Info:
+    * Created : 2026-10-19 Tatsuya YAMAGISHI
+    * Coding : Python 3.12.4 & PySide6
+    * Author : MedakaVFX <medaka.vfx@gmail.com>
+
+
+Release Note:
+    * LastUpdated : 2026-10-19 Tatsuya Yamagishi
+        * added : check, check_sequence, scan_sequences, get_frame_ranges, parse_pattern
+"""
+import concurrent.futures
+import os
+import re
+import statistics
+import warnings
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+import mdk_libs as mdk
+
+#=======================================#
+# Settings
+#=======================================#
+# <head><frame><ext>  例: sh010_comp.1001.exr
+FRAME_FILENAME_PATTERN = re.compile(r'^(.*?)(\d+)(\.[A-Za-z][A-Za-z0-9]*)$')
+
+# パターン表記の連番部分  例: ####, %04d, $F4, @@@@
+FRAME_TOKEN_PATTERN = re.compile(r'(#+|@+|%0?(\d*)d|\$F(\d*))')
+
+
+#=======================================#
+# Funcsions
+#=======================================#
+def check(
+            paths,
+            frame_range: tuple = None,
+            tolerance: float = 0.5,
+            window: int = 5,
+            recursive: bool = False,
+            min_frames: int = 2,
+            max_workers: int = 8) -> list[dict]:
+    """ 連番パターン、ディレクトリの連番ファイルをまとめてチェック
+
+    * ディレクトリ単位で os.scandir を max_workers 並列に実行
+    * 同じディレクトリのパターンは1回の scandir でまとめてチェック
+    * ディレクトリを指定した場合は含まれる全ての連番 (min_frames 以上) をチェック
+    * パディングの違う連番 (sh.001.exr と sh.0001.exr) は別の連番
+    * recursive の場合、シンボリックリンクのディレクトリも辿るが同じディレクトリ (st_dev, st_ino) は1回だけ
+
+    Args:
+        paths (str or list[str]): 連番パターン (####, %04d, $F4) またはディレクトリのパス
+        frame_range (tuple, optional): (開始フレーム, 終了フレーム)。None の場合は存在するフレームの範囲
+        tolerance (float): 前後のフレームのサイズの中央値との差の許容率 (0.5 = ±50%)
+        window (int): サイズ比較に使うフレーム数 (自身を含む)
+        recursive (bool): ディレクトリの場合サブディレクトリもチェック
+        min_frames (int): ディレクトリの場合に連番とみなす最小フレーム数
+        max_workers (int): scandir の並列数
+
+    Returns:
+        list[dict]: check_sequence のレポートのリスト (パターン名順)
+
+    Examples:
+        >>> for _report in mdk.sequence.check(SHOT_RENDER_DIR, recursive=True):
+        >>>     if not _report['ok']:
+        >>>         print(_report['pattern'], _report['missing'], _report['zero'], _report['suspicious'])
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    # {ディレクトリ: {(head, パディング, ext), ...} or None (全ての連番)}
+    _tasks = {}
+
+    for _path in paths:
+        _path = mdk.path.as_posix(os.path.abspath(_path))
+
+        if os.path.isdir(_path):
+            _tasks[_path] = None
+        else:
+            _dirname, _head, _padding, _ext = parse_pattern(_path)
+
+            if _tasks.get(_dirname, set()) is not None:
+                _tasks.setdefault(_dirname, set()).add((_head, _padding, _ext))
+
+    _reports = []
+    _visited = set()
+
+    for _dirname, _keys in _tasks.items():
+        if _keys is None:
+            _visited.add(_get_dir_id(_dirname))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as _executor:
+        _futures = {
+            _executor.submit(_scan_worker, _dirname, recursive and _keys is None): _keys
+            for _dirname, _keys in _tasks.items()
+        }
+
+        while _futures:
+            _done, _ = concurrent.futures.wait(_futures, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for _future in _done:
+                _keys = _futures.pop(_future)
+                _dirname, _sequences, _subdirs = _future.result()
+
+                for _subdir, _dir_id in _subdirs:
+                    # シンボリックリンクのループ (latest -> . など)、同じディレクトリへの複数のリンク
+                    if _dir_id in _visited:
+                        continue
+
+                    _visited.add(_dir_id)
+                    _futures[_executor.submit(_scan_worker, _subdir, True)] = None
+
+                for _key, _frames in _sequences.items():
+                    if _keys is None:
+                        if len(_frames) < min_frames:
+                            continue
+
+                    elif _key not in _keys:
+                        continue
+
+                    _reports.append(check_sequence(
+                        _frames, f'{_dirname}/{_key[0]}{"#" * _key[1]}{_key[2]}', frame_range, tolerance, window))
+
+                # パターン指定でファイルが1つも無い場合
+                for _head, _padding, _ext in _keys or ():
+                    if (_head, _padding, _ext) not in _sequences:
+                        _reports.append(check_sequence(
+                            {}, f'{_dirname}/{_head}{"#" * _padding}{_ext}', frame_range, tolerance, window))
+
+    return sorted(_reports, key=lambda _report: _report['pattern'])
+
+
+def check_sequence(
+            frames: dict,
+            pattern: str = None,
+            frame_range: tuple = None,
+            tolerance: float = 0.5,
+            window: int = 5) -> dict:
+    """ 1つの連番のフレームとサイズからレポートを作成
+
+    * サイズは前後 window フレームの中央値と比較 (0バイトのフレームは除外して計算)
+    * 欠番は連続する範囲にまとめて返す
+
+    Args:
+        frames (dict): {フレーム番号: ファイルサイズ}
+        pattern (str, optional): レポートに記載する連番パターン
+        frame_range (tuple, optional): (開始フレーム, 終了フレーム)
+        tolerance (float): 中央値との差の許容率
+        window (int): 中央値の計算に使うフレーム数
+
+    Returns:
+        dict: レポート
+            * pattern (str): 連番パターン
+            * first (int), last (int): 最初、最後のフレーム
+            * count (int): 存在するフレーム数
+            * missing (list[tuple]): 欠番の範囲 [(開始, 終了), ...]
+            * missing_count (int): 欠番の数
+            * zero (list[int]): 0バイトのフレーム
+            * suspicious (list[dict]): サイズが異常なフレーム {'frame', 'size', 'ratio'}
+            * median_size (int): サイズの中央値
+            * ok (bool): 問題が無い場合 True
+
+    Examples:
+        >>> mdk.sequence.check_sequence({1001: 1200, 1002: 1180, 1004: 0, 1005: 300})
+        {'first': 1001, 'last': 1005, 'missing': [(1003, 1003)], 'zero': [1004], ...}
+    """
+    if frame_range:
+        _first, _last = frame_range
+        frames = {_frame: _size for _frame, _size in frames.items() if _first <= _frame <= _last}
+
+    elif frames:
+        _first, _last = min(frames), max(frames)
+
+    else:
+        _first = _last = None
+
+    _frames = sorted(frames)
+    _sizes = [frames[_frame] for _frame in _frames]
+    _missing = []
+
+    if _first is not None:
+        _previous = _first - 1
+
+        for _frame in _frames + [_last + 1]:
+            if _frame - _previous > 1:
+                _missing.append((_previous + 1, _frame - 1))
+
+            _previous = _frame
+
+    _medians = _get_local_medians(_sizes, window)
+    _suspicious = []
+
+    for _frame, _size, _median in zip(_frames, _sizes, _medians):
+        if _size and _median and abs(_size / _median - 1.0) > tolerance:
+            _suspicious.append({'frame': _frame, 'size': _size, 'ratio': round(_size / _median, 3)})
+
+    _nonzero = [_size for _size in _sizes if _size]
+    _zero = [_frame for _frame, _size in zip(_frames, _sizes) if not _size]
+
+    return {
+        'pattern': pattern,
+        'first': _first,
+        'last': _last,
+        'count': len(_frames),
+        'missing': _missing,
+        'missing_count': sum(_end - _start + 1 for _start, _end in _missing),
+        'zero': _zero,
+        'suspicious': _suspicious,
+        'median_size': int(statistics.median(_nonzero)) if _nonzero else 0,
+        'ok': bool(_frames) and not _missing and not _zero and not _suspicious,
+    }
+
+
+def get_frame_ranges(frames) -> list[tuple]:
+    """ フレーム番号を連続する範囲にまとめる
+
+    Examples:
+        >>> mdk.sequence.get_frame_ranges([1001, 1002, 1003, 1010])
+        [(1001, 1003), (1010, 1010)]
+    """
+    _ranges = []
+
+    for _frame in sorted(set(frames)):
+        if _ranges and _frame == _ranges[-1][1] + 1:
+            _ranges[-1][1] = _frame
+        else:
+            _ranges.append([_frame, _frame])
+
+    return [tuple(_range) for _range in _ranges]
+
+
+def parse_pattern(pattern: str) -> tuple:
+    """ 連番パターンを (ディレクトリ, head, パディング, 拡張子) に分解
+
+    * '####', '@@@@', '%04d', '$F4' に対応
+    * 連番表記が無い場合は実際のファイル名 (sh010.1001.exr) として解析
+
+    Examples:
+        >>> mdk.sequence.parse_pattern('/mnt/show/sh010/comp/sh010_comp.%04d.exr')
+        ('/mnt/show/sh010/comp', 'sh010_comp.', 4, '.exr')
+    """
+    _pattern = mdk.path.as_posix(pattern)
+    _dirname, _filename = os.path.split(_pattern)
+    _matches = list(FRAME_TOKEN_PATTERN.finditer(_filename))
+
+    if _matches:
+        _match = _matches[-1]
+        _token = _match.group(1)
+
+        if _token[0] in '#@':
+            _padding = len(_token)
+        else:
+            _padding = int(_match.group(2) or _match.group(3) or 1)
+
+        return _dirname, _filename[:_match.start()], _padding, _filename[_match.end():]
+
+    _match = FRAME_FILENAME_PATTERN.match(_filename)
+
+    if not _match:
+        raise ValueError(f'Invalid sequence pattern.\npattern={pattern}')
+
+    return _dirname, _match.group(1), len(_match.group(2)), _match.group(3)
+
+
+def scan_sequences(dirname: str) -> dict:
+    """ ディレクトリ内の連番ファイルを取得 (サブディレクトリは含まない)
+
+    * パディングの違う連番 (sh.001.exr と sh.0001.exr) は別の連番 (_split_paddings)
+
+    Returns:
+        dict: {(head, パディング, 拡張子): {フレーム番号: ファイルサイズ}}
+
+    Examples:
+        >>> mdk.sequence.scan_sequences('/mnt/show/sh010/comp/v001')
+        {('sh010_comp.', 4, '.exr'): {1001: 10485760, 1002: 10490112, ...}}
+    """
+    return _scan_worker(mdk.path.as_posix(dirname), False)[1]
+
+
+def _get_local_medians(sizes: list[int], window: int) -> list:
+    """ 各フレームの前後 window フレームのサイズの中央値 (0バイトは除外) """
+    if not sizes:
+        return []
+
+    _half = max(window, 1) // 2
+
+    if numpy is None:
+        _medians = []
+
+        for _index in range(len(sizes)):
+            _values = [_size for _size in sizes[max(0, _index - _half):_index + _half + 1] if _size]
+            _medians.append(statistics.median(_values) if _values else None)
+
+        return _medians
+
+    _sizes = numpy.asarray(sizes, dtype=numpy.float64)
+    _sizes[_sizes == 0] = numpy.nan
+    _padded = numpy.pad(_sizes, _half, constant_values=numpy.nan)
+    _windows = numpy.lib.stride_tricks.sliding_window_view(_padded, 2 * _half + 1)
+
+    with warnings.catch_warnings():
+        # 全て 0 バイトの範囲は nan (All-NaN slice の警告を抑制)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        _medians = numpy.nanmedian(_windows, axis=1)
+
+    return [None if numpy.isnan(_median) else float(_median) for _median in _medians]
+
+
+def _get_dir_id(dirname: str) -> tuple:
+    """ check 用。ディレクトリの (st_dev, st_ino)（シンボリックリンクは辿る。無い場合は dirname） """
+    try:
+        _stat = os.stat(dirname)
+    except OSError:
+        return dirname
+
+    return _stat.st_dev, _stat.st_ino
+
+
+def _split_paddings(frames: list[tuple]) -> dict:
+    """ _scan_worker 用。同じ (head, ext) のフレームをパディングごとに分ける
+
+    * 0 から始まるフレーム (0001) は桁数がパディング
+    * 0 から始まらないフレーム (1001, 12345) は、桁数以下で最大のパディングの連番
+      (無い場合は 0 埋めの無い連番として、最小の桁数をパディングにする)
+
+    Args:
+        frames (list[tuple]): [(フレーム番号の文字列, ファイルサイズ), ...]
+
+    Returns:
+        dict: {パディング: {フレーム番号: ファイルサイズ}}
+    """
+    _paddings = {len(_frame) for _frame, _size in frames if len(_frame) > 1 and _frame[0] == '0'}
+    _result = {}
+    _natural = {}
+
+    for _frame, _size in frames:
+        if len(_frame) > 1 and _frame[0] == '0':
+            _padding = len(_frame)
+        else:
+            _padding = max((_value for _value in _paddings if _value <= len(_frame)), default=None)
+
+        if _padding is None:
+            _natural[_frame] = _size
+        else:
+            _result.setdefault(_padding, {})[int(_frame)] = _size
+
+    if _natural:
+        _padding = min(len(_frame) for _frame in _natural)
+        _result.setdefault(_padding, {}).update({int(_frame): _size for _frame, _size in _natural.items()})
+
+    return _result
+
+
+def _scan_worker(dirname: str, recursive: bool) -> tuple:
+    """ check 用。1ディレクトリを scandir して (ディレクトリ, 連番, [(サブディレクトリ, (st_dev, st_ino)), ...]) を返す """
+    _frames = {}
+    _sequences = {}
+    _subdirs = []
+
+    try:
+        _entries = os.scandir(dirname)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return dirname, _sequences, _subdirs
+
+    with _entries:
+        for _entry in _entries:
+            if _entry.name.startswith('.'):
+                continue
+
+            try:
+                if _entry.is_dir():
+                    if recursive:
+                        _subdir = f'{dirname}/{_entry.name}'
+                        _subdirs.append((_subdir, _get_dir_id(_subdir)))
+
+                    continue
+
+                _match = FRAME_FILENAME_PATTERN.match(_entry.name)
+
+                if _match:
+                    _head, _frame, _ext = _match.groups()
+                    _frames.setdefault((_head, _ext), []).append((_frame, _entry.stat().st_size))
+
+            except OSError:
+                continue
+
+    for (_head, _ext), _items in _frames.items():
+        for _padding, _values in _split_paddings(_items).items():
+            _sequences[(_head, _padding, _ext)] = _values
+
+    return dirname, _sequences, _subdirs